@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+
+"""
+Script language: Python3
+
+Talks to:
+- A local stand-in HTTP server, started by this script
+
+Apps/Libraries:
+- REST: requests (https://pypi.org/project/requests/)
+"""
+
+# Compares the latency of bare requests.get() calls (new connection per
+# request) with requests made through the shared keep-alive session from
+# helpers.session(). Pass --cert/--key to serve over TLS, which makes the
+# handshake cost visible in the same way as against a real node.
+
+import argparse
+import json
+import os
+import ssl
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import helpers  # noqa: E402
+
+TIME_RESPONSE = json.dumps({"timestamp": "1600787450760093039"}).encode()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(TIME_RESPONSE)))
+        self.end_headers()
+        self.wfile.write(TIME_RESPONSE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(cert: str, key: str) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    if cert:
+        ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        ctx.load_cert_chain(cert, key)
+        server.socket = ctx.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def measure(get, url: str, count: int, verify) -> list:
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = get(url, verify=verify)
+        helpers.check_response(response)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(name: str, latencies: list) -> None:
+    ordered = sorted(latencies)
+    p50 = ordered[len(ordered) // 2]
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{name:10} n={len(ordered)} "
+        f"mean={statistics.mean(ordered) * 1e3:.3f}ms "
+        f"p50={p50 * 1e3:.3f}ms p99={p99 * 1e3:.3f}ms"
+    )
+
+
+parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+parser.add_argument("-n", "--count", type=int, default=500)
+parser.add_argument("--cert", help="TLS certificate for the stand-in server")
+parser.add_argument("--key", help="TLS private key for the stand-in server")
+args = parser.parse_args()
+
+server = start_server(args.cert, args.key)
+scheme = "https" if args.cert else "http"
+url = f"{scheme}://127.0.0.1:{server.server_address[1]}/time"
+verify = False if args.cert else True
+if args.cert:
+    requests.packages.urllib3.disable_warnings()
+
+session = helpers.session()
+# Warm up both paths once so imports and the first pool are excluded
+requests.get(url, verify=verify)
+session.get(url, verify=verify)
+
+report("unpooled", measure(requests.get, url, args.count, verify))
+report("pooled", measure(session.get, url, args.count, verify))
+
+server.shutdown()
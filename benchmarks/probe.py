@@ -0,0 +1,105 @@
+"""
+Runs a sample script and records when it started and how long each request
+it made took, for benchmarks/script-suite.py.
+
+    python3 benchmarks/probe.py vega-time/get-time.py [args...]
+
+The script runs as if started directly (same sys.argv, sys.path[0] and
+__main__). Requests made with requests (REST) and unary calls on gRPC
+channels are timed; requests and grpc are patched only once the script
+imports them, so the probe adds nothing to a script's import time. At exit,
+the timings are written as JSON to the file named by BENCH_PROBE_OUT:
+
+    {"start": ..., "requests": [[name, start, seconds], ...]}
+
+with times from time.time().
+"""
+
+import atexit
+import importlib.abc
+import importlib.util
+import json
+import os
+import runpy
+import sys
+import time
+
+START = time.time()
+REQUESTS = []
+
+
+def record(name, start):
+    REQUESTS.append((name, start, time.time() - start))
+
+
+def patch_requests(adapters):
+    send = adapters.HTTPAdapter.send
+
+    def timed_send(self, request, **kwargs):
+        start = time.time()
+        try:
+            return send(self, request, **kwargs)
+        finally:
+            record(f"{request.method} {request.path_url.split('?')[0]}", start)
+
+    adapters.HTTPAdapter.send = timed_send
+
+
+def patch_grpc(grpc):
+    class TimingInterceptor(grpc.UnaryUnaryClientInterceptor):
+        def intercept_unary_unary(self, continuation, client_call_details, request):
+            start = time.time()
+            response = continuation(client_call_details, request)
+            response.result()  # wait for it
+            record(client_call_details.method, start)
+            return response
+
+    def wrap(make_channel):
+        def make_timed_channel(*args, **kwargs):
+            return grpc.intercept_channel(make_channel(*args, **kwargs), TimingInterceptor())
+        return make_timed_channel
+
+    grpc.insecure_channel = wrap(grpc.insecure_channel)
+    grpc.secure_channel = wrap(grpc.secure_channel)
+
+
+PATCHES = {"requests.adapters": patch_requests, "grpc": patch_grpc}
+
+
+class PatchOnImport(importlib.abc.MetaPathFinder):
+    """Patches a module in PATCHES right after it is first imported."""
+
+    def find_spec(self, name, path, target=None):
+        if name not in PATCHES:
+            return None
+        sys.meta_path.remove(self)
+        try:
+            spec = importlib.util.find_spec(name)
+        finally:
+            sys.meta_path.insert(0, self)
+        if spec is None or spec.loader is None:
+            return None
+        exec_module = spec.loader.exec_module
+
+        def exec_and_patch(module):
+            exec_module(module)
+            PATCHES[name](module)
+
+        spec.loader.exec_module = exec_and_patch
+        return spec
+
+
+def write_results():
+    path = os.getenv("BENCH_PROBE_OUT")
+    if path:
+        with open(path, "w") as f:
+            json.dump({"start": START, "requests": REQUESTS}, f)
+
+
+if __name__ == "__main__":
+    script = os.path.abspath(sys.argv[1])
+    sys.argv = sys.argv[1:]
+    sys.path[0] = os.path.dirname(script)
+    sys.meta_path.insert(0, PatchOnImport())
+    atexit.register(write_results)
+    runpy.run_path(script, run_name="__main__")
@@ -0,0 +1,314 @@
+#!/usr/bin/python3
+
+"""
+Script language: Python3
+
+Talks to:
+- Stand-in Vega node (REST, gRPC) and wallet server, from mock-node/
+
+Apps/Libraries:
+- Subprocesses: subprocess (standard library)
+"""
+
+# Runs the sample scripts against the stand-in node and wallet server,
+# several times each, and reports per script:
+#
+# - wall_s: run time, from starting python to exit
+# - startup_s: from starting python to the script's first request
+# - import_s: total time spent importing modules (python -X importtime)
+# - peak_rss_mb: peak resident memory
+# - latency_ms: time taken by each REST request or unary gRPC call
+#
+# Results are written as JSON (--output), and can be compared with results
+# saved earlier (--baseline): medians which got worse by more than
+# --threshold are reported as regressions, and the exit code is 1.
+
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(BENCHMARKS)
+
+# (script, arguments), or (script, arguments, reason to skip it)
+SUITE = [
+    ("vega-time/get-time.py", []),
+    ("vega-time/get-time-with-Vega-API-client.py", []),
+    ("get-statistics/get-statistics.py", []),
+    ("get-statistics/get-statistics-with-Vega-API-client.py", []),
+    ("get-markets-and-market-data/get-markets-and-marketdata.py", []),
+    ("get-markets-and-market-data/get-markets-and-marketdata-with-Vega-API-client.py", []),
+    ("get-orders-and-trades/get-orders-and-trades-for-market.py", []),
+    ("get-orders-and-trades/get-orders-and-trades-for-market-with-Vega-API-client.py", []),
+    ("get-orders-and-trades/get-orders-and-trades-for-party.py", []),
+    ("get-orders-and-trades/get-orders-and-trades-for-party-with-Vega-API-client.py", []),
+    ("get-orders-and-trades/get-trades-for-order.py", []),
+    ("get-orders-and-trades/get-trades-for-order-with-Vega-API-client.py", []),
+    ("get-by-reference/get-order-by-reference.py", []),
+    ("get-by-reference/get-order-by-reference-with-Vega-API-client.py", []),
+    ("parties-and-accounts/get-parties.py", []),
+    ("parties-and-accounts/get-parties-with-Vega-API-client.py", []),
+    ("fees-estimation/get-fees-estimate.py", []),
+    ("propose-markets/get-assets.py", []),
+    ("propose-markets/propose-vote-enact-market.py", []),
+    ("wallet/wallet.py", []),
+    ("wallet/wallet-with-Vega-API-client.py", []),
+    ("submit-order/submit-order.py", []),
+    ("submit-order/submit-order-with-Vega-API-client.py", []),
+    ("submit-order/submit-orders-batch.py", ["-n", "50"]),
+    ("submit-order/submit-orders-batch-with-Vega-API-client.py", ["-n", "50"]),
+    ("submit-amend-cancel-orders/submit-amend-cancel-orders.py", []),
+    ("submit-amend-cancel-orders/submit-amend-cancel-orders-with-Vega-API-client.py", []),
+    ("stream-marketdata/stream-marketdata.py", []),
+    ("stream-orders-and-trades/stream-orders-with-Vega-API-client.py", []),
+    ("stream-orders-and-trades/stream-trades-with-Vega-API-client.py", []),
+    ("stream-orders-and-trades/stream-orderbook-with-Vega-API-client.py", []),
+    ("stream-orders-and-trades/stream-candles-with-Vega-API-client.py", []),
+    ("stream-events/stream-events-with-Vega-API-client.py", []),
+    ("stream-events/stream-positions-with-Vega-API-client.py", []),
+    ("stream-events/stream-margins-with-Vega-API-client.py", []),
+]
+
+# Metrics compared with the baseline (all lower is better)
+COMPARED = ("wall_s", "startup_s", "import_s", "peak_rss_mb", "latency_ms")
+
+IMPORT_TIME = re.compile(r"^import time:\s+(\d+) \|")
+
+
+def start_stand_in(command: List[str], last_line: str) -> Tuple[subprocess.Popen, Dict[str, str]]:
+    """Start a stand-in server, and read the "export NAME=value" lines it
+    prints, up to the one starting with last_line."""
+    proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, cwd=REPO,
+                            env=dict(os.environ, PYTHONUNBUFFERED="1"))
+    env = {}
+    for line in proc.stdout:
+        if line.startswith("export "):
+            name, _, value = line[7:].strip().partition("=")
+            env[name] = value
+            if line.startswith(last_line):
+                return proc, env
+    proc.wait()
+    print(f"Error: {' '.join(command)} did not start")
+    exit(1)
+
+
+def summary(values: List[float]) -> Optional[Dict[str, float]]:
+    if not values:
+        return None
+    values = sorted(values)
+
+    def pct(p):
+        return values[min(len(values) - 1, int(p * len(values)))]
+
+    return {
+        "median": statistics.median(values),
+        "min": values[0],
+        "p90": pct(0.9),
+        "p99": pct(0.99),
+        "max": values[-1],
+        "count": len(values),
+    }
+
+
+def run_once(script: str, script_args: List[str], env: Dict[str, str], timeout: float) -> Dict[str, Any]:
+    """Run a script under the probe; returns its measurements."""
+    with tempfile.TemporaryDirectory() as tmp:
+        probe_out = os.path.join(tmp, "probe.json")
+        output = os.path.join(tmp, "output.txt")
+        env = dict(env, BENCH_PROBE_OUT=probe_out)
+        command = [sys.executable, "-X", "importtime", os.path.join(BENCHMARKS, "probe.py"),
+                   os.path.join(REPO, script)] + script_args
+        with open(output, "w+") as out:
+            spawned = time.time()
+            proc = subprocess.Popen(command, stdout=out, stderr=out, stdin=subprocess.DEVNULL,
+                                    env=env, cwd=os.path.dirname(os.path.join(REPO, script)))
+            try:
+                status, rusage = _wait(proc, timeout)
+                timed_out = False
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                status, rusage = _wait(proc, None)
+                timed_out = True
+            ended = time.time()
+            out.seek(0)
+            lines = out.read().splitlines()
+        import_us = 0
+        errors = []
+        for line in lines:
+            m = IMPORT_TIME.match(line)
+            if m:
+                import_us += int(m.group(1))
+            else:
+                errors.append(line)
+        probe = {}
+        if os.path.exists(probe_out):
+            with open(probe_out) as f:
+                probe = json.load(f)
+    requests = probe.get("requests", [])
+    result = {
+        "ok": status == 0 and not timed_out,
+        "wall_s": ended - spawned,
+        "startup_s": (requests[0][1] - spawned) if requests else None,
+        "import_s": import_us / 1e6,
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": rusage.ru_maxrss / 1024,
+        "latency_ms": [r[2] * 1000 for r in requests],
+        "requests": len(requests),
+    }
+    if not result["ok"]:
+        result["error"] = "timed out" if timed_out else "\n".join(errors[-5:])
+    return result
+
+
+def _wait(proc: subprocess.Popen, timeout: Optional[float]):
+    # os.wait4 gives the peak RSS of this child alone
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        pid, status, rusage = os.wait4(proc.pid, os.WNOHANG if deadline else 0)
+        if pid:
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            return proc.returncode, rusage
+        if time.monotonic() > deadline:
+            raise subprocess.TimeoutExpired(proc.args, timeout)
+        time.sleep(0.005)
+
+
+def run_suite(args: argparse.Namespace, env: Dict[str, str]) -> Dict[str, Any]:
+    results = {}
+    for entry in SUITE:
+        script, script_args = entry[0], entry[1]
+        if args.only and not any(fnmatch.fnmatch(script, f"*{pattern}*") for pattern in args.only):
+            continue
+        if len(entry) > 2:
+            results[script] = {"skipped": entry[2]}
+            print(f"{script}: skipped ({entry[2]})")
+            continue
+        runs = []
+        for _ in range(args.repeat):
+            if not args.warm_cache:
+                shutil.rmtree(env["BENCH_CACHE_DIR"], ignore_errors=True)
+                os.makedirs(env["BENCH_CACHE_DIR"])
+            runs.append(run_once(script, script_args, env, args.timeout))
+        ok = [r for r in runs if r["ok"]]
+        result = {
+            "runs": len(runs),
+            "failures": len(runs) - len(ok),
+            "requests": statistics.median(r["requests"] for r in ok) if ok else 0,
+        }
+        for metric in ("wall_s", "startup_s", "import_s", "peak_rss_mb"):
+            result[metric] = summary([r[metric] for r in ok if r[metric] is not None])
+        result["latency_ms"] = summary([latency for r in ok for latency in r["latency_ms"]])
+        if len(ok) < len(runs):
+            result["error"] = next(r["error"] for r in runs if not r["ok"])
+        results[script] = result
+        wall = result["wall_s"]
+        print(f"{script}: " + (f"{wall['median']:.3f}s" if wall else "failed")
+              + (f" ({result['failures']} of {len(runs)} failed)" if result["failures"] else ""), flush=True)
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Print each metric against the baseline; returns the regressions."""
+    regressions = []
+    width = max(map(len, results))
+    print(f"\n{'script':<{width}} {'metric':<12} {'baseline':>10} {'now':>10} {'change':>8}")
+    for script, result in results.items():
+        before = baseline.get("scripts", {}).get(script)
+        if not before or "skipped" in result or "skipped" in before:
+            continue
+        for metric in COMPARED:
+            old, new = before.get(metric), result.get(metric)
+            if not old or not new or not old["median"]:
+                continue
+            change = new["median"] / old["median"] - 1
+            flag = ""
+            if change > threshold:
+                flag = "  REGRESSION"
+                regressions.append(f"{script} {metric}")
+            print(f"{script:<{width}} {metric:<12} {old['median']:>10.3f} {new['median']:>10.3f} "
+                  f"{change:>+8.1%}{flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the sample scripts against stand-in servers")
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="runs per script")
+    parser.add_argument("--only", action="append", help="run only scripts whose path contains this (repeatable)")
+    parser.add_argument("--output", default="benchmark-results.json", help="file to write the results to")
+    parser.add_argument("--baseline", help="results file to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative increase counted as a regression")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds before a run is stopped and failed")
+    parser.add_argument("--latency", type=float, default=0, help="stand-in node latency per REST request, in ms")
+    parser.add_argument("--stream-events", type=int, default=2000,
+                        help="events per gRPC stream, or market data updates per subscription, before it ends")
+    parser.add_argument("--warm-cache", action="store_true",
+                        help="keep wallet token and metadata caches between runs (default: every run starts cold)")
+    args = parser.parse_args()
+
+    grpc_node, grpc_env = start_stand_in(
+        [sys.executable, "mock-node/mock-grpc-node.py", "--port", "0", "--rate", "0", "--batch", "100",
+         "--count", str(args.stream_events), "--report", "0"],
+        "export NODE_URL_GRPC",
+    )
+    # The wallet server sends transactions prepared by the gRPC node back to it
+    rest, rest_env = start_stand_in(
+        [sys.executable, "mock-node/mock-node.py", "--port", "0", "--latency", str(args.latency),
+         "--grpc-node", grpc_env["NODE_URL_GRPC"], "--stream-rate", "0", "--stream-count", str(args.stream_events)],
+        "export REQUESTS_CA_BUNDLE",
+    )
+    cache_dir = tempfile.mkdtemp(prefix="vega-bench-cache-")
+    env = dict(
+        os.environ,
+        **rest_env,
+        **grpc_env,
+        PYTHONPATH=REPO,
+        WALLET_NAME="benchmark",
+        WALLET_PASSPHRASE="benchmark",
+        BENCH_CACHE_DIR=cache_dir,
+        WALLET_TOKEN_CACHE=os.path.join(cache_dir, "wallet-tokens.json"),
+        METADATA_CACHE=os.path.join(cache_dir, "metadata.json"),
+    )
+    env.pop("EXPORT_DIR", None)
+    try:
+        results = run_suite(args, env)
+    finally:
+        rest.terminate()
+        grpc_node.terminate()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "commit": subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO, capture_output=True,
+                                     text=True).stdout.strip(),
+            "repeat": args.repeat,
+            "latency_ms": args.latency,
+            "stream_events": args.stream_events,
+        },
+        "scripts": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regressions over {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            exit(1)
@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+
+"""
+Script language: Python3
+
+Talks to:
+- Nothing: decodes recorded (or generated) GraphQL websocket frames
+
+Apps/Libraries:
+- JSON: json (standard library), orjson and ujson if installed
+"""
+
+# Measures messages per second for decoding market data subscription frames:
+# parsing every frame with json.loads (as a handler would without a decoder),
+# and with the FrameDecoder from stream-marketdata/decoding.py using each JSON
+# backend which is installed. Record real frames with:
+#   python3 stream-marketdata/stream-marketdata.py --all --record frames.txt
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "stream-marketdata"))
+from decoding import JSON_BACKENDS, MARKET_DATA_INT_FIELDS, FrameDecoder, json_loads  # noqa: E402
+
+
+def generate_frames(count: int, ka_every: int) -> list:
+    frames = []
+    for i in range(count):
+        if ka_every and i % ka_every == 0:
+            frames.append('{"type":"ka"}\n')
+            continue
+        market_data = {
+            "market": {"id": "VHSRA2G5MDFKREFJ5TOAGHZBBDGCYS67"},
+            "timestamp": str(1600787450760093039 + i * 1000000000),
+            "bestBidPrice": str(9973800 + i % 100),
+            "bestBidVolume": str(1000 + i % 37),
+            "bestOfferPrice": str(9983800 + i % 100),
+            "bestOfferVolume": str(1200 + i % 41),
+            "markPrice": str(9978800 + i % 100),
+        }
+        frame = {"id": str(1 + i % 4), "type": "data", "payload": {"data": {"marketData": market_data}}}
+        frames.append(json.dumps(frame, separators=(",", ":")) + "\n")
+    return frames
+
+
+def naive(frames: list) -> None:
+    # What a handler does without a decoder: parse every frame, and convert
+    # the numbers it uses
+    for message in frames:
+        msg = json.loads(message)
+        if msg["type"] == "data":
+            market_data = msg["payload"]["data"]["marketData"]
+            for field in MARKET_DATA_INT_FIELDS:
+                if field in market_data:
+                    market_data[field] = int(market_data[field])
+
+
+def with_decoder(decoder: FrameDecoder):
+    def run(frames: list) -> None:
+        decode = decoder.decode
+        for message in frames:
+            decode(message)
+
+    return run
+
+
+def measure(fn, frames: list, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(frames)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(frames) / best
+
+
+parser = argparse.ArgumentParser(description="Websocket frame decoding throughput")
+parser.add_argument("--frames", help="file of recorded frames, one per line")
+parser.add_argument("-n", "--count", type=int, default=100000, help="frames to generate")
+parser.add_argument("--ka-every", type=int, default=10, help="one keep-alive frame per this many frames")
+parser.add_argument("-r", "--repeat", type=int, default=5, help="runs per decoder, the best is reported")
+args = parser.parse_args()
+
+if args.frames:
+    with open(args.frames) as f:
+        frames = [line for line in f if line.strip()]
+else:
+    frames = generate_frames(args.count, args.ka_every)
+print(f"{len(frames)} frames")
+
+runs = [("json.loads, every frame", naive)]
+for backend in JSON_BACKENDS:
+    try:
+        loads = json_loads(backend)
+    except ImportError:
+        print(f"{backend}: not installed")
+        continue
+    runs.append((f"FrameDecoder, {backend}", with_decoder(FrameDecoder(loads))))
+
+for name, fn in runs:
+    rate = measure(fn, frames, args.repeat)
+    print(f"{name:<28} {rate:>12,.0f} msg/s")
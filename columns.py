@@ -0,0 +1,212 @@
+"""
+Column files: rows stored column by column, for fast loading into NumPy or
+pandas. Ints are stored as int64, strings which repeat (e.g. party ids) are
+dictionary-encoded, and unique strings (e.g. order ids) are stored as text.
+
+    writer = columns.ColumnWriter(
+        "export/trades.vcol", [("id", "text"), ("price", "int"), ("buyer", "str")])
+    writer.append(("V0000847867-0042253516-0000000001", 128588, "7c29..."))
+    writer.close()
+    prices = columns.ColumnReader("export/trades.vcol").column("price")
+"""
+
+import json
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Union
+
+# Column files: a sequence of chunks, each "VCOL", a 4-byte little-endian
+# header length, a JSON header, and the column data it describes
+COLUMN_MAGIC = b"VCOL"
+_COLUMN_HEADER_LENGTH = struct.Struct("<I")
+# Typecodes of int columns (int64), of dictionary codes (int32) and of the
+# lengths of text values (int32, followed by the UTF-8 values themselves)
+_COLUMN_ARRAYS = {"int": "q", "str": "i", "text": "i"}
+
+
+def _column_array(typecode: str, data: bytes = b"") -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()  # Stored little-endian
+    return values
+
+
+def _column_chunks(f) -> Iterable[Tuple[Dict[str, Any], int]]:
+    # (header, offset of its data) for each complete chunk of a column file
+    while True:
+        start = f.tell()
+        prefix = f.read(len(COLUMN_MAGIC) + _COLUMN_HEADER_LENGTH.size)
+        if len(prefix) < len(COLUMN_MAGIC) + _COLUMN_HEADER_LENGTH.size or prefix[:4] != COLUMN_MAGIC:
+            f.seek(start)
+            return
+        (length,) = _COLUMN_HEADER_LENGTH.unpack_from(prefix, 4)
+        raw = f.read(length)
+        if len(raw) < length:
+            f.seek(start)
+            return
+        header = json.loads(raw)
+        data_offset = f.tell()
+        end = data_offset + sum(c["length"] for c in header["columns"])
+        if f.seek(0, os.SEEK_END) < end:
+            f.seek(start)
+            return  # Torn chunk at the end of the file
+        f.seek(end)
+        yield header, data_offset
+
+
+class ColumnWriter:
+    """Write rows to a column file, in chunks of chunk_rows rows.
+
+    columns is a list of (name, type), with type "int" (stored as int64),
+    "str" (dictionary-encoded: each distinct value is stored once, and rows
+    hold int32 codes) or "text" (each value stored in full, for strings
+    which rarely repeat, such as ids, whose dictionaries would only grow).
+    Opening an existing file appends to it, keeping its
+    dictionaries; its columns must be the same.
+    """
+
+    def __init__(self, path: str, columns: Sequence[Tuple[str, str]], chunk_rows: int = 65536):
+        self.path = path
+        self.columns = [(name, kind) for name, kind in columns]
+        for name, kind in self.columns:
+            if kind not in _COLUMN_ARRAYS:
+                raise ValueError(f"Unknown type {kind!r} for column {name}")
+        self.chunk_rows = chunk_rows
+        # Per "str" column: value -> code
+        self._dictionaries: Dict[str, Dict[str, int]] = {name: {} for name, kind in self.columns if kind == "str"}
+        self._rows: List[Sequence[Any]] = []
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(path, "a+b")
+        self._file.seek(0)
+        for header, _ in _column_chunks(self._file):
+            existing = [(c["name"], c["type"]) for c in header["columns"]]
+            if existing != self.columns:
+                self._file.close()
+                raise ValueError(f"{path} has columns {existing}, not {self.columns}")
+            for name, values in header.get("dictionary", {}).items():
+                dictionary = self._dictionaries[name]
+                for value in values:
+                    dictionary[value] = len(dictionary)
+        # Drop a torn chunk left by an interrupted run
+        self._file.truncate(self._file.tell())
+
+    def append(self, row: Sequence[Any]) -> None:
+        """Add a row: one value per column, in column order."""
+        self._rows.append(row)
+        if len(self._rows) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered rows as a chunk."""
+        if not self._rows:
+            return
+        blobs = []
+        header: Dict[str, Any] = {"rows": len(self._rows), "columns": [], "dictionary": {}}
+        for i, (name, kind) in enumerate(self.columns):
+            if kind == "int":
+                values = array("q", (int(row[i]) for row in self._rows))
+            elif kind == "text":
+                encoded = [row[i].encode() for row in self._rows]
+                values = array("i", (len(value) for value in encoded))
+            else:
+                dictionary = self._dictionaries[name]
+                new = []
+                codes = array("i")
+                for row in self._rows:
+                    code = dictionary.get(row[i])
+                    if code is None:
+                        code = dictionary[row[i]] = len(dictionary)
+                        new.append(row[i])
+                    codes.append(code)
+                header["dictionary"][name] = new
+                values = codes
+            if sys.byteorder == "big":
+                values.byteswap()
+            blob = values.tobytes()
+            if kind == "text":
+                blob += b"".join(encoded)
+            header["columns"].append({"name": name, "type": kind, "length": len(blob)})
+            blobs.append(blob)
+        raw = json.dumps(header, separators=(",", ":")).encode()
+        self._file.write(COLUMN_MAGIC + _COLUMN_HEADER_LENGTH.pack(len(raw)) + raw)
+        for blob in blobs:
+            self._file.write(blob)
+        self._file.flush()
+        self._rows = []
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+
+
+class ColumnReader:
+    """Read a column file written by ColumnWriter, one column at a time.
+
+    Int columns are returned as array("q"), which NumPy can use without a
+    copy: numpy.frombuffer(reader.column("price"), dtype="int64").
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._chunks = list(_column_chunks(self._file))
+        self.rows = sum(header["rows"] for header, _ in self._chunks)
+        self.columns: List[Tuple[str, str]] = []
+        if self._chunks:
+            self.columns = [(c["name"], c["type"]) for c in self._chunks[0][0]["columns"]]
+        self._types = dict(self.columns)
+
+    def codes(self, name: str) -> Tuple[array, List[str]]:
+        """The int32 codes of a "str" column, and the values they stand for."""
+        if self._types.get(name) != "str":
+            raise KeyError(f"No str column {name}")
+        codes = self._read(name)
+        dictionary: List[str] = []
+        for header, _ in self._chunks:
+            dictionary.extend(header["dictionary"].get(name, ()))
+        return codes, dictionary
+
+    def column(self, name: str) -> Union[array, List[str]]:
+        """The values of a column: array("q") for "int", a list for "str"
+        and "text"."""
+        if self._types.get(name) == "str":
+            codes, dictionary = self.codes(name)
+            return [dictionary[code] for code in codes]
+        if self._types.get(name) == "text":
+            return self._read_text(name)
+        if name not in self._types:
+            raise KeyError(f"No column {name}")
+        return self._read(name)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _read(self, name: str) -> array:
+        values = _column_array(_COLUMN_ARRAYS[self._types[name]])
+        for _, data in self._blobs(name):
+            values.extend(_column_array(values.typecode, data))
+        return values
+
+    def _read_text(self, name: str) -> List[str]:
+        values: List[str] = []
+        for rows, data in self._blobs(name):
+            lengths = _column_array("i", data[:rows * 4])
+            offset = rows * 4
+            for length in lengths:
+                values.append(data[offset:offset + length].decode())
+                offset += length
+        return values
+
+    def _blobs(self, name: str) -> Iterable[Tuple[int, bytes]]:
+        # (rows, data of the column) for each chunk
+        for header, offset in self._chunks:
+            for c in header["columns"]:
+                if c["name"] == name:
+                    self._file.seek(offset)
+                    yield header["rows"], self._file.read(c["length"])
+                    break
+                offset += c["length"]
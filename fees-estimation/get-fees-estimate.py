@@ -20,9 +20,10 @@ Apps/Libraries:
 # :something__
 
 import json
-import requests
 import os
 import helpers
+import metadata
+import walletauth
 
 node_url_rest = os.getenv("NODE_URL_REST")
 if not helpers.check_url(node_url_rest):
@@ -47,20 +48,19 @@ if not helpers.check_var(wallet_passphrase):
 # Help guide users against including api version suffix on url
 wallet_server_url = helpers.check_wallet_url(wallet_server_url)
 
+session = helpers.session()
+
 print(f"Logging into wallet: {wallet_name}")
 
-# Log in to an existing wallet
-req = {"wallet": wallet_name, "passphrase": wallet_passphrase}
-response = requests.post(f"{wallet_server_url}/api/v1/auth/token", json=req)
-helpers.check_response(response)
-token = response.json()["token"]
+# Log in to an existing wallet (the token is cached on disk and reused)
+wallet_auth = walletauth.WalletAuth(wallet_server_url, wallet_name, wallet_passphrase, session)
+token = wallet_auth.token()
 
 assert token != ""
 print("Logged in to wallet successfully")
 
 # List key pairs and select public key to use
-headers = {"Authorization": f"Bearer {token}"}
-response = requests.get(f"{wallet_server_url}/api/v1/keys", headers=headers)
+response = session.get(f"{wallet_server_url}/api/v1/keys", auth=wallet_auth)
 helpers.check_response(response)
 keys = response.json()["keys"]
 pubkey = keys[0]["pub"]
@@ -70,10 +70,8 @@ print("Selected pubkey for signing")
 
 # __get_market:
 # Request the identifier for the market to place on
-url = f"{node_url_rest}/markets"
-response = requests.get(url)
-helpers.check_response(response)
-marketID = response.json()["markets"][0]["id"]
+# Note: the list of markets is cached, see metadata.MetadataRegistry
+marketID = metadata.registry(node_url_rest).first_market_id()
 # :get_market__
 
 assert marketID != ""
@@ -94,7 +92,7 @@ req = {
 }
 print(json.dumps(req, indent=2, sort_keys=True))
 url = f"{node_url_rest}/orders/fee/estimate"
-response = requests.post(url, json=req)
+response = session.post(url, json=req)
 helpers.check_response(response)
 estimatedFees = response.json()
 # :get_estimate__
@@ -20,7 +20,6 @@ Apps/Libraries:
 # :something__
 
 import json
-import requests
 import os
 import helpers
 
@@ -29,13 +28,15 @@ if not helpers.check_url(node_url_rest):
     print("Error: Invalid or missing NODE_URL_REST environment variable.")
     exit(1)
 
+session = helpers.session()
+
 # __get_order_by_ref:
 # Request an order by reference on a Vega network
 # Note: This is an example and order reference will be provided in the response
 # from a prepareSubmitOrder request in the field named `submitID` or similar.
 reference = "4617844f-6fab-4cf6-8852-e29dbd96e5f1"
 url = "{base}/orders/{ref}".format(base=node_url_rest, ref=reference)
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("OrderByReference:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)))
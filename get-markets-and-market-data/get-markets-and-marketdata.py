@@ -21,18 +21,31 @@ Apps/Libraries:
 
 import json
 import os
-import requests
 import helpers
+import columns
 
 node_url_rest = os.getenv("NODE_URL_REST")
 if not helpers.check_url(node_url_rest):
     print("Error: Invalid or missing NODE_URL_REST environment variable.")
     exit(1)
 
+session = helpers.session()
+
+# Optional: also append the results to column files in this directory (see
+# columns.ColumnWriter), which load much faster than the printed JSON
+export_dir = os.getenv("EXPORT_DIR")
+
+# Market data fields to export, as column files hold ints or strings
+MARKET_DATA_COLUMNS = [
+    ("market", "str"), ("timestamp", "int"), ("markPrice", "int"), ("bestBidPrice", "int"),
+    ("bestBidVolume", "int"), ("bestOfferPrice", "int"), ("bestOfferVolume", "int"),
+    ("midPrice", "int"), ("openInterest", "int"), ("auctionStart", "int"), ("auctionEnd", "int"),
+]
+
 # __get_markets:
 # Request a list of markets available on a Vega network
 url = "{base}/markets".format(base=node_url_rest)
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 response_json = response.json()
 print("Markets:\n{}".format(json.dumps(response_json, indent=2, sort_keys=True)))
@@ -44,8 +57,22 @@ assert market_id != ""
 # __get_market_data:
 # Request the market data for a market on a Vega network
 url = "{base}/markets-data/{marketID}".format(base=node_url_rest, marketID=market_id)
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 response_json = response.json()
 print("MarketData:\n{}".format(json.dumps(response_json, indent=2, sort_keys=True)))
 # :get_market_data__
+
+# __export_market_data:
+# Append this snapshot to a column file, so repeated runs build a time series
+if export_dir:
+    market_data = response_json["marketData"]
+    path = os.path.join(export_dir, "marketdata.vcol")
+    writer = columns.ColumnWriter(path, MARKET_DATA_COLUMNS)
+    writer.append([
+        market_data.get(name, "") if kind == "str" else int(market_data.get(name, 0))
+        for name, kind in MARKET_DATA_COLUMNS
+    ])
+    writer.close()
+    print("Appended market data to {}".format(path))
+# :export_market_data__
@@ -29,6 +29,8 @@ import vegaapiclient as vac
 data_client = vac.VegaTradingDataClient(node_url_grpc)
 # :import_client__
 
+from records import ORDER_STATUSES, Order, Trade
+
 markets = data_client.Markets(Empty()).markets
 market_id = markets[0].id
 assert market_id != ""
@@ -52,3 +54,21 @@ trades_by_market_request = vac.api.trading.TradesByMarketRequest(
 trades_response = data_client.TradesByMarket(trades_by_market_request)
 print("TradesByMarket:\n{}".format(trades_response))
 # :get_trades_for_market__
+
+# __compact_records:
+# The orders and trades are converted to compact records (see records.py), with
+# ints for prices, sizes and timestamps and enum values for side and status
+order_count = active_count = active_volume = 0
+for o in orders_response.orders:
+    order = Order.from_proto(o)
+    order_count += 1
+    if order.status == ORDER_STATUSES["STATUS_ACTIVE"]:
+        active_count += 1
+        active_volume += order.remaining
+print("{} of {} orders active, {} remaining volume".format(active_count, order_count, active_volume))
+trade_count = trade_volume = 0
+for t in trades_response.trades:
+    trade_count += 1
+    trade_volume += Trade.from_proto(t).size
+print("{} trades, {} volume".format(trade_count, trade_volume))
+# :compact_records__
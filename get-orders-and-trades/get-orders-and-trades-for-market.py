@@ -21,35 +21,86 @@ Apps/Libraries:
 
 import json
 import os
-import requests
+import time
 import helpers
+import columns
+import metadata
+from jsonstream import iter_json_list
+from records import ORDER_COLUMNS, ORDER_STATUSES, SNAPSHOT_COLUMNS, TRADE_COLUMNS, Order, Trade
 
 node_url_rest = os.getenv("NODE_URL_REST")
 if not helpers.check_url(node_url_rest):
     print("Error: Invalid or missing NODE_URL_REST environment variable.")
     exit(1)
 
-url = "{base}/markets".format(base=node_url_rest)
-response = requests.get(url)
-helpers.check_response(response)
-responseJson = response.json()
-marketID = responseJson["markets"][0]["id"]
+session = helpers.session()
+
+# Optional: also append the results to column files in this directory (see
+# columns.ColumnWriter), which load much faster than the printed JSON. Each
+# run appends a snapshot of all the orders and trades, with the time of the
+# run (in nanoseconds) in the snapshot column.
+export_dir = os.getenv("EXPORT_DIR")
+snapshot = time.time_ns()
+
+# Note: the list of markets is cached, see metadata.MetadataRegistry
+marketID = metadata.registry(node_url_rest).first_market_id()
 assert marketID != ""
 
 # __get_orders_for_market:
 # Request a list of orders by market on a Vega network
 url = "{base}/markets/{marketID}/orders".format(base=node_url_rest, marketID=marketID)
-response = requests.get(url)
+response = session.get(url, stream=True)
 helpers.check_response(response)
-response_json = response.json()
-print("OrdersByMarket:\n{}".format(json.dumps(response_json, indent=2, sort_keys=True)))
+# Note: the list is parsed while it downloads, one order at a time, rather
+# than loaded into memory whole (it can be very large on a busy market)
+orders = iter_json_list(response, "orders")
 # :get_orders_for_market__
 
+# Each order is converted to a compact record (see records.py), with ints for
+# prices, sizes and timestamps and enum values for side and status, counted
+# and, optionally, appended to the column file
+print("OrdersByMarket:")
+writer = None
+if export_dir:
+    path = os.path.join(export_dir, "market-orders.vcol")
+    writer = columns.ColumnWriter(path, SNAPSHOT_COLUMNS + ORDER_COLUMNS)
+order_count = active_count = active_volume = 0
+for order in orders:
+    print(json.dumps(order, indent=2, sort_keys=True))
+    record = Order.from_json(order)
+    order_count += 1
+    if record.status == ORDER_STATUSES["STATUS_ACTIVE"]:
+        active_count += 1
+        active_volume += record.remaining
+    if writer is not None:
+        writer.append((snapshot,) + record.row())
+print("{} of {} orders active, {} remaining volume".format(active_count, order_count, active_volume))
+if writer is not None:
+    writer.close()
+
 # __get_trades_for_market:
 # Request a list of trades by market on a Vega network
 url = "{base}/markets/{marketID}/trades".format(base=node_url_rest, marketID=marketID)
-response = requests.get(url)
+response = session.get(url, stream=True)
 helpers.check_response(response)
-response_json = response.json()
-print("TradesByMarket:\n{}".format(json.dumps(response_json, indent=2, sort_keys=True)))
+# Note: the list is parsed while it downloads, one trade at a time, rather
+# than loaded into memory whole (it can be very large on a busy market)
+trades = iter_json_list(response, "trades")
 # :get_trades_for_market__
+
+print("TradesByMarket:")
+writer = None
+if export_dir:
+    path = os.path.join(export_dir, "market-trades.vcol")
+    writer = columns.ColumnWriter(path, SNAPSHOT_COLUMNS + TRADE_COLUMNS)
+trade_count = trade_volume = 0
+for trade in trades:
+    print(json.dumps(trade, indent=2, sort_keys=True))
+    record = Trade.from_json(trade)
+    trade_count += 1
+    trade_volume += record.size
+    if writer is not None:
+        writer.append((snapshot,) + record.row())
+print("{} trades, {} volume".format(trade_count, trade_volume))
+if writer is not None:
+    writer.close()
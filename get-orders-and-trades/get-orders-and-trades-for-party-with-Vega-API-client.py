@@ -32,7 +32,7 @@ data_client = vac.VegaTradingDataClient(node_url_grpc)
 # :import_client__
 
 wallet_server_url = os.getenv("WALLETSERVER_URL")
-if not helpers.check_url(walletserver_url):
+if not helpers.check_url(wallet_server_url):
     print("Error: Invalid or missing WALLETSERVER_URL environment variable.")
     exit(1)
 
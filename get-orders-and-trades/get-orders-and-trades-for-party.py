@@ -22,8 +22,12 @@ Apps/Libraries:
 
 import json
 import os
-import requests
+import time
 import helpers
+import columns
+import walletauth
+from jsonstream import iter_json_list
+from records import ORDER_COLUMNS, SNAPSHOT_COLUMNS, TRADE_COLUMNS, Order, Trade
 
 node_url_rest = os.getenv("NODE_URL_REST")
 if not helpers.check_url(node_url_rest):
@@ -48,21 +52,26 @@ if not helpers.check_var(wallet_passphrase):
 # Help guide users against including api version suffix on url
 wallet_server_url = helpers.check_wallet_url(wallet_server_url)
 
+session = helpers.session()
+
+# Optional: also append the results to column files in this directory (see
+# columns.ColumnWriter), which load much faster than the printed JSON. Each
+# run appends a snapshot of all the orders and trades, with the time of the
+# run (in nanoseconds) in the snapshot column.
+export_dir = os.getenv("EXPORT_DIR")
+snapshot = time.time_ns()
+
 # __existing_wallet:
 # Make request to log in to existing wallet
-url = "{base}/api/v1/auth/token".format(base=wallet_server_url)
-req = {"wallet": wallet_name, "passphrase": wallet_passphrase}
-response = requests.post(url, json=req)
-helpers.check_response(response)
+# Note: the token is cached on disk and reused until it expires
+wallet_auth = walletauth.WalletAuth(wallet_server_url, wallet_name, wallet_passphrase, session)
+wallet_auth.token()
 # :existing_wallet__
 
-token = response.json()["token"]
-
 # __find_keypair:
 # Find an existing keypair for wallet
-headers = {"Authorization": "Bearer " + token}
 url = "{base}/api/v1/keys".format(base=wallet_server_url)
-response = requests.get(url, headers=headers)
+response = session.get(url, auth=wallet_auth)
 helpers.check_response(response)
 keys = response.json()["keys"]
 assert len(keys) > 0
@@ -74,17 +83,49 @@ assert pubKey != ""
 # __get_orders_for_party:
 # Request a list of orders by party (pubKey)
 url = "{base}/parties/{party}/orders".format(base=node_url_rest, party=pubKey)
-response = requests.get(url)
+response = session.get(url, stream=True)
 helpers.check_response(response)
-response_json = response.json()
-print("OrdersByParty:\n{}".format(json.dumps(response_json, indent=2, sort_keys=True)))
+# Note: the list is parsed while it downloads, one order at a time, rather
+# than loaded into memory whole (it can be very large for an active party)
+orders = iter_json_list(response, "orders")
 # :get_orders_for_party__
 
+print("OrdersByParty:")
+writer = None
+if export_dir:
+    path = os.path.join(export_dir, "party-orders.vcol")
+    writer = columns.ColumnWriter(path, SNAPSHOT_COLUMNS + ORDER_COLUMNS)
+count = 0
+for order in orders:
+    print(json.dumps(order, indent=2, sort_keys=True))
+    if writer is not None:
+        writer.append((snapshot,) + Order.from_json(order).row())
+    count += 1
+print("{} orders".format(count))
+if writer is not None:
+    writer.close()
+
 # __get_trades_for_party:
 # Request a list of trades by party (pubKey)
 url = "{base}/parties/{party}/trades".format(base=node_url_rest, party=pubKey)
-response = requests.get(url)
+response = session.get(url, stream=True)
 helpers.check_response(response)
-response_json = response.json()
-print("TradesByParty:\n{}".format(json.dumps(response_json, indent=2, sort_keys=True)))
+# Note: the list is parsed while it downloads, one trade at a time, rather
+# than loaded into memory whole (it can be very large for an active party)
+trades = iter_json_list(response, "trades")
 # :get_trades_for_party__
+
+print("TradesByParty:")
+writer = None
+if export_dir:
+    path = os.path.join(export_dir, "party-trades.vcol")
+    writer = columns.ColumnWriter(path, SNAPSHOT_COLUMNS + TRADE_COLUMNS)
+count = 0
+for trade in trades:
+    print(json.dumps(trade, indent=2, sort_keys=True))
+    if writer is not None:
+        writer.append((snapshot,) + Trade.from_json(trade).row())
+    count += 1
+print("{} trades".format(count))
+if writer is not None:
+    writer.close()
@@ -21,7 +21,6 @@ Apps/Libraries:
 
 import json
 import os
-import requests
 import helpers
 
 node_url_rest = os.getenv("NODE_URL_REST")
@@ -29,11 +28,13 @@ if not helpers.check_url(node_url_rest):
     print("Error: Invalid or missing NODE_URL_REST environment variable.")
     exit(1)
 
+session = helpers.session()
+
 # __get_trades_for_order:
 # Request a list of trades for a specific order on a Vega network
 orderID = "V0000929211-0046318720"
 url = "{base}/orders/{orderID}/trades".format(base=node_url_rest, orderID=orderID)
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 responseJson = response.json()
 print("TradesByOrderID:\n{}".format(json.dumps(responseJson, indent=2, sort_keys=True)))
@@ -0,0 +1,97 @@
+"""
+Incremental parsing of large JSON responses.
+"""
+
+import codecs
+import json
+from typing import Any, Iterable
+
+import requests
+
+_JSON_WHITESPACE = " \t\n\r"
+_JSON_DELIMITERS = ",]}" + _JSON_WHITESPACE
+
+
+def iter_json_list(response: requests.Response, key: str, chunk_size: int = 64 * 1024) -> Iterable[Any]:
+    """Yield the items of the list response_json[key] one at a time, parsing
+    the body while it downloads.
+
+    The request must be made with stream=True. Only the current chunk and
+    the item being parsed are held in memory, instead of the whole body and
+    the whole list. Other top-level values are parsed and skipped."""
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder(response.encoding or "utf-8")()
+    chunks = response.iter_content(chunk_size)
+    buf = ""
+    pos = 0
+    eof = False
+
+    def more() -> bool:
+        # Append the next chunk to the unparsed part of the buffer
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof = True
+            buf = buf[pos:] + text.decode(b"", final=True)
+        else:
+            buf = buf[pos:] + text.decode(chunk)
+        pos = 0
+        return True
+
+    def skip_ws() -> str:
+        # The next non-whitespace character, or "" at the end of the body
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in _JSON_WHITESPACE:
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if not more():
+                return ""
+
+    def value() -> Any:
+        # Parse a whole value, reading more of the body until it is complete.
+        # Strings, objects and arrays end with their closing character, but a
+        # scalar (e.g. 12 of 12.5e3) is only complete once a delimiter follows.
+        nonlocal pos
+        skip_ws()
+        while True:
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+                if eof or (end < len(buf) and (buf[pos] in '"{[' or buf[end] in _JSON_DELIMITERS)):
+                    pos = end
+                    return obj
+            except ValueError:
+                if eof:
+                    raise
+            more()
+
+    def expect(chars: str) -> str:
+        nonlocal pos
+        c = skip_ws()
+        if c == "" or c not in chars:
+            raise ValueError(f"Expected one of {chars!r} at {pos}, got {c!r}")
+        pos += 1
+        return c
+
+    expect("{")
+    if skip_ws() == "}":
+        return
+    while True:
+        name = value()
+        expect(":")
+        if name == key and skip_ws() == "[":
+            pos += 1
+            if skip_ws() == "]":
+                pos += 1
+            else:
+                while True:
+                    yield value()
+                    if expect(",]") == "]":
+                        break
+        else:
+            value()
+        if expect(",}") == "}":
+            return
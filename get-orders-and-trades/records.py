@@ -0,0 +1,245 @@
+"""
+Compact records for orders and trades.
+
+The REST API returns each order or trade as a dict of strings: numbers such
+as "128588" and enums such as "SIDE_BUY". Order and Trade keep numbers as
+ints and enums as their small int protobuf values, in __slots__ classes
+(no per-record dict), and share one copy of each market and party id
+between records. They can be made from REST JSON or from the gRPC
+vac.vega.Order and vac.vega.Trade messages, so both give the same records.
+
+    orders = [Order.from_json(o) for o in response.json()["orders"]]
+    orders = [Order.from_proto(o) for o in data_client.OrdersByMarket(req).orders]
+"""
+
+import sys
+from typing import Any, Dict, Tuple
+
+
+def _enum(*names: str) -> Tuple[Dict[str, int], Tuple[str, ...]]:
+    # Names in order of their protobuf values: name -> value, and value -> name
+    return {name: value for value, name in enumerate(names)}, names
+
+
+# Values of the vega.Side, vega.Order.Status, vega.Order.TimeInForce,
+# vega.Order.Type and vega.Trade.Type protobuf enums
+SIDES, SIDE_NAMES = _enum("SIDE_UNSPECIFIED", "SIDE_BUY", "SIDE_SELL")
+ORDER_STATUSES, ORDER_STATUS_NAMES = _enum(
+    "STATUS_INVALID",
+    "STATUS_ACTIVE",
+    "STATUS_EXPIRED",
+    "STATUS_CANCELLED",
+    "STATUS_STOPPED",
+    "STATUS_FILLED",
+    "STATUS_REJECTED",
+    "STATUS_PARTIALLY_FILLED",
+)
+TIMES_IN_FORCE, TIME_IN_FORCE_NAMES = _enum(
+    "TIF_UNSPECIFIED", "TIF_GTC", "TIF_GTT", "TIF_IOC", "TIF_FOK", "TIF_GFA", "TIF_GFN"
+)
+ORDER_TYPES, ORDER_TYPE_NAMES = _enum("TYPE_UNSPECIFIED", "TYPE_LIMIT", "TYPE_MARKET", "TYPE_NETWORK")
+TRADE_TYPES, TRADE_TYPE_NAMES = _enum(
+    "TYPE_UNSPECIFIED", "TYPE_DEFAULT", "TYPE_NETWORK_CLOSE_OUT_GOOD", "TYPE_NETWORK_CLOSE_OUT_BAD"
+)
+
+_intern = sys.intern
+
+# Columns of Order.row() and Trade.row(), for columns.ColumnWriter. Enums are
+# stored as their int values. Market and party ids repeat and are
+# dictionary-encoded; order and trade ids and references are unique, so they
+# are stored as text.
+ORDER_COLUMNS = [
+    ("id", "text"), ("market_id", "str"), ("party_id", "str"), ("side", "int"), ("price", "int"),
+    ("size", "int"), ("remaining", "int"), ("time_in_force", "int"), ("type", "int"),
+    ("status", "int"), ("created_at", "int"), ("expires_at", "int"), ("updated_at", "int"),
+    ("reference", "text"), ("version", "int"),
+]
+TRADE_COLUMNS = [
+    ("id", "text"), ("market_id", "str"), ("price", "int"), ("size", "int"), ("buyer", "str"),
+    ("seller", "str"), ("aggressor", "int"), ("buy_order", "text"), ("sell_order", "text"),
+    ("timestamp", "int"), ("type", "int"),
+]
+# Column to put before either, for exports which append a snapshot of all
+# orders or trades on each run: the time of the run
+SNAPSHOT_COLUMNS = [("snapshot", "int")]
+
+
+class Order:
+    __slots__ = (
+        "id", "market_id", "party_id", "side", "price", "size", "remaining", "time_in_force",
+        "type", "status", "created_at", "expires_at", "updated_at", "reference", "version",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        market_id: str,
+        party_id: str,
+        side: int,
+        price: int,
+        size: int,
+        remaining: int,
+        time_in_force: int,
+        type: int,
+        status: int,
+        created_at: int,
+        expires_at: int = 0,
+        updated_at: int = 0,
+        reference: str = "",
+        version: int = 0,
+    ):
+        self.id = id
+        self.market_id = _intern(market_id)
+        self.party_id = _intern(party_id)
+        self.side = side
+        self.price = price
+        self.size = size
+        self.remaining = remaining
+        self.time_in_force = time_in_force
+        self.type = type
+        self.status = status
+        self.created_at = created_at
+        self.expires_at = expires_at
+        self.updated_at = updated_at
+        self.reference = reference
+        self.version = version
+
+    @classmethod
+    def from_json(cls, o: Dict[str, Any]) -> "Order":
+        """From an order as returned by the REST API."""
+        return cls(
+            o["id"],
+            o["marketID"],
+            o["partyID"],
+            SIDES[o.get("side", "SIDE_UNSPECIFIED")],
+            int(o.get("price", 0)),
+            int(o.get("size", 0)),
+            int(o.get("remaining", 0)),
+            TIMES_IN_FORCE[o.get("timeInForce", "TIF_UNSPECIFIED")],
+            ORDER_TYPES[o.get("type", "TYPE_UNSPECIFIED")],
+            ORDER_STATUSES[o.get("status", "STATUS_INVALID")],
+            int(o.get("createdAt", 0)),
+            int(o.get("expiresAt", 0)),
+            int(o.get("updatedAt", 0)),
+            o.get("reference", ""),
+            int(o.get("version", 0)),
+        )
+
+    @classmethod
+    def from_proto(cls, o: Any) -> "Order":
+        """From a vac.vega.Order message."""
+        return cls(
+            o.id, o.marketID, o.partyID, o.side, o.price, o.size, o.remaining, o.timeInForce,
+            o.type, o.status, o.createdAt, o.expiresAt, o.updatedAt, o.reference, o.version,
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        """Back to the REST API's form (strings for numbers and enums)."""
+        return {
+            "id": self.id,
+            "marketID": self.market_id,
+            "partyID": self.party_id,
+            "side": SIDE_NAMES[self.side],
+            "price": str(self.price),
+            "size": str(self.size),
+            "remaining": str(self.remaining),
+            "timeInForce": TIME_IN_FORCE_NAMES[self.time_in_force],
+            "type": ORDER_TYPE_NAMES[self.type],
+            "status": ORDER_STATUS_NAMES[self.status],
+            "createdAt": str(self.created_at),
+            "expiresAt": str(self.expires_at),
+            "updatedAt": str(self.updated_at),
+            "reference": self.reference,
+            "version": str(self.version),
+        }
+
+    def row(self) -> Tuple[Any, ...]:
+        """The values of ORDER_COLUMNS."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return (
+            f"Order({self.id} {SIDE_NAMES[self.side]} {self.remaining}/{self.size} @ {self.price} "
+            f"{ORDER_STATUS_NAMES[self.status]})"
+        )
+
+
+class Trade:
+    __slots__ = (
+        "id", "market_id", "price", "size", "buyer", "seller", "aggressor",
+        "buy_order", "sell_order", "timestamp", "type",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        market_id: str,
+        price: int,
+        size: int,
+        buyer: str,
+        seller: str,
+        aggressor: int,
+        buy_order: str,
+        sell_order: str,
+        timestamp: int,
+        type: int,
+    ):
+        self.id = id
+        self.market_id = _intern(market_id)
+        self.price = price
+        self.size = size
+        self.buyer = _intern(buyer)
+        self.seller = _intern(seller)
+        self.aggressor = aggressor
+        self.buy_order = buy_order
+        self.sell_order = sell_order
+        self.timestamp = timestamp
+        self.type = type
+
+    @classmethod
+    def from_json(cls, t: Dict[str, Any]) -> "Trade":
+        """From a trade as returned by the REST API."""
+        return cls(
+            t["id"],
+            t["marketID"],
+            int(t.get("price", 0)),
+            int(t.get("size", 0)),
+            t.get("buyer", ""),
+            t.get("seller", ""),
+            SIDES[t.get("aggressor", "SIDE_UNSPECIFIED")],
+            t.get("buyOrder", ""),
+            t.get("sellOrder", ""),
+            int(t.get("timestamp", 0)),
+            TRADE_TYPES[t.get("type", "TYPE_UNSPECIFIED")],
+        )
+
+    @classmethod
+    def from_proto(cls, t: Any) -> "Trade":
+        """From a vac.vega.Trade message."""
+        return cls(
+            t.id, t.marketID, t.price, t.size, t.buyer, t.seller, t.aggressor,
+            t.buyOrder, t.sellOrder, t.timestamp, t.type,
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        """Back to the REST API's form (strings for numbers and enums)."""
+        return {
+            "id": self.id,
+            "marketID": self.market_id,
+            "price": str(self.price),
+            "size": str(self.size),
+            "buyer": self.buyer,
+            "seller": self.seller,
+            "aggressor": SIDE_NAMES[self.aggressor],
+            "buyOrder": self.buy_order,
+            "sellOrder": self.sell_order,
+            "timestamp": str(self.timestamp),
+            "type": TRADE_TYPE_NAMES[self.type],
+        }
+
+    def row(self) -> Tuple[Any, ...]:
+        """The values of TRADE_COLUMNS."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"Trade({self.id} {self.size} @ {self.price} buyer={self.buyer} seller={self.seller})"
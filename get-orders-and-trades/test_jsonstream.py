@@ -0,0 +1,62 @@
+"""
+Tests for jsonstream.iter_json_list. Run from this directory with:
+
+    python3 -m unittest test_jsonstream
+"""
+
+import json
+import unittest
+
+from jsonstream import iter_json_list
+
+
+class FakeResponse:
+    """Serves a body in fixed-size chunks, like a streamed requests.Response."""
+
+    def __init__(self, body: bytes, encoding: str = "utf-8"):
+        self.body = body
+        self.encoding = encoding
+
+    def iter_content(self, chunk_size: int):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+
+ITEMS = [
+    0, 7, -3, 1234567, 2.5, -0.125, 2.5e10, 1E-7, 12345678901234567890,
+    True, False, None,
+    "", "s", "quote \" backslash \\ slash / tab \t newline \n",
+    "café € \U0001F600",
+    {"id": "V0000001-0000000001", "price": "100000", "size": 10, "nested": {"a": [1, 2.75, {"b": None}]}},
+    [], {}, [[], [{}], [1, [2, [3e3]]]],
+]
+
+
+class IterJsonListTest(unittest.TestCase):
+
+    def check(self, data, key: str) -> None:
+        expected = data[key]
+        for body in (
+            json.dumps(data).encode(),
+            json.dumps(data, indent=2).encode(),
+            json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode(),
+        ):
+            for chunk_size in range(1, len(body) + 2):
+                with self.subTest(body=body[:40], chunk_size=chunk_size):
+                    items = list(iter_json_list(FakeResponse(body), key, chunk_size))
+                    self.assertEqual(items, expected)
+
+    def test_chunk_size_sweep(self):
+        self.check({"before": [1.5, "x"], "orders": ITEMS, "after": 10}, "orders")
+
+    def test_number_last_in_body(self):
+        self.check({"total": 42, "orders": [1, 22, 333]}, "orders")
+
+    def test_empty_and_missing_list(self):
+        self.assertEqual(list(iter_json_list(FakeResponse(b'{"orders": []}'), "orders", 1)), [])
+        self.assertEqual(list(iter_json_list(FakeResponse(b'{"other": [1, 2]}'), "orders", 1)), [])
+        self.assertEqual(list(iter_json_list(FakeResponse(b"{}"), "orders", 1)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
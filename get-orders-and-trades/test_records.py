@@ -0,0 +1,72 @@
+"""
+Tests for the Order and Trade records, with the example responses in
+response-examples.txt. Run from this directory with:
+
+    python3 -m unittest test_records
+"""
+
+import os
+import sys
+import unittest
+
+from records import ORDER_COLUMNS, TRADE_COLUMNS, Order, Trade
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "mock-node"))
+from fixtures import load_fixtures  # noqa: E402
+
+try:
+    from google.protobuf.json_format import ParseDict
+    import vegaapiclient as vac
+except ImportError:
+    vac = None
+
+FIXTURES = load_fixtures(os.path.join(HERE, ".."))
+ORDERS = FIXTURES[("get-orders-and-trades", "example_get_orders_for_market_response")]["orders"]
+TRADES = FIXTURES[("get-orders-and-trades", "example_get_trades_for_market_response")]["trades"]
+
+
+def _fields(payload, record):
+    # The fields of a REST payload which the record keeps
+    return {k: v for k, v in payload.items() if k in record.to_json()}
+
+
+class RecordsTest(unittest.TestCase):
+
+    def test_order_json_round_trip(self):
+        for o in ORDERS:
+            order = Order.from_json(o)
+            self.assertEqual(order.to_json(), _fields(o, order))
+            self.assertEqual(order.price, int(o["price"]))
+            self.assertEqual(order.created_at, int(o["createdAt"]))
+
+    def test_trade_json_round_trip(self):
+        for t in TRADES:
+            trade = Trade.from_json(t)
+            self.assertEqual(trade.to_json(), _fields(t, trade))
+            self.assertEqual(trade.size, int(t["size"]))
+
+    def test_rows_match_columns(self):
+        order = Order.from_json(ORDERS[0])
+        self.assertEqual(len(order.row()), len(ORDER_COLUMNS))
+        self.assertEqual(order.row()[0], order.id)
+        trade = Trade.from_json(TRADES[0])
+        self.assertEqual(len(trade.row()), len(TRADE_COLUMNS))
+        self.assertEqual(trade.row()[0], trade.id)
+
+    @unittest.skipIf(vac is None, "Vega-API-client is not installed")
+    def test_proto_matches_json(self):
+        for o in ORDERS:
+            message = ParseDict(o, vac.vega.Order(), ignore_unknown_fields=True)
+            order = Order.from_proto(message)
+            self.assertEqual(order.row(), Order.from_json(o).row())
+            self.assertEqual(order.to_json(), _fields(o, order))
+        for t in TRADES:
+            message = ParseDict(t, vac.vega.Trade(), ignore_unknown_fields=True)
+            trade = Trade.from_proto(message)
+            self.assertEqual(trade.row(), Trade.from_json(t).row())
+            self.assertEqual(trade.to_json(), _fields(t, trade))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -19,7 +19,6 @@ Apps/Libraries:
 # some code here
 # :something__
 
-import requests
 import os
 import helpers
 
@@ -28,10 +27,12 @@ if not helpers.check_url(node_url_rest):
     print("Error: Invalid or missing NODE_URL_REST environment variable.")
     exit(1)
 
+session = helpers.session()
+
 # __get_statistics:
 # Request the statistics for a node on Vega
 url = "{base_url}/statistics".format(base_url=node_url_rest)
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Statistics:\n{}".format(response.json()))
 # :get_statistics__
@@ -1,7 +1,28 @@
+import json
+import os
 import random
 import requests
 import string
-from typing import Any
+import threading
+from requests.adapters import HTTPAdapter
+from typing import Any, Dict, Optional
+
+# Connection pool settings for the shared HTTP session. These can be tuned
+# from the environment without editing the scripts.
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "4"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+
+# Settings for the shared gRPC channels (see grpc_channel)
+# Note: nodes close connections which ping more often than every 5 minutes
+# (the gRPC server default), so keep GRPC_KEEPALIVE_MS at 300000 or above
+GRPC_KEEPALIVE_MS = int(os.getenv("GRPC_KEEPALIVE_MS", "300000"))
+GRPC_KEEPALIVE_TIMEOUT_MS = int(
+    os.getenv("GRPC_KEEPALIVE_TIMEOUT_MS", "10000"))
+GRPC_MAX_MESSAGE_MB = int(os.getenv("GRPC_MAX_MESSAGE_MB", "64"))
+GRPC_COMPRESSION = os.getenv("GRPC_COMPRESSION", "")  # "gzip" or "" for none
+GRPC_RETRIES = int(os.getenv("GRPC_RETRIES", "3"))
+GRPC_CONNECT_TIMEOUT = float(os.getenv("GRPC_CONNECT_TIMEOUT", "10"))
 
 
 def check_response(r: requests.Response) -> None:
@@ -37,3 +58,164 @@ def check_wallet_url(url: str) -> str:
 
 def enum_to_str(e: Any, val: int) -> str:
     return e.keys()[e.values().index(val)]
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """An HTTPAdapter which applies a default timeout to every request."""
+
+    def __init__(self, timeout: Optional[float] = None, **kwargs: Any):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def new_session(
+    pool_connections: int = HTTP_POOL_CONNECTIONS,
+    pool_maxsize: int = HTTP_POOL_MAXSIZE,
+    timeout: Optional[float] = HTTP_TIMEOUT,
+) -> requests.Session:
+    """Create a keep-alive session with per-host connection pools.
+
+    pool_connections is the number of hosts to keep pools for (e.g. a Vega
+    node and a wallet server), pool_maxsize the number of connections kept
+    open per host.
+    """
+    s = requests.Session()
+    adapter = TimeoutHTTPAdapter(
+        timeout=timeout,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+    )
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def session() -> requests.Session:
+    """Return the process-wide shared session, creating it on first use.
+
+    Scripts make all their node and wallet server requests with it, so the
+    connections (and their TLS sessions) are kept alive and reused instead
+    of being opened for every request."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = new_session()
+    return _session
+
+
+def grpc_service_config(retries: int = GRPC_RETRIES) -> Dict[str, Any]:
+    """A service config retrying every method on UNAVAILABLE, i.e. when the
+    call did not reach the node, up to retries times with backoff."""
+    if retries <= 0:
+        return {}
+    return {
+        "methodConfig": [{
+            "name": [{}],  # all services and methods
+            "retryPolicy": {
+                "maxAttempts": retries + 1,
+                "initialBackoff": "0.1s",
+                "maxBackoff": "2s",
+                "backoffMultiplier": 2,
+                "retryableStatusCodes": ["UNAVAILABLE"],
+            },
+        }],
+    }
+
+
+def new_grpc_channel(
+    node_url_grpc: str,
+    keepalive_ms: int = GRPC_KEEPALIVE_MS,
+    keepalive_timeout_ms: int = GRPC_KEEPALIVE_TIMEOUT_MS,
+    max_message_mb: int = GRPC_MAX_MESSAGE_MB,
+    compression: str = GRPC_COMPRESSION,
+    retries: int = GRPC_RETRIES,
+    connect_timeout: Optional[float] = GRPC_CONNECT_TIMEOUT,
+):
+    """Create a gRPC channel to a Vega node, connected and ready for use.
+
+    Keepalive pings keep connections with calls in progress (e.g. quiet
+    streams) open through NATs and load balancers, and detect dead ones; no
+    pings are sent while there are no calls. compression is "gzip" or "" for
+    none. grpc is imported here so that REST-only scripts never load it.
+
+    If the node cannot be reached within connect_timeout seconds, an error
+    is printed and the script exits.
+    """
+    import grpc
+
+    service_config = grpc_service_config(retries)
+    options = [
+        ("grpc.keepalive_time_ms", keepalive_ms),
+        ("grpc.keepalive_timeout_ms", keepalive_timeout_ms),
+        ("grpc.keepalive_permit_without_calls", 0),
+        ("grpc.http2.max_pings_without_data", 0),
+        ("grpc.max_receive_message_length", max_message_mb * 1024 * 1024),
+        ("grpc.max_send_message_length", max_message_mb * 1024 * 1024),
+        ("grpc.enable_retries", 1 if service_config else 0),
+    ]
+    if service_config:
+        options.append(("grpc.service_config", json.dumps(service_config)))
+    if compression == "gzip":
+        channel = grpc.insecure_channel(
+            node_url_grpc, options=options,
+            compression=grpc.Compression.Gzip)
+    elif compression:
+        raise ValueError(f"Unsupported gRPC compression: {compression}")
+    else:
+        channel = grpc.insecure_channel(node_url_grpc, options=options)
+    if connect_timeout is not None:
+        try:
+            grpc.channel_ready_future(channel).result(timeout=connect_timeout)
+        except grpc.FutureTimeoutError:
+            channel.close()
+            print(
+                f"Error: Could not connect to the Vega node at "
+                f"{node_url_grpc} within {connect_timeout:g}s.")
+            exit(1)
+    return channel
+
+
+_grpc_channels: Dict[str, Any] = {}
+_grpc_channels_lock = threading.Lock()
+
+
+def grpc_channel(node_url_grpc: str):
+    """Return the shared gRPC channel for a Vega node, creating it on first
+    use. Pass it to the Vega-API-client clients, which then share one
+    connection instead of each opening (and waiting for) their own:
+
+        channel = helpers.grpc_channel(node_url_grpc)
+        data_client = vac.VegaTradingDataClient(node_url_grpc, channel=channel)
+        trading_client = vac.VegaTradingClient(node_url_grpc, channel=channel)
+    """
+    with _grpc_channels_lock:
+        if node_url_grpc not in _grpc_channels:
+            _grpc_channels[node_url_grpc] = new_grpc_channel(node_url_grpc)
+        return _grpc_channels[node_url_grpc]
+
+
+def read_json_cache(path: str) -> Dict[str, Any]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_json_cache(path: str, cache: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump(cache, f)
+    os.replace(tmp, path)
@@ -0,0 +1,150 @@
+"""
+Markets and assets of a Vega network, cached in memory and on disk, so that
+scripts which only need a market id or an asset do not fetch the full lists
+on every run.
+
+    market_id = metadata.registry(node_url_rest).first_market_id()
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+
+import helpers
+
+# Where market and asset lists are cached, and for how long (seconds)
+METADATA_CACHE = os.getenv(
+    "METADATA_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "vega-sample-api-scripts", "metadata.json"),
+)
+METADATA_TTL = float(os.getenv("METADATA_TTL", "300"))
+
+
+class MetadataRegistry:
+    """Markets and assets of a Vega network, cached in memory and on disk.
+
+    The lists are fetched from the node only when the cached copy is older
+    than ttl seconds. If the node sent an ETag, the refresh is conditional
+    and a "304 Not Modified" answer just renews the cached copy. Lookups by
+    id, instrument code, asset name and symbol are dict lookups.
+    """
+
+    def __init__(
+        self,
+        node_url_rest: str,
+        session: Optional[requests.Session] = None,
+        path: str = METADATA_CACHE,
+        ttl: float = METADATA_TTL,
+    ):
+        self.node_url_rest = node_url_rest
+        self.session = session
+        self.path = path
+        self.ttl = ttl
+        self._lists: Dict[str, Dict[str, Any]] = {}
+        self._index: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lock = threading.RLock()
+
+    def markets(self) -> List[Dict[str, Any]]:
+        """All markets, in the order returned by GET /markets."""
+        return self._get("markets")["items"]
+
+    def market(self, market_id: str) -> Dict[str, Any]:
+        return self._lookup("markets", "id", market_id)
+
+    def market_by_code(self, code: str) -> Dict[str, Any]:
+        """Look up a market by instrument code, e.g. "CRYPTO:GBPUSD/OCT20"."""
+        return self._lookup("markets", "code", code)
+
+    def first_market_id(self) -> str:
+        markets = self.markets()
+        assert len(markets) > 0, f"{self.node_url_rest} has no markets"
+        return markets[0]["id"]
+
+    def assets(self) -> List[Dict[str, Any]]:
+        """All assets, in the order returned by GET /assets."""
+        return self._get("assets")["items"]
+
+    def asset(self, asset_id: str) -> Dict[str, Any]:
+        return self._lookup("assets", "id", asset_id)
+
+    def asset_by_name(self, name: str) -> Dict[str, Any]:
+        return self._lookup("assets", "name", name)
+
+    def asset_by_symbol(self, symbol: str) -> Dict[str, Any]:
+        return self._lookup("assets", "symbol", symbol)
+
+    def refresh(self, kind: str) -> None:
+        """Fetch "markets" or "assets" now, whatever the age of the cache."""
+        with self._lock:
+            cached = self._lists.get(kind) or {}
+            headers = {}
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            s = self.session or helpers.session()
+            response = s.get(f"{self.node_url_rest}/{kind}", headers=headers)
+            if response.status_code == 304 and "items" in cached:
+                entry = dict(cached, fetched=time.time())
+            else:
+                helpers.check_response(response)
+                entry = {
+                    "fetched": time.time(),
+                    "etag": response.headers.get("ETag"),
+                    "items": response.json()[kind] or [],
+                }
+            self._store(kind, entry)
+            disk = helpers.read_json_cache(self.path)
+            disk.setdefault(self.node_url_rest, {})[kind] = entry
+            helpers.write_json_cache(self.path, disk)
+
+    def _get(self, kind: str) -> Dict[str, Any]:
+        with self._lock:
+            entry = self._lists.get(kind)
+            if entry is None:
+                entry = helpers.read_json_cache(self.path).get(self.node_url_rest, {}).get(kind)
+                if entry is not None:
+                    self._store(kind, entry)
+            if entry is None or time.time() - entry["fetched"] > self.ttl:
+                self.refresh(kind)
+            return self._lists[kind]
+
+    def _lookup(self, kind: str, field: str, value: str) -> Dict[str, Any]:
+        entry = self._get(kind)
+        index = f"{kind}.{field}"
+        if value not in self._index[index] and time.time() - entry["fetched"] > 1:
+            # Not in a cached list: it may be new, so look again at the node
+            self.refresh(kind)
+        try:
+            return self._index[index][value]
+        except KeyError:
+            raise KeyError(f"No {kind[:-1]} with {field} {value!r} on {self.node_url_rest}") from None
+
+    def _store(self, kind: str, entry: Dict[str, Any]) -> None:
+        self._lists[kind] = entry
+        items = entry["items"]
+        if kind == "markets":
+            self._index["markets.id"] = {m["id"]: m for m in items}
+            self._index["markets.code"] = {
+                m["tradableInstrument"]["instrument"]["code"]: m
+                for m in items
+                if m.get("tradableInstrument", {}).get("instrument", {}).get("code")
+            }
+        else:
+            # Assets have "ID" in REST responses
+            self._index["assets.id"] = {a.get("ID") or a.get("id"): a for a in items}
+            self._index["assets.name"] = {a["name"]: a for a in items if a.get("name")}
+            self._index["assets.symbol"] = {a["symbol"]: a for a in items if a.get("symbol")}
+
+
+_registries: Dict[str, MetadataRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def registry(node_url_rest: str) -> MetadataRegistry:
+    """Return the shared MetadataRegistry for a Vega node."""
+    with _registries_lock:
+        if node_url_rest not in _registries:
+            _registries[node_url_rest] = MetadataRegistry(node_url_rest)
+        return _registries[node_url_rest]
@@ -0,0 +1,53 @@
+"""
+The example responses in this repository's response-examples.txt files, as
+payloads for the stand-in servers.
+
+Each example is the text between "### __name:" and "### :name__" tags (the
+same smart tags the docs use). Comment lines, "..." lines and trailing commas
+are removed; examples which are still not JSON are skipped.
+
+    fixtures = load_fixtures(REPO)
+    fixtures[("vega-time", "example_get_time_response")]
+"""
+
+import glob
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+FIXTURE_START = re.compile(r"^### __(\w+):")
+
+
+def load_fixtures(root: str) -> Dict[Tuple[str, str], Any]:
+    """(directory, name) -> payload, for each example under root. Names
+    alone are not unique (wallet and submit-amend-cancel-orders both have an
+    example_sign_tx_response)."""
+    fixtures = {}
+    for path in glob.glob(os.path.join(root, "*", "response-examples.txt")):
+        directory = os.path.basename(os.path.dirname(path))
+        name, lines = None, []
+        with open(path) as f:
+            for line in f:
+                start = FIXTURE_START.match(line)
+                if start:
+                    name, lines = start.group(1), []
+                elif line.startswith("### :") and name is not None:
+                    payload = _parse_example(lines)
+                    if payload is not None:
+                        fixtures[(directory, name)] = payload
+                    name = None
+                elif name is not None and not line.startswith("#"):
+                    lines.append(line)
+    return fixtures
+
+
+def _parse_example(lines: List[str]) -> Optional[Any]:
+    text = "".join(line for line in lines if line.strip().rstrip(",") != "...")
+    text = re.sub(r",(\s*[}\]])", r"\1", text)
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
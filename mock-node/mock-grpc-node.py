@@ -0,0 +1,597 @@
+#!/usr/bin/python3
+
+"""
+Script language: Python3
+
+Talks to:
+- Nothing: serves a stand-in Vega node trading and trading data gRPC API
+
+Apps/Libraries:
+- gRPC (node): Vega-API-client (https://pypi.org/project/Vega-API-client/)
+"""
+
+# A local stand-in for a Vega node's trading data and trading gRPC services,
+# for running and benchmarking the Vega-API-client scripts without a node.
+#
+# The streams (ObserveEventBus, OrdersSubscribe and TradesSubscribe) send
+# events at a target rate, either generated (orders, trades, market data,
+# margin levels, accounts and time updates for the example market) or read
+# from an event log written by
+# stream-events/record-events-with-Vega-API-client.py. Every --report
+# seconds, each open stream prints the rate it achieved and how far it is
+# behind its schedule: a stream which keeps falling behind has a consumer
+# that cannot keep up with that rate.
+#
+# Unary calls answer with the payloads from the response-examples.txt files.
+# Orders prepared with the trading service take effect when their signed
+# transaction is submitted: from then on OrderByReference and OrderByID return
+# them, and each update is also sent on the streams which match it.
+
+import argparse
+import itertools
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from concurrent import futures
+from typing import Any, Callable, Dict, Iterator, List
+
+import grpc
+from google.protobuf.json_format import ParseDict
+import vegaapiclient as vac
+from vegaapiclient.generated.proto.api import trading_pb2_grpc
+
+from fixtures import REPO, load_fixtures
+
+sys.path.insert(0, os.path.join(REPO, "stream-events"))
+from eventlog import EventLogReader  # noqa: E402
+
+trading = vac.api.trading
+events = vac.events
+
+
+def to_proto(payload: Any, message: Any) -> Any:
+    return ParseDict(payload, message, ignore_unknown_fields=True)
+
+
+class Schedule:
+    """Due times for sending events at rate per second, or at burst_rate for
+    the first burst_seconds of every burst_every seconds. A rate of 0 means
+    as fast as possible."""
+
+    def __init__(self, rate: float, burst_rate: float = 0, burst_seconds: float = 0, burst_every: float = 0):
+        self.rate = rate
+        self.burst_rate = burst_rate
+        self.burst_seconds = burst_seconds
+        self.burst_every = burst_every
+
+    def rate_at(self, elapsed: float) -> float:
+        if self.burst_every and elapsed % self.burst_every < self.burst_seconds:
+            return self.burst_rate
+        return self.rate
+
+    def next_due(self, due: float, start: float, count: int) -> float:
+        """When the next count events are due, after the ones due at due."""
+        rate = self.rate_at(due - start)
+        return due + count / rate if rate else time.monotonic()
+
+
+class SyntheticEvents:
+    """An endless series of order, trade, market data, margin levels,
+    account and time update events for the example market, with a random
+    walk price."""
+
+    def __init__(self, market_id: str, asset: str, parties: int = 20, block_events: int = 100, seed: int = 1):
+        self.market_id = market_id
+        self.asset = asset
+        self.parties = ["{:064x}".format(random.Random(i).getrandbits(256)) for i in range(parties)]
+        self.block_events = block_events
+        self.random = random.Random(seed)
+
+    def __iter__(self) -> Iterator[Any]:
+        rnd = self.random
+        price = 100000
+        timestamp = time.time_ns()
+        for n in itertools.count():
+            timestamp += 1000000
+            event_id = f"{n}-0"
+            kind = n % 10
+            if n % self.block_events == 0:
+                yield events.BusEvent(
+                    ID=event_id, type=events.BUS_EVENT_TYPE_TIME_UPDATE,
+                    timeUpdate=events.TimeUpdate(timestamp=timestamp),
+                )
+            elif kind < 6:
+                side = rnd.choice((vac.vega.SIDE_BUY, vac.vega.SIDE_SELL))
+                size = rnd.randint(1, 100)
+                yield events.BusEvent(ID=event_id, type=events.BUS_EVENT_TYPE_ORDER, order=vac.vega.Order(
+                    id=f"V{n:020d}", marketID=self.market_id, partyID=rnd.choice(self.parties), side=side,
+                    price=price + rnd.randint(-50, 50), size=size, remaining=size,
+                    timeInForce=vac.vega.Order.TIF_GTC, type=vac.vega.Order.TYPE_LIMIT,
+                    status=vac.vega.Order.STATUS_ACTIVE, createdAt=timestamp, version=1,
+                ))
+            elif kind < 9:
+                price = max(1, price + rnd.randint(-20, 20))
+                buyer, seller = rnd.sample(self.parties, 2)
+                yield events.BusEvent(ID=event_id, type=events.BUS_EVENT_TYPE_TRADE, trade=vac.vega.Trade(
+                    id=f"T{n:020d}", marketID=self.market_id, price=price, size=rnd.randint(1, 50),
+                    buyer=buyer, seller=seller, aggressor=rnd.choice((vac.vega.SIDE_BUY, vac.vega.SIDE_SELL)),
+                    timestamp=timestamp, type=vac.vega.Trade.TYPE_DEFAULT,
+                ))
+            elif n // 10 % 3 == 0:
+                yield events.BusEvent(
+                    ID=event_id, type=events.BUS_EVENT_TYPE_MARKET_DATA, marketData=vac.vega.MarketData(
+                        market=self.market_id, markPrice=price, bestBidPrice=price - 10, bestBidVolume=100,
+                        bestOfferPrice=price + 10, bestOfferVolume=100, midPrice=price, timestamp=timestamp,
+                    ),
+                )
+            elif n // 10 % 3 == 1:
+                maintenance = rnd.randint(1000, 5000)
+                yield events.BusEvent(
+                    ID=event_id, type=events.BUS_EVENT_TYPE_MARGIN_LEVELS, marginLevels=vac.vega.MarginLevels(
+                        partyID=rnd.choice(self.parties), marketID=self.market_id, asset=self.asset,
+                        maintenanceMargin=maintenance, searchLevel=maintenance * 11 // 10,
+                        initialMargin=maintenance * 12 // 10, collateralReleaseLevel=maintenance * 14 // 10,
+                        timestamp=timestamp,
+                    ),
+                )
+            else:
+                account_type = rnd.choice((vac.vega.ACCOUNT_TYPE_MARGIN, vac.vega.ACCOUNT_TYPE_GENERAL))
+                yield events.BusEvent(ID=event_id, type=events.BUS_EVENT_TYPE_ACCOUNT, account=vac.vega.Account(
+                    owner=rnd.choice(self.parties), balance=rnd.randint(0, 10000), asset=self.asset,
+                    marketID=self.market_id if account_type == vac.vega.ACCOUNT_TYPE_MARGIN else "",
+                    type=account_type,
+                ))
+
+
+class RecordedEvents:
+    """The events in an event log directory, once or over and over."""
+
+    def __init__(self, directory: str, loop: bool = False):
+        reader = EventLogReader(directory, parse=events.BusEvent.FromString)
+        self.events = list(reader)
+        reader.close()
+        if not self.events:
+            raise ValueError(f"No events in {directory}")
+        self.loop = loop
+
+    def __iter__(self) -> Iterator[Any]:
+        return itertools.cycle(self.events) if self.loop else iter(self.events)
+
+
+def copy_order(order: Any) -> Any:
+    copied = vac.vega.Order()
+    copied.CopyFrom(order)
+    return copied
+
+
+def event_market(event: Any) -> str:
+    payload = getattr(event, event.WhichOneof("event") or "ID")
+    if event.HasField("marketData"):
+        return payload.market
+    return getattr(payload, "marketID", "")
+
+
+def event_parties(event: Any) -> List[str]:
+    payload = getattr(event, event.WhichOneof("event") or "ID")
+    if event.HasField("trade"):
+        return [payload.buyer, payload.seller]
+    if event.HasField("account"):
+        return [payload.owner]
+    return [getattr(payload, "partyID", "")]
+
+
+class StreamStats:
+    """Progress of one stream against its schedule, for the reports."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = time.monotonic()
+        self.sent = 0
+        self.behind = 0.0
+        self._reported = (self.start, 0)
+
+    def report(self, target: str) -> str:
+        now = time.monotonic()
+        then, sent = self._reported
+        self._reported = (now, self.sent)
+        rate = (self.sent - sent) / (now - then) if now > then else 0.0
+        return f"{self.name}: {self.sent} sent, {rate:.0f}/s (target {target}), {self.behind:.3f}s behind"
+
+
+class MockTradingData(trading_pb2_grpc.trading_dataServicer):
+    def __init__(self, args: argparse.Namespace):
+        fixtures = load_fixtures(REPO)
+
+        def fixture(directory, name):
+            return fixtures[(directory, name)]
+
+        self.markets = [
+            to_proto(m, vac.markets.Market())
+            for m in fixture("get-markets-and-market-data", "example_get_markets_response")["markets"]
+        ]
+        self.market_data = to_proto(
+            fixture("get-markets-and-market-data", "example_get_market_data_response")["marketData"],
+            vac.vega.MarketData(),
+        )
+        self.market_orders = [
+            to_proto(o, vac.vega.Order())
+            for o in fixture("get-orders-and-trades", "example_get_orders_for_market_response")["orders"]
+        ]
+        self.party_orders = [
+            to_proto(o, vac.vega.Order())
+            for o in fixture("get-orders-and-trades", "example_get_orders_for_party_response")["orders"]
+        ]
+        self.trades = [
+            to_proto(t, vac.vega.Trade())
+            for t in fixture("get-orders-and-trades", "example_get_trades_for_market_response")["trades"]
+        ]
+        self.order_by_ref = to_proto(
+            fixture("get-by-reference", "example_get_order_by_ref_response")["order"], vac.vega.Order()
+        )
+        self.parties = [
+            to_proto(p, vac.vega.Party())
+            for p in fixture("parties-and-accounts", "example_parties_response")["parties"]
+        ]
+        self.schedule = Schedule(args.rate, args.burst_rate, args.burst_seconds, args.burst_every)
+        self.batch = args.batch
+        self.count = args.count
+        if args.events:
+            self.source: Callable[[], Any] = lambda: RecordedEvents(args.events, loop=args.loop)
+        else:
+            market = self.markets[0]
+            self.source = lambda: SyntheticEvents(
+                market.id, market.tradableInstrument.instrument.future.asset, block_events=args.block_events
+            )
+        self.streams: List[StreamStats] = []
+        # (match, respond, responses) of each open stream, for the updates of
+        # submitted orders
+        self.listeners: List[Any] = []
+        # reference -> order, for orders submitted with the trading service
+        self.orders: Dict[str, Any] = {}
+        # references prepared but not yet submitted
+        self.pending = set()
+        # blob -> action applied when the transaction is submitted
+        self.prepared: Dict[bytes, Callable[[], List[Any]]] = {}
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def target(self) -> str:
+        s = self.schedule
+        target = f"{s.rate:.0f}/s" if s.rate else "max"
+        if s.burst_every:
+            target += f", {s.burst_rate:.0f}/s for {s.burst_seconds}s every {s.burst_every}s"
+        return target
+
+    def reports(self) -> List[str]:
+        with self.lock:
+            return [stats.report(self.target()) for stats in self.streams]
+
+    def _stream(
+        self,
+        name: str,
+        context: Any,
+        match: Callable[[Any], bool],
+        respond: Callable[[List[Any]], Any],
+    ) -> Iterator[Any]:
+        """Batches of the matching events, as responses made by respond, on
+        schedule, and the matching updates of submitted orders as they are
+        published."""
+        stats = StreamStats(f"{name}#{next(self._ids)}")
+        # (response, event set once it has been taken) to send
+        responses: "queue.Queue[Any]" = queue.Queue()
+        listener = (match, respond, responses)
+        ended = threading.Event()
+        with self.lock:
+            self.streams.append(stats)
+            self.listeners.append(listener)
+        threading.Thread(
+            target=self._schedule, args=(stats, match, respond, responses, ended), daemon=True
+        ).start()
+        try:
+            while context.is_active():
+                try:
+                    item = responses.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is None:
+                    break
+                response, taken = item
+                yield response
+                taken.set()
+        finally:
+            ended.set()
+            with self.lock:
+                self.streams.remove(stats)
+                self.listeners.remove(listener)
+
+    def _schedule(
+        self,
+        stats: StreamStats,
+        match: Callable[[Any], bool],
+        respond: Callable[[List[Any]], Any],
+        responses: "queue.Queue[Any]",
+        ended: threading.Event,
+    ) -> None:
+        """Queue batches of the matching events on schedule, then None, until
+        the stream ends."""
+
+        def matching():
+            for event in self.source():
+                if ended.is_set():
+                    return
+                if match(event):
+                    yield event
+
+        scheduled = matching()
+        if self.count:
+            scheduled = itertools.islice(scheduled, self.count)
+        start = due = time.monotonic()
+        while not ended.is_set():
+            batch = list(itertools.islice(scheduled, self.batch))
+            if not batch:
+                break
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            # Wait until the stream has taken the response: responses queue on
+            # the channel once the consumer's flow control window is full, so
+            # a slow consumer shows up here
+            taken = threading.Event()
+            responses.put((respond(batch), taken))
+            while not taken.wait(0.1):
+                if ended.is_set():
+                    return
+            stats.sent += len(batch)
+            stats.behind = max(0.0, time.monotonic() - due)
+            due = self.schedule.next_due(due, start, len(batch))
+        responses.put(None)
+
+    def publish(self, orders: List[Any]) -> None:
+        """Send updated orders to the streams which match them."""
+        for order in orders:
+            event = events.BusEvent(
+                ID=f"{order.id}-{order.version}", type=events.BUS_EVENT_TYPE_ORDER, order=order
+            )
+            with self.lock:
+                for match, respond, responses in self.listeners:
+                    if match(event):
+                        responses.put((respond([event]), threading.Event()))
+
+    # Streams
+
+    def ObserveEventBus(self, request, context):
+        types = set(request.type)
+
+        def match(event):
+            if events.BUS_EVENT_TYPE_ALL not in types and event.type not in types:
+                return False
+            if request.marketID and event_market(event) != request.marketID:
+                return False
+            return not request.partyID or request.partyID in event_parties(event)
+
+        return self._stream(
+            "ObserveEventBus", context, match, lambda batch: trading.ObserveEventsResponse(events=batch)
+        )
+
+    def OrdersSubscribe(self, request, context):
+        def match(event):
+            return event.HasField("order") and (
+                not request.marketID or event.order.marketID == request.marketID
+            ) and (not request.partyID or event.order.partyID == request.partyID)
+
+        return self._stream(
+            "OrdersSubscribe", context, match, lambda batch: trading.OrdersStream(orders=[e.order for e in batch])
+        )
+
+    def TradesSubscribe(self, request, context):
+        def match(event):
+            return event.HasField("trade") and (
+                not request.marketID or event.trade.marketID == request.marketID
+            ) and (not request.partyID or request.partyID in (event.trade.buyer, event.trade.seller))
+
+        return self._stream(
+            "TradesSubscribe", context, match, lambda batch: trading.TradesStream(trades=[e.trade for e in batch])
+        )
+
+    # Unary calls
+
+    def GetVegaTime(self, request, context):
+        return trading.VegaTimeResponse(timestamp=time.time_ns())
+
+    def Statistics(self, request, context):
+        return vac.vega.Statistics(blockHeight=int(time.time()), totalMarkets=len(self.markets))
+
+    def Markets(self, request, context):
+        return trading.MarketsResponse(markets=self.markets)
+
+    def MarketByID(self, request, context):
+        for market in self.markets:
+            if market.id == request.marketID:
+                return trading.MarketByIDResponse(market=market)
+        context.abort(grpc.StatusCode.NOT_FOUND, "market not found")
+
+    def MarketDataByID(self, request, context):
+        market_data = vac.vega.MarketData()
+        market_data.CopyFrom(self.market_data)
+        market_data.market = request.marketID
+        market_data.timestamp = time.time_ns()
+        return trading.MarketDataByIDResponse(marketData=market_data)
+
+    def Parties(self, request, context):
+        return trading.PartiesResponse(parties=self.parties)
+
+    def OrdersByMarket(self, request, context):
+        return trading.OrdersByMarketResponse(orders=self.market_orders)
+
+    def OrdersByParty(self, request, context):
+        return trading.OrdersByPartyResponse(orders=self.party_orders)
+
+    def OrderByID(self, request, context):
+        with self.lock:
+            for order in self.orders.values():
+                if order.id == request.orderID:
+                    return copy_order(order)
+        return self.order_by_ref
+
+    def OrderByReference(self, request, context):
+        with self.lock:
+            if request.reference in self.orders:
+                return trading.OrderByReferenceResponse(order=self.orders[request.reference])
+            if request.reference in self.pending:
+                context.abort(grpc.StatusCode.NOT_FOUND, "order not found")
+        order = vac.vega.Order()
+        order.CopyFrom(self.order_by_ref)
+        order.reference = request.reference
+        return trading.OrderByReferenceResponse(order=order)
+
+    def TradesByMarket(self, request, context):
+        return trading.TradesByMarketResponse(trades=self.trades)
+
+    def TradesByParty(self, request, context):
+        return trading.TradesByPartyResponse(trades=self.trades)
+
+    def TradesByOrder(self, request, context):
+        return trading.TradesByOrderResponse(trades=self.trades)
+
+
+class MockTrading(trading_pb2_grpc.tradingServicer):
+    """Prepares order submissions, amendments and cancellations, which are
+    applied to the orders of a MockTradingData when their transaction is
+    submitted."""
+
+    def __init__(self, data: MockTradingData):
+        self.data = data
+
+    def _prepare(self, action: Callable[[], List[Any]]) -> bytes:
+        blob = uuid.uuid4().bytes
+        with self.data.lock:
+            self.data.prepared[blob] = action
+        return blob
+
+    def PrepareSubmitOrder(self, request, context):
+        submission = request.submission
+        reference = str(uuid.uuid4())
+        order = vac.vega.Order(
+            id="V{:010d}-{:010d}".format(random.randrange(10 ** 10), random.randrange(10 ** 10)),
+            reference=reference,
+            marketID=submission.marketID,
+            partyID=submission.partyID,
+            side=submission.side,
+            price=submission.price,
+            size=submission.size,
+            remaining=submission.size,
+            timeInForce=submission.timeInForce,
+            type=submission.type,
+            expiresAt=submission.expiresAt,
+            status=vac.vega.Order.STATUS_ACTIVE,
+            createdAt=time.time_ns(),
+            version=1,
+        )
+        with self.data.lock:
+            self.data.pending.add(reference)
+
+        def submit():
+            self.data.pending.discard(reference)
+            self.data.orders[reference] = order
+            return [order]
+
+        return trading.PrepareSubmitOrderResponse(blob=self._prepare(submit), submitID=reference)
+
+    def PrepareAmendOrder(self, request, context):
+        amendment = request.amendment
+
+        def amend():
+            amended = []
+            for order in self.data.orders.values():
+                if order.id == amendment.orderID:
+                    if amendment.HasField("price"):
+                        order.price = amendment.price.value
+                    order.size += amendment.sizeDelta
+                    order.remaining += amendment.sizeDelta
+                    if amendment.timeInForce:
+                        order.timeInForce = amendment.timeInForce
+                    if amendment.HasField("expiresAt"):
+                        order.expiresAt = amendment.expiresAt.value
+                    order.updatedAt = time.time_ns()
+                    order.version += 1
+                    amended.append(order)
+            return amended
+
+        return trading.PrepareAmendOrderResponse(blob=self._prepare(amend))
+
+    def PrepareCancelOrder(self, request, context):
+        cancellation = request.cancellation
+
+        def cancel():
+            cancelled = []
+            for order in self.data.orders.values():
+                if (
+                    order.partyID == cancellation.partyID
+                    and cancellation.marketID in ("", order.marketID)
+                    and cancellation.orderID in ("", order.id)
+                    and order.status == vac.vega.Order.STATUS_ACTIVE
+                ):
+                    order.status = vac.vega.Order.STATUS_CANCELLED
+                    order.updatedAt = time.time_ns()
+                    cancelled.append(order)
+            return cancelled
+
+        return trading.PrepareCancelOrderResponse(blob=self._prepare(cancel))
+
+    def SubmitTransaction(self, request, context):
+        with self.data.lock:
+            action = self.data.prepared.pop(request.tx.tx, None)
+            # Copies, as later transactions change the orders
+            updated = [copy_order(order) for order in (action() if action is not None else [])]
+        self.data.publish(updated)
+        return trading.SubmitTransactionResponse(success=True)
+
+
+def start(args: argparse.Namespace) -> Any:
+    """Start the server; returns (server, servicer, port)."""
+    servicer = MockTradingData(args)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=args.workers))
+    trading_pb2_grpc.add_trading_dataServicer_to_server(servicer, server)
+    trading_pb2_grpc.add_tradingServicer_to_server(MockTrading(servicer), server)
+    port = server.add_insecure_port(f"127.0.0.1:{args.port}")
+    server.start()
+    return server, servicer, port
+
+
+def parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Stand-in Vega node trading and trading data gRPC services")
+    parser.add_argument("--port", type=int, default=3007)
+    parser.add_argument("--rate", type=float, default=1000, help="events per second per stream (0: as fast as possible)")
+    parser.add_argument("--batch", type=int, default=10, help="events per stream response")
+    parser.add_argument("--burst-rate", type=float, default=0, help="events per second during bursts")
+    parser.add_argument("--burst-seconds", type=float, default=0, help="length of each burst")
+    parser.add_argument("--burst-every", type=float, default=0, help="seconds from one burst to the next")
+    parser.add_argument("--events", help="replay this event log directory instead of generated events")
+    parser.add_argument("--loop", action="store_true", help="replay the event log over and over")
+    parser.add_argument("--count", type=int, default=0, help="end each stream after this many events")
+    parser.add_argument("--block-events", type=int, default=100, help="generated events per time update")
+    parser.add_argument("--workers", type=int, default=16, help="concurrent calls (each stream holds one)")
+    parser.add_argument("--report", type=float, default=5, help="seconds between stream reports (0: none)")
+    return parser
+
+
+if __name__ == "__main__":
+    args = parser().parse_args()
+    if args.burst_every and not args.burst_rate:
+        print("Error: --burst-every needs --burst-rate")
+        exit(1)
+    server, servicer, port = start(args)
+    print("Stand-in trading and trading data services running. To use it:")
+    print(f"export NODE_URL_GRPC=127.0.0.1:{port}")
+    try:
+        while True:
+            time.sleep(args.report or 3600)
+            if args.report:
+                for line in servicer.reports():
+                    print(line, flush=True)
+    except KeyboardInterrupt:
+        server.stop(0)
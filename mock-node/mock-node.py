@@ -0,0 +1,687 @@
+#!/usr/bin/python3
+
+"""
+Script language: Python3
+
+Talks to:
+- Nothing: serves a stand-in Vega node REST and GraphQL API and wallet
+  server API
+- Stand-in Vega node (gRPC), optionally: transactions the wallet propagates
+
+Apps/Libraries:
+- HTTP: http.server (standard library)
+- gRPC (optional): Vega-API-client (https://pypi.org/project/Vega-API-client/)
+"""
+
+# A local stand-in for a Vega node (REST) and a wallet server, answering with
+# the payloads from the response-examples.txt files in this repository, so
+# the sample scripts can be run and benchmarked without network access.
+#
+# Prepared orders, amendments, cancellations, proposals and votes take
+# effect when the transaction is signed with propagate set (or submitted to
+# /transaction), after --block-time, so the submit/amend/cancel and
+# governance scripts can run to the end. Transactions prepared by another
+# node, e.g. mock-grpc-node.py, are sent on to the --grpc-node, as a wallet
+# server configured with that node would.
+#
+# GraphQL subscriptions (graphql-ws protocol, on a websocket at /query) are
+# served for market data, sent --stream-rate times a second, and for orders,
+# sent as the orders submitted to this node change.
+#
+# The scripts only accept https:// URLs, so the server uses TLS. Without
+# --cert/--key, a self-signed certificate for 127.0.0.1 is made with openssl.
+
+import argparse
+import base64
+import copy
+import hashlib
+import json
+import os
+import random
+import re
+import ssl
+import struct
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fixtures import REPO, load_fixtures
+
+# Appended to the client's key to accept a websocket (RFC 6455)
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+def make_token(lifetime: int = 3600) -> str:
+    """A JWT-shaped wallet token, with an expiry walletauth.token_expiry() reads."""
+    def part(obj):
+        return base64.urlsafe_b64encode(json.dumps(obj).encode()).rstrip(b"=").decode()
+    return ".".join([part({"alg": "none"}), part({"exp": int(time.time()) + lifetime}), "mock"])
+
+
+def make_cert(directory: str) -> Tuple[str, str]:
+    cert = os.path.join(directory, "cert.pem")
+    key = os.path.join(directory, "key.pem")
+    if not (os.path.exists(cert) and os.path.exists(key)):
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-keyout", key, "-out", cert,
+             "-days", "30", "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1"],
+            check=True, capture_output=True,
+        )
+    return cert, key
+
+
+def grpc_forwarder(node_url_grpc: str) -> Callable[[bytes], None]:
+    """A function submitting a transaction to a gRPC node."""
+    # Only needed with --grpc-node, so the REST stand-in runs without
+    # Vega-API-client
+    import vegaapiclient as vac
+
+    client = vac.VegaTradingClient(node_url_grpc)
+
+    def forward(tx: bytes) -> None:
+        request = vac.api.trading.SubmitTransactionRequest(tx=vac.vega.SignedBundle(tx=tx))
+        client.SubmitTransaction(request)
+
+    return forward
+
+
+def graphql_order(order: Dict[str, Any]) -> Dict[str, Any]:
+    """An order as the orders subscription sends it, with GraphQL enum values
+    (e.g. "STATUS_PARTIALLY_FILLED" -> "PartiallyFilled", "TIF_GTC" ->
+    "GTC")."""
+    status = order["status"][len("STATUS_"):]
+    return {
+        "id": order["id"],
+        "reference": order["reference"],
+        "status": "".join(word.capitalize() for word in status.split("_")),
+        "price": order["price"],
+        "size": order["size"],
+        "remaining": order["remaining"],
+        "timeInForce": order["timeInForce"][len("TIF_"):],
+        "updatedAt": order["updatedAt"],
+    }
+
+
+class MockNode:
+    """Responses and state of the stand-in node and wallet server."""
+
+    def __init__(
+        self,
+        fixtures: Dict[Tuple[str, str], Any],
+        scale: int = 1,
+        block_time: float = 0.0,
+        forward: Optional[Callable[[bytes], None]] = None,
+    ):
+        self.fixtures = fixtures
+        self.scale = scale
+        self.block_time = block_time
+        self.forward = forward
+        self.lock = threading.Lock()
+        self.markets = list(self.fixture("get-markets-and-market-data", "example_get_markets_response")["markets"])
+        asset_id = self.markets[0]["tradableInstrument"]["instrument"]["future"]["asset"]
+        self.assets = [{"ID": asset_id, "name": "DAI", "symbol": "tDAI", "decimals": "5", "totalSupply": "0"}]
+        # reference -> order, for orders submitted to this node
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        # references prepared but not yet in a block
+        self.pending = set()
+        # blob -> action applied when the transaction is propagated
+        self.prepared: Dict[str, Callable[[], None]] = {}
+        self.proposals: Dict[str, Dict[str, Any]] = {}
+        # Called with a copy of all orders whenever a transaction is applied
+        self.order_listeners: List[Callable[[List[Dict[str, Any]]], None]] = []
+        self.routes: List[Tuple[str, Any, Callable]] = [
+            ("GET", r"/time", self.get_time),
+            ("GET", r"/statistics", self.get_statistics),
+            ("GET", r"/markets", self.get_markets),
+            ("GET", r"/markets/([^/]+)", self.get_market),
+            ("GET", r"/markets-data/([^/]+)", self.get_market_data),
+            ("GET", r"/markets/([^/]+)/orders", self.get_market_orders),
+            ("GET", r"/markets/([^/]+)/trades", self.get_market_trades),
+            ("GET", r"/assets", self.get_assets),
+            ("GET", r"/assets/([^/]+)", self.get_asset),
+            ("GET", r"/parties", self.get_parties),
+            ("GET", r"/parties/([^/]+)", self.get_party),
+            ("GET", r"/parties/([^/]+)/orders", self.get_party_orders),
+            ("GET", r"/parties/([^/]+)/trades", self.get_party_trades),
+            ("GET", r"/parties/([^/]+)/proposals", self.get_party_proposals),
+            ("GET", r"/orders/([^/]+)/trades", self.get_order_trades),
+            ("GET", r"/orders/([^/]+)", self.get_order_by_reference),
+            ("POST", r"/orders/fee/estimate", self.post_fee_estimate),
+            ("POST", r"/orders/prepare/submit", self.post_prepare_submit),
+            ("POST", r"/orders/prepare/amend", self.post_prepare_amend),
+            ("POST", r"/orders/prepare/cancel", self.post_prepare_cancel),
+            ("POST", r"/governance/prepare/proposal", self.post_prepare_proposal),
+            ("POST", r"/governance/prepare/vote", self.post_prepare_vote),
+            ("POST", r"/transaction", self.post_transaction),
+            # Wallet server
+            ("POST", r"/api/v1/auth/token", self.post_login),
+            ("DELETE", r"/api/v1/auth/token", self.delete_login),
+            ("POST", r"/api/v1/wallets", self.post_login),
+            ("GET", r"/api/v1/keys", self.get_keys),
+            ("POST", r"/api/v1/keys", self.post_key),
+            ("GET", r"/api/v1/keys/([^/]+)", self.get_key),
+            ("POST", r"/api/v1/messages", self.post_sign),
+        ]
+        self.routes = [(method, re.compile(pattern + "$"), fn) for method, pattern, fn in self.routes]
+
+    def fixture(self, directory: str, name: str) -> Any:
+        return copy.deepcopy(self.fixtures[(directory, name)])
+
+    def handle(self, method: str, path: str, body: Any) -> Tuple[int, Any]:
+        for route_method, pattern, fn in self.routes:
+            match = pattern.match(path)
+            if match and route_method == method:
+                return fn(body, *match.groups())
+        return 404, {"error": "Not Found", "code": 5}
+
+    def scaled(self, items: List[Any]) -> List[Any]:
+        """items repeated scale times, with unique ids."""
+        if self.scale <= 1:
+            return items
+        out = list(items)
+        for i in range(1, self.scale):
+            for item in items:
+                item = copy.deepcopy(item)
+                if isinstance(item, dict) and "id" in item:
+                    item["id"] = f"{item['id']}-{i}"
+                out.append(item)
+        return out
+
+    # Node
+
+    def get_time(self, body):
+        return 200, {"timestamp": str(time.time_ns())}
+
+    def get_statistics(self, body):
+        return 200, {"statistics": {
+            "blockHeight": str(int(time.time())),
+            "vegaTime": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "status": "CHAIN_STATUS_CONNECTED",
+            "totalMarkets": str(len(self.markets)),
+            "totalOrders": str(len(self.orders)),
+        }}
+
+    def get_markets(self, body):
+        with self.lock:
+            return 200, {"markets": self.scaled(self.markets)}
+
+    def get_market(self, body, market_id):
+        market = next((m for m in self.markets if m["id"] == market_id), None)
+        return (200, {"market": market}) if market else (404, {"error": "market not found"})
+
+    def get_market_data(self, body, market_id):
+        data = self.fixture("get-markets-and-market-data", "example_get_market_data_response")
+        data["marketData"]["market"] = market_id
+        data["marketData"]["timestamp"] = str(time.time_ns())
+        return 200, data
+
+    def get_market_orders(self, body, market_id):
+        orders = self.fixture("get-orders-and-trades", "example_get_orders_for_market_response")["orders"]
+        with self.lock:
+            orders += [copy.deepcopy(o) for o in self.orders.values() if o["marketID"] == market_id]
+        return 200, {"orders": self.scaled(orders)}
+
+    def get_market_trades(self, body, market_id):
+        trades = self.fixture("get-orders-and-trades", "example_get_trades_for_market_response")["trades"]
+        return 200, {"trades": self.scaled(trades)}
+
+    def get_assets(self, body):
+        return 200, {"assets": self.assets}
+
+    def get_asset(self, body, asset_id):
+        asset = next((a for a in self.assets if a["ID"] == asset_id), None)
+        return (200, {"asset": asset}) if asset else (404, {"error": "asset not found"})
+
+    def get_parties(self, body):
+        parties = self.fixture("parties-and-accounts", "example_parties_response")["parties"]
+        return 200, {"parties": self.scaled(parties)}
+
+    def get_party(self, body, party_id):
+        return 200, {"party": {"id": party_id}}
+
+    def get_party_orders(self, body, party_id):
+        orders = self.fixture("get-orders-and-trades", "example_get_orders_for_party_response")["orders"]
+        with self.lock:
+            orders += [copy.deepcopy(o) for o in self.orders.values() if o["partyID"] == party_id]
+        return 200, {"orders": self.scaled(orders)}
+
+    def get_party_trades(self, body, party_id):
+        trades = self.fixture("get-orders-and-trades", "example_get_trades_for_market_response")["trades"]
+        return 200, {"trades": self.scaled(trades)}
+
+    def get_party_proposals(self, body, party_id):
+        with self.lock:
+            data = [{"proposal": copy.deepcopy(p)} for p in self.proposals.values() if p["partyID"] == party_id]
+        return 200, {"data": data}
+
+    def get_order_trades(self, body, order_id):
+        return 200, self.fixture("get-orders-and-trades", "example_get_trades_for_order_response")
+
+    def get_order_by_reference(self, body, reference):
+        with self.lock:
+            if reference in self.orders:
+                return 200, {"order": copy.deepcopy(self.orders[reference])}
+            if reference in self.pending:
+                return 404, {"error": "order not found", "code": 5}
+        order = self.fixture("get-by-reference", "example_get_order_by_ref_response")
+        order["order"]["reference"] = reference
+        return 200, order
+
+    def post_fee_estimate(self, body):
+        return 200, self.fixture("fees-estimation", "example_get_estimate_response")
+
+    def _prepare(self, action: Callable[[], None], **extra) -> Dict[str, Any]:
+        blob = base64.b64encode(uuid.uuid4().bytes).decode()
+        with self.lock:
+            self.prepared[blob] = action
+        return dict(extra, blob=blob)
+
+    def post_prepare_submit(self, body):
+        submission = body["submission"]
+        reference = str(uuid.uuid4())
+        now = str(time.time_ns())
+        order = {
+            "id": "V{:010d}-{:010d}".format(random.randrange(10 ** 10), random.randrange(10 ** 10)),
+            "reference": reference,
+            "marketID": submission.get("marketID", ""),
+            "partyID": submission.get("partyID", ""),
+            "side": submission.get("side", "SIDE_UNSPECIFIED"),
+            "price": submission.get("price", "0"),
+            "size": submission.get("size", "0"),
+            "remaining": submission.get("size", "0"),
+            "timeInForce": submission.get("timeInForce", "TIF_UNSPECIFIED"),
+            "type": submission.get("type", "TYPE_UNSPECIFIED"),
+            "expiresAt": str(submission.get("expiresAt", "0")),
+            "status": "STATUS_ACTIVE",
+            "reason": "ORDER_ERROR_NONE",
+            "createdAt": now,
+            "updatedAt": "0",
+            "version": "1",
+        }
+        with self.lock:
+            self.pending.add(reference)
+
+        def submit():
+            self.pending.discard(reference)
+            self.orders[reference] = order
+
+        return 200, self._prepare(submit, submitID=reference)
+
+    def post_prepare_amend(self, body):
+        amendment = body["amendment"]
+
+        def amend():
+            for order in self.orders.values():
+                if order["id"] == amendment.get("orderID"):
+                    if "price" in amendment:
+                        order["price"] = amendment["price"]["value"]
+                    delta = int(amendment.get("sizeDelta", 0))
+                    order["size"] = str(int(order["size"]) + delta)
+                    order["remaining"] = str(int(order["remaining"]) + delta)
+                    order["timeInForce"] = amendment.get("timeInForce", order["timeInForce"])
+                    order["updatedAt"] = str(time.time_ns())
+                    order["version"] = str(int(order["version"]) + 1)
+
+        return 200, self._prepare(amend)
+
+    def post_prepare_cancel(self, body):
+        cancellation = body["cancellation"]
+
+        def cancel():
+            for order in self.orders.values():
+                if all(order[k] == cancellation[k] for k in ("partyID", "marketID", "orderID")
+                       if k in cancellation and k != "orderID") and \
+                        cancellation.get("orderID", order["id"]) == order["id"]:
+                    order["status"] = "STATUS_CANCELLED"
+                    order["updatedAt"] = str(time.time_ns())
+
+        return 200, self._prepare(cancel)
+
+    def post_prepare_proposal(self, body):
+        reference = str(uuid.uuid4())
+        proposal = {
+            "ID": uuid.uuid4().hex.upper()[:32],
+            "reference": reference,
+            "partyID": body.get("partyID", ""),
+            "state": "STATE_OPEN",
+            "terms": body.get("proposal", {}),
+        }
+
+        def propose():
+            self.proposals[reference] = proposal
+
+        return 200, self._prepare(propose, pendingProposal=dict(proposal, state="STATE_PENDING"))
+
+    def post_prepare_vote(self, body):
+        vote = body.get("vote", {})
+
+        def enact():
+            for proposal in self.proposals.values():
+                if proposal["ID"] == vote.get("proposalID") and proposal["state"] == "STATE_OPEN":
+                    proposal["state"] = "STATE_ENACTED"
+                    market = copy.deepcopy(self.markets[0])
+                    market["id"] = proposal["ID"]
+                    self.markets.append(market)
+
+        return 200, self._prepare(enact, vote=vote)
+
+    def propagate(self, blob: str) -> bool:
+        with self.lock:
+            action = self.prepared.pop(blob, None)
+        if action is None:
+            if self.forward is not None:
+                self.forward(base64.b64decode(blob))
+            return False
+
+        def apply():
+            with self.lock:
+                action()
+                orders = copy.deepcopy(list(self.orders.values()))
+                listeners = list(self.order_listeners)
+            for listener in listeners:
+                listener(orders)
+
+        if self.block_time > 0:
+            threading.Timer(self.block_time, apply).start()
+        else:
+            apply()
+        return True
+
+    def post_transaction(self, body):
+        tx = body.get("tx", {})
+        self.propagate(tx.get("tx", "") if isinstance(tx, dict) else tx)
+        return 200, {"success": True}
+
+    # Wallet server
+
+    def post_login(self, body):
+        return 200, {"token": make_token()}
+
+    def delete_login(self, body):
+        return 200, {"success": True}
+
+    def get_keys(self, body):
+        return 200, self.fixture("wallet", "example_get_keys_response")
+
+    def post_key(self, body):
+        return 200, {"key": self.fixture("wallet", "example_generate_keypair_response")}
+
+    def get_key(self, body, pub):
+        key = self.fixture("wallet", "example_get_key_response")
+        key["pub"] = pub
+        return 200, {"key": key}
+
+    def post_sign(self, body):
+        blob = body.get("tx", "")
+        if body.get("propagate"):
+            self.propagate(blob)
+        signed = self.fixture("wallet", "example_sign_tx_response")
+        signed["tx"] = blob
+        return 200, {"signedTx": signed}
+
+
+class GraphQLConnection:
+    """One GraphQL websocket. Market data subscriptions send the market's
+    data rate times a second (0: as fast as possible), and complete after
+    count updates (0: never). Order subscriptions send a party's orders
+    whenever they change."""
+
+    def __init__(self, node: MockNode, rfile: Any, wfile: Any, rate: float = 10, count: int = 0):
+        self.node = node
+        self.rfile = rfile
+        self.wfile = wfile
+        self.rate = rate
+        self.count = count
+        self.write_lock = threading.Lock()
+        # operation id -> set to stop the subscription
+        self.stops: Dict[str, threading.Event] = {}
+
+    def run(self) -> None:
+        """Handle messages until the client closes the connection."""
+        try:
+            while True:
+                opcode, data = self._read_frame()
+                if opcode is None or opcode == 0x8:
+                    break
+                if opcode == 0x9:
+                    self._write_frame(0xA, data)
+                elif opcode == 0x1 and not self._on_message(json.loads(data)):
+                    break
+        except (OSError, ValueError):
+            pass
+        finally:
+            for stop in list(self.stops.values()):
+                stop.set()
+
+    def send(self, msg: Dict[str, Any]) -> None:
+        self._write_frame(0x1, json.dumps(msg).encode())
+
+    def _on_message(self, msg: Dict[str, Any]) -> bool:
+        # False once the client ends the connection
+        msg_type = msg.get("type")
+        if msg_type == "connection_init":
+            self.send({"type": "connection_ack"})
+        elif msg_type == "start":
+            op_id = msg.get("id")
+            payload = msg.get("payload") or {}
+            query = payload.get("query", "")
+            variables = payload.get("variables") or {}
+            stop = self.stops[op_id] = threading.Event()
+            if "marketData(" in query:
+                threading.Thread(
+                    target=self._market_data, args=(op_id, variables.get("marketId", ""), stop), daemon=True
+                ).start()
+            elif "orders(" in query:
+                self._orders(op_id, variables.get("partyId"), stop)
+            else:
+                self.send({"type": "error", "id": op_id, "payload": {"message": "unsupported subscription"}})
+        elif msg_type == "stop":
+            stop = self.stops.pop(msg.get("id"), None)
+            if stop is not None:
+                stop.set()
+        elif msg_type == "connection_terminate":
+            return False
+        return True
+
+    def _market_data(self, op_id: str, market_id: str, stop: threading.Event) -> None:
+        interval = 1 / self.rate if self.rate else 0
+        due = time.monotonic()
+        sent = 0
+        try:
+            while not stop.is_set() and (not self.count or sent < self.count):
+                market_data = self.node.get_market_data(None, market_id)[1]["marketData"]
+                # GraphQL has a market object where REST has the market id
+                market_data["market"] = {"id": market_id}
+                self.send({"type": "data", "id": op_id, "payload": {"data": {"marketData": market_data}}})
+                sent += 1
+                due += interval
+                stop.wait(due - time.monotonic())
+            if not stop.is_set():
+                self.send({"type": "complete", "id": op_id})
+        except OSError:
+            pass  # Closed by the client
+
+    def _orders(self, op_id: str, party_id: Optional[str], stop: threading.Event) -> None:
+        seen: Dict[str, Dict[str, Any]] = {}
+
+        def on_orders(orders: List[Dict[str, Any]]) -> None:
+            changed = []
+            for order in orders:
+                if party_id and order["partyID"] != party_id:
+                    continue
+                if seen.get(order["reference"]) != order:
+                    seen[order["reference"]] = order
+                    changed.append(graphql_order(order))
+            if changed and not stop.is_set():
+                try:
+                    self.send({"type": "data", "id": op_id, "payload": {"data": {"orders": changed}}})
+                except OSError:
+                    stop.set()
+
+        def remove():
+            stop.wait()
+            with self.node.lock:
+                self.node.order_listeners.remove(on_orders)
+
+        with self.node.lock:
+            self.node.order_listeners.append(on_orders)
+        threading.Thread(target=remove, daemon=True).start()
+
+    def _read_frame(self) -> Tuple[Optional[int], bytes]:
+        header = self.rfile.read(2)
+        if len(header) < 2:
+            return None, b""
+        length = header[1] & 0x7F
+        if length == 126:
+            (length,) = struct.unpack(">H", self.rfile.read(2))
+        elif length == 127:
+            (length,) = struct.unpack(">Q", self.rfile.read(8))
+        mask = self.rfile.read(4) if header[1] & 0x80 else b""
+        data = self.rfile.read(length)
+        if mask:
+            data = bytes(b ^ mask[i % 4] for i, b in enumerate(data))
+        return header[0] & 0x0F, data
+
+    def _write_frame(self, opcode: int, data: bytes) -> None:
+        if len(data) < 126:
+            header = struct.pack(">BB", 0x80 | opcode, len(data))
+        elif len(data) < 1 << 16:
+            header = struct.pack(">BBH", 0x80 | opcode, 126, len(data))
+        else:
+            header = struct.pack(">BBQ", 0x80 | opcode, 127, len(data))
+        with self.write_lock:
+            self.wfile.write(header + data)
+
+
+def make_handler(node: MockNode, latency: float, jitter: float, stream_rate: float = 10, stream_count: int = 0):
+    class MockHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            if self.headers.get("Upgrade", "").lower() == "websocket":
+                self._websocket()
+            else:
+                self._respond("GET")
+
+        def do_POST(self):
+            self._respond("POST")
+
+        def do_DELETE(self):
+            self._respond("DELETE")
+
+        def _respond(self, method: str):
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            try:
+                body = json.loads(raw) if raw else {}
+            except ValueError:
+                body = {}
+            status, payload = node.handle(method, self.path.split("?")[0].rstrip("/") or "/", body)
+            data = json.dumps(payload).encode()
+            delay = latency + random.uniform(-jitter, jitter)
+            if delay > 0:
+                time.sleep(delay)
+            etag = '"{}"'.format(hashlib.sha1(data).hexdigest())
+            if method == "GET" and status == 200 and self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            if method == "GET":
+                self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _websocket(self):
+            if self.path.split("?")[0].rstrip("/") != "/query":
+                self.send_error(404)
+                return
+            key = self.headers.get("Sec-WebSocket-Key", "")
+            accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+            self.send_response(101)
+            self.send_header("Upgrade", "websocket")
+            self.send_header("Connection", "Upgrade")
+            self.send_header("Sec-WebSocket-Accept", accept)
+            if self.headers.get("Sec-WebSocket-Protocol"):
+                self.send_header("Sec-WebSocket-Protocol", "graphql-ws")
+            self.end_headers()
+            self.close_connection = True
+            GraphQLConnection(node, self.rfile, self.wfile, stream_rate, stream_count).run()
+
+        def log_message(self, format, *args):
+            pass
+
+    return MockHandler
+
+
+def start(
+    port: int = 0,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    scale: int = 1,
+    block_time: float = 0.0,
+    cert: Optional[str] = None,
+    key: Optional[str] = None,
+    grpc_node: Optional[str] = None,
+    stream_rate: float = 10,
+    stream_count: int = 0,
+) -> ThreadingHTTPServer:
+    """Start a stand-in node on a background thread (latency and jitter in
+    seconds). Without cert and key, serves plain HTTP."""
+    forward = grpc_forwarder(grpc_node) if grpc_node else None
+    node = MockNode(load_fixtures(REPO), scale=scale, block_time=block_time, forward=forward)
+    handler = make_handler(node, latency, jitter, stream_rate, stream_count)
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    if cert:
+        ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        ctx.load_cert_chain(cert, key)
+        server.socket = ctx.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stand-in Vega node and wallet server")
+    parser.add_argument("--port", type=int, default=8443)
+    parser.add_argument("--latency", type=float, default=0, help="added to each response, in ms")
+    parser.add_argument("--jitter", type=float, default=0, help="random +/- latency, in ms")
+    parser.add_argument("--scale", type=int, default=1, help="repeat the items of list responses this many times")
+    parser.add_argument("--block-time", type=float, default=0, help="seconds until transactions take effect")
+    parser.add_argument("--cert", help="TLS certificate (default: a self-signed one is made)")
+    parser.add_argument("--key", help="TLS private key")
+    parser.add_argument("--grpc-node", help="send transactions this node prepared to a gRPC node (host:port)")
+    parser.add_argument("--stream-rate", type=float, default=10,
+                        help="market data updates per second per subscription (0: as fast as possible)")
+    parser.add_argument("--stream-count", type=int, default=0,
+                        help="complete each market data subscription after this many updates (0: never)")
+    parser.add_argument("--tls-dir", default=os.path.join(tempfile.gettempdir(), "vega-mock-node"),
+                        help="where to keep the self-signed certificate")
+    args = parser.parse_args()
+
+    cert, key = args.cert, args.key
+    if not cert:
+        os.makedirs(args.tls_dir, exist_ok=True)
+        cert, key = make_cert(args.tls_dir)
+    server = start(args.port, args.latency / 1000, args.jitter / 1000, args.scale, args.block_time, cert, key,
+                   args.grpc_node, args.stream_rate, args.stream_count)
+    url = f"https://127.0.0.1:{server.server_port}"
+    print("Stand-in node and wallet server running. To use it:")
+    print(f"export NODE_URL_REST={url}")
+    print(f"export WALLETSERVER_URL={url}")
+    print(f"export WEBSOCKET_CLIENT_CA_BUNDLE={cert}")
+    print(f"export REQUESTS_CA_BUNDLE={cert}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
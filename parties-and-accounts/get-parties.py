@@ -24,7 +24,6 @@ Responses:
 
 import json
 import os
-import requests
 import helpers
 
 node_url_rest = os.getenv("NODE_URL_REST")
@@ -32,10 +31,12 @@ if not helpers.check_url(node_url_rest):
     print("Error: Invalid or missing NODE_URL_REST environment variable.")
     exit(1)
 
+session = helpers.session()
+
 # __get_parties:
 # Request a list of parties trading on a Vega network
 url = "{base}/parties".format(base=node_url_rest)
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 response_json = response.json()
 print("Parties:\n{}".format(json.dumps(response_json, indent=2, sort_keys=True)))
@@ -47,7 +48,7 @@ pubkey = response_json["parties"][0]["id"]
 # __get_party_by_id:
 # Request a party by their identifier (this is their public key)
 url = "{base}/parties/{partyID}".format(base=node_url_rest, partyID=pubkey)
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 response_json = response.json()
 print("PartyById:\n{}".format(json.dumps(response_json, indent=2, sort_keys=True)))
@@ -19,38 +19,35 @@ Apps/Libraries:
 # some code here
 # :something__
 
-import requests
 import json
 import os
 import helpers
+import metadata
 
 node_url_rest = os.getenv("NODE_URL_REST")
 if not helpers.check_url(node_url_rest):
     print("Error: Invalid or missing NODE_URL_REST environment variable.")
     exit(1)
 
+session = helpers.session()
+
 # __get_assets:
 # Request a list of assets available on a Vega network
-url = "{base}/assets".format(base=node_url_rest)
-response = requests.get(url)
-helpers.check_response(response)
+# Note: the list of assets is cached, see metadata.MetadataRegistry
+registry = metadata.registry(node_url_rest)
 print("Assets:\n{}".format(
-    json.dumps(response.json(), indent=2, sort_keys=True)))
+    json.dumps({"assets": registry.assets()}, indent=2, sort_keys=True)))
 # :get_assets__
 
 # Find asset with name DAI
 found_asset_id = "UNKNOWN"
-assets = response.json()["assets"]
-for asset in assets:
-    if asset["name"] == "DAI":
-        print()
-        print("Found an asset with name DAI:")
-        found_asset_id = asset["ID"]
-        print(found_asset_id)
-        print()
-        break
-
-if found_asset_id == "UNKNOWN":
+try:
+    found_asset_id = registry.asset_by_name("DAI")["ID"]
+    print()
+    print("Found an asset with name DAI:")
+    print(found_asset_id)
+    print()
+except KeyError:
     print("DAI asset not found on specified Vega network, please propose and create the DAI asset")
 
 assert found_asset_id != "UNKNOWN"
@@ -59,7 +56,7 @@ print()
 # __get_asset:
 # Request a single asset by identifier on a Vega network
 url = "{base}/assets/{id}".format(base=node_url_rest, id=found_asset_id)
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 print("Asset by ID:\n{}".format(
     json.dumps(response.json(), indent=2, sort_keys=True)))
@@ -21,10 +21,11 @@ Apps/Libraries:
 # :something__
 
 import json
-import requests
 import time
 import os
 import helpers
+import metadata
+import walletauth
 
 node_url_rest = os.getenv("NODE_URL_REST")
 if not helpers.check_url(node_url_rest):
@@ -49,6 +50,8 @@ if not helpers.check_var(wallet_passphrase):
 # Help guide users against including api version suffix on url
 wallet_server_url = helpers.check_wallet_url(wallet_server_url)
 
+session = helpers.session()
+
 #####################################################################################
 #                           W A L L E T   S E R V I C E                             #
 #####################################################################################
@@ -57,10 +60,9 @@ print(f"Logging into wallet: {wallet_name}")
 
 # __login_wallet:
 # Log in to an existing wallet
-req = {"wallet": wallet_name, "passphrase": wallet_passphrase}
-response = requests.post(f"{wallet_server_url}/api/v1/auth/token", json=req)
-helpers.check_response(response)
-token = response.json()["token"]
+# Note: the token is cached on disk and reused until it expires
+wallet_auth = walletauth.WalletAuth(wallet_server_url, wallet_name, wallet_passphrase, session)
+token = wallet_auth.token()
 # :login_wallet__
 
 assert token != ""
@@ -68,8 +70,7 @@ print("Logged in to wallet successfully")
 
 # __get_pubkey:
 # List key pairs and select public key to use
-headers = {"Authorization": f"Bearer {token}"}
-response = requests.get(f"{wallet_server_url}/api/v1/keys", headers=headers)
+response = session.get(f"{wallet_server_url}/api/v1/keys", auth=wallet_auth)
 helpers.check_response(response)
 keys = response.json()["keys"]
 pubkey = keys[0]["pub"]
@@ -84,36 +85,32 @@ print("Selected pubkey for signing")
 
 # __get_assets:
 # Request a list of assets available on a Vega network
-url = "{base}/assets".format(base=node_url_rest)
-response = requests.get(url)
-helpers.check_response(response)
+# Note: the list of assets is cached, see metadata.MetadataRegistry
+registry = metadata.registry(node_url_rest)
 # :get_assets__
 
 # Debugging
 # print("Assets:\n{}".format(
-#    json.dumps(response.json(), indent=2, sort_keys=True)))
+#    json.dumps(registry.assets(), indent=2, sort_keys=True)))
 
 # Find asset with name DAI
-found_asset_id = "UNKNOWN"
-assets = response.json()["assets"]
-for asset in assets:
-    if asset["name"] == "DAI":
-        print("Found an asset with name DAI")
-        print(asset)
-        found_asset_id = asset["ID"]
-        break
-
-if found_asset_id == "UNKNOWN":
+try:
+    asset = registry.asset_by_name("DAI")
+except KeyError:
     print("DAI asset not found on specified Vega network, please propose and create this asset first")
     exit(1)
 
+print("Found an asset with name DAI")
+print(asset)
+found_asset_id = asset["ID"]
+
 #####################################################################################
 #                          B L O C K C H A I N   T I M E                            #
 #####################################################################################
 
 # __get_time:
 # Request the current blockchain time, and convert to time in seconds
-response = requests.get(f"{node_url_rest}/time")
+response = session.get(f"{node_url_rest}/time")
 helpers.check_response(response)
 blockchain_time = int(response.json()["timestamp"])
 blockchain_time_seconds = int(blockchain_time / 1e9)  # Seconds precision
@@ -175,7 +172,7 @@ market = {
 }
 
 url = f"{node_url_rest}/governance/prepare/proposal"
-response = requests.post(url, json=market)
+response = session.post(url, json=market)
 helpers.check_response(response)
 prepared_proposal = response.json()
 # :prepare_propose_market__
@@ -190,7 +187,7 @@ assert proposal_ref != ""
 blob = prepared_proposal["blob"]
 req = {"tx": blob, "pubKey": pubkey, "propagate": True}
 url = f"{wallet_server_url}/api/v1/messages"
-response = requests.post(url, headers=headers, json=req)
+response = session.post(url, auth=wallet_auth, json=req)
 helpers.check_response(response)
 # :sign_tx_proposal__
 
@@ -206,7 +203,7 @@ done = False
 while not done:
     time.sleep(0.5)
     print(".", end="", flush=True)
-    my_proposals = requests.get(node_url_rest + "/parties/" + pubkey + "/proposals")
+    my_proposals = session.get(node_url_rest + "/parties/" + pubkey + "/proposals")
     if my_proposals.status_code != 200:
         continue
 
@@ -240,7 +237,7 @@ vote = {
 }
 
 url = f"{node_url_rest}/governance/prepare/vote"
-response = requests.post(url, json=vote)
+response = session.post(url, json=vote)
 helpers.check_response(response)
 prepared_vote = response.json()
 # :prepare_vote__
@@ -254,7 +251,7 @@ prepared_vote = response.json()
 blob = prepared_vote["blob"]
 req = {"tx": blob, "pubKey": pubkey, "propagate": True}
 url = f"{wallet_server_url}/api/v1/messages"
-response = requests.post(url, headers=headers, json=req)
+response = session.post(url, auth=wallet_auth, json=req)
 helpers.check_response(response)
 # :sign_tx_vote__
 
@@ -267,7 +264,7 @@ print("Waiting for vote on proposal to succeed or fail...", end="", flush=True)
 done = False
 while not done:
     time.sleep(0.5)
-    my_proposals = requests.get(node_url_rest + "/parties/" + pubkey + "/proposals")
+    my_proposals = session.get(node_url_rest + "/parties/" + pubkey + "/proposals")
     if my_proposals.status_code != 200:
         continue
 
@@ -295,7 +292,7 @@ done = False
 while not done:
     time.sleep(0.5)
     print(".", end="", flush=True)
-    markets = requests.get(node_url_rest + "/markets")
+    markets = session.get(node_url_rest + "/markets")
     if markets.status_code != 200:
         continue
 
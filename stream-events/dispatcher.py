@@ -0,0 +1,104 @@
+"""
+Route event bus events to handlers by event type.
+
+Each BusEvent carries its type and a oneof "event" with the payload for that
+type. The dispatcher builds a table from type to payload field once, using
+the protobuf descriptors, so dispatching an event is one dict lookup and one
+attribute access - the other fields are never touched or formatted.
+
+    dispatcher = EventDispatcher(vac.events)
+
+    @dispatcher.on("BUS_EVENT_TYPE_TRADE")
+    def on_trade(trade, event):
+        ...
+
+    request = vac.api.trading.ObserveEventsRequest(type=dispatcher.types())
+    for stream_resp in data_client.ObserveEventBus(request):
+        dispatcher.dispatch_all(stream_resp.events)
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
+
+Handler = Callable[[Any, Any], None]
+
+TYPE_PREFIX = "BUS_EVENT_TYPE_"
+
+
+def _camel(name: str) -> str:
+    # MARGIN_LEVELS -> marginLevels
+    first, *rest = name.lower().split("_")
+    return first + "".join(word.title() for word in rest)
+
+
+class EventDispatcher:
+    def __init__(self, events_module: Any):
+        """events_module is the generated events protobuf module, as
+        vac.events, providing BusEvent and the BusEventType enum."""
+        self.events = events_module
+        self.all_type = events_module.BUS_EVENT_TYPE_ALL
+        fields = {
+            f.name for f in events_module.BusEvent.DESCRIPTOR.oneofs_by_name["event"].fields
+        }
+        # type value -> name of the oneof field carrying its payload
+        self.fields: Dict[int, str] = {}
+        self.names: Dict[int, str] = {}
+        for name, value in events_module.BusEventType.items():
+            self.names[value] = name
+            field = _camel(name[len(TYPE_PREFIX):])
+            if field in fields:
+                self.fields[value] = field
+        self._table: Dict[int, Tuple[str, Tuple[Handler, ...]]] = {}
+        self._any: Tuple[Handler, ...] = ()
+
+    def on(self, event_type: Union[str, int], handler: Handler = None):
+        """Register handler(payload, event) for an event type, given as
+        name ("BUS_EVENT_TYPE_TRADE" or "TRADE") or enum value. Can be used
+        as a decorator."""
+        if handler is None:
+            return lambda h: self.on(event_type, h)
+        value = self._value(event_type)
+        if value not in self.fields:
+            raise ValueError(f"Event type {self.names.get(value, value)} has no payload field")
+        field, handlers = self._table.get(value, (self.fields[value], ()))
+        self._table[value] = (field, handlers + (handler,))
+        return handler
+
+    def on_any(self, handler: Handler) -> Handler:
+        """Register handler(payload, event) for every event type."""
+        self._any += (handler,)
+        return handler
+
+    def types(self) -> List[int]:
+        """Event types to subscribe to: only those with handlers, unless a
+        handler for any type is registered."""
+        if self._any or not self._table:
+            return [self.all_type]
+        return sorted(self._table)
+
+    def type_name(self, value: int) -> str:
+        return self.names.get(value, str(value))
+
+    def dispatch(self, event: Any) -> None:
+        entry = self._table.get(event.type)
+        if entry is not None:
+            field, handlers = entry
+            payload = getattr(event, field)
+            for handler in handlers:
+                handler(payload, event)
+        if self._any:
+            field = self.fields.get(event.type)
+            payload = getattr(event, field) if field is not None else None
+            for handler in self._any:
+                handler(payload, event)
+
+    def dispatch_all(self, events: Iterable[Any]) -> None:
+        dispatch = self.dispatch
+        for event in events:
+            dispatch(event)
+
+    def _value(self, event_type: Union[str, int]) -> int:
+        if isinstance(event_type, int):
+            return event_type
+        if not event_type.startswith(TYPE_PREFIX):
+            event_type = TYPE_PREFIX + event_type
+        return self.events.BusEventType.Value(event_type)
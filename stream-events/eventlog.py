@@ -0,0 +1,189 @@
+"""
+Append-only binary log of event bus events, for replay and audit.
+
+Events are stored as serialized protobufs in segment files, each record
+being a 4-byte little-endian length followed by the message bytes. A
+segment is closed and a new one started once it reaches max_segment_bytes.
+Next to each segment "events-NNNNNNNN.log" there are two index files:
+
+- events-NNNNNNNN.idx: fixed 16-byte entries (timestamp, offset), one per
+  record, in append order. Block timestamps do not go backwards, so the
+  entries are sorted by time and can be binary searched.
+- events-NNNNNNNN.ids: one "event ID <tab> offset" line per record.
+
+The reader memory-maps segments and their time indexes, so seeking to a
+time range touches only the index pages it searches and the records it
+returns.
+"""
+
+import glob
+import mmap
+import os
+import struct
+from typing import Callable, Iterator, List, Optional, Tuple
+
+LENGTH = struct.Struct("<I")
+INDEX_ENTRY = struct.Struct("<qQ")
+
+
+def _segment_paths(directory: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(directory, "events-*.log")))
+
+
+class EventLogWriter:
+    def __init__(self, directory: str, max_segment_bytes: int = 64 * 1024 * 1024):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        os.makedirs(directory, exist_ok=True)
+        existing = _segment_paths(directory)
+        # Never append to an existing segment, which may end with a torn record
+        self._seq = int(os.path.basename(existing[-1])[7:15]) + 1 if existing else 0
+        self._log = self._idx = self._ids = None
+        self._offset = 0
+        self._open_segment()
+
+    def append(self, data: bytes, timestamp: int, event_id: str = "") -> None:
+        """Append a serialized event with its block timestamp (ns)."""
+        if self._offset >= self.max_segment_bytes:
+            self._close_segment()
+            self._seq += 1
+            self._open_segment()
+        self._log.write(LENGTH.pack(len(data)))
+        self._log.write(data)
+        self._idx.write(INDEX_ENTRY.pack(timestamp, self._offset))
+        if event_id:
+            self._ids.write(f"{event_id}\t{self._offset}\n")
+        self._offset += LENGTH.size + len(data)
+
+    def flush(self) -> None:
+        for f in (self._log, self._idx, self._ids):
+            f.flush()
+
+    def close(self) -> None:
+        self._close_segment()
+
+    def _open_segment(self) -> None:
+        base = os.path.join(self.directory, f"events-{self._seq:08d}")
+        self._log = open(base + ".log", "ab")
+        self._idx = open(base + ".idx", "ab")
+        self._ids = open(base + ".ids", "a")
+        self._offset = 0
+
+    def _close_segment(self) -> None:
+        for f in (self._log, self._idx, self._ids):
+            if f is not None:
+                f.close()
+
+
+class _Segment:
+    def __init__(self, path: str):
+        self.path = path
+        self.log = self._map(path)
+        self.idx = self._map(path[:-4] + ".idx")
+        # Entries for records which are fully written
+        self.count = len(self.idx) // INDEX_ENTRY.size if self.idx is not None else 0
+        while self.count and not self._complete(self.count - 1):
+            self.count -= 1
+        self._ids = None
+
+    @staticmethod
+    def _map(path: str) -> Optional[mmap.mmap]:
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return None
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+
+    def entry(self, i: int) -> Tuple[int, int]:
+        return INDEX_ENTRY.unpack_from(self.idx, i * INDEX_ENTRY.size)
+
+    def record(self, offset: int) -> bytes:
+        (length,) = LENGTH.unpack_from(self.log, offset)
+        start = offset + LENGTH.size
+        return self.log[start:start + length]
+
+    def first_at_or_after(self, timestamp: int) -> int:
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.entry(mid)[0] < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def offset_of(self, event_id: str) -> Optional[int]:
+        if self._ids is None:
+            self._ids = {}
+            try:
+                with open(self.path[:-4] + ".ids") as f:
+                    for line in f:
+                        eid, _, offset = line.rstrip("\n").partition("\t")
+                        if offset:
+                            self._ids[eid] = int(offset)
+            except FileNotFoundError:
+                pass
+        return self._ids.get(event_id)
+
+    def _complete(self, i: int) -> bool:
+        offset = self.entry(i)[1]
+        if self.log is None or offset + LENGTH.size > len(self.log):
+            return False
+        (length,) = LENGTH.unpack_from(self.log, offset)
+        return offset + LENGTH.size + length <= len(self.log)
+
+    def close(self) -> None:
+        for m in (self.log, self.idx):
+            if m is not None:
+                m.close()
+
+
+class EventLogReader:
+    """Read events back from a log directory.
+
+    parse turns the record bytes into a message, e.g.
+    vac.events.BusEvent.FromString; by default the bytes are returned.
+    """
+
+    def __init__(self, directory: str, parse: Callable[[bytes], object] = bytes):
+        self.parse = parse
+        self.segments = [s for s in map(_Segment, _segment_paths(directory)) if s.count]
+
+    def __iter__(self) -> Iterator[object]:
+        return self.range()
+
+    def range(self, start: Optional[int] = None, end: Optional[int] = None) -> Iterator[object]:
+        """Events with start <= timestamp < end (ns), in log order."""
+        for seg in self.segments:
+            if end is not None and seg.entry(0)[0] >= end:
+                break
+            if start is not None and seg.entry(seg.count - 1)[0] < start:
+                continue
+            i = seg.first_at_or_after(start) if start is not None else 0
+            while i < seg.count:
+                timestamp, offset = seg.entry(i)
+                if end is not None and timestamp >= end:
+                    return
+                yield self.parse(seg.record(offset))
+                i += 1
+
+    def get(self, event_id: str) -> Optional[object]:
+        """The event with the given ID, or None."""
+        for seg in reversed(self.segments):
+            offset = seg.offset_of(event_id)
+            if offset is not None:
+                return self.parse(seg.record(offset))
+        return None
+
+    def time_span(self) -> Optional[Tuple[int, int]]:
+        """(first, last) timestamps in the log, or None if it is empty."""
+        if not self.segments:
+            return None
+        last = self.segments[-1]
+        return self.segments[0].entry(0)[0], last.entry(last.count - 1)[0]
+
+    def close(self) -> None:
+        for seg in self.segments:
+            seg.close()
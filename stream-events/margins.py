@@ -0,0 +1,166 @@
+"""
+Margin level alerts for every party, market and asset, from event bus events.
+
+The latest margin levels (from margin-levels events) and account balances
+(from account events) are written into NumPy arrays, one row per (party,
+market, asset). Handlers only store values; evaluate() then checks every row
+against the alert thresholds in one vectorized pass, once per batch of
+events, and returns the rows whose alert level changed.
+
+Alert levels, from the margin account balance (margin) and the party's
+general account balance for the asset (general):
+
+- LEVEL_NEAR_SEARCH: margin < search level * near_search_ratio
+- LEVEL_SEARCH: margin < search level, so the node will move collateral
+  from the general account
+- LEVEL_DISTRESSED: margin + general < maintenance margin, so the position
+  can be closed out
+
+    monitor = MarginMonitor()
+    dispatcher.on("BUS_EVENT_TYPE_MARGIN_LEVELS", monitor.on_margin_levels)
+    dispatcher.on("BUS_EVENT_TYPE_ACCOUNT", monitor.on_account)
+    for stream_resp in data_client.ObserveEventBus(request):
+        dispatcher.dispatch_all(stream_resp.events)
+        for alert in monitor.evaluate():
+            print(alert)
+"""
+
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+LEVEL_OK = 0
+LEVEL_NEAR_SEARCH = 1
+LEVEL_SEARCH = 2
+LEVEL_DISTRESSED = 3
+LEVEL_NAMES = ("OK", "NEAR_SEARCH", "SEARCH", "DISTRESSED")
+
+# Values of the vega.AccountType protobuf enum
+ACCOUNT_TYPE_MARGIN = 3
+ACCOUNT_TYPE_GENERAL = 4
+
+
+class Alert(NamedTuple):
+    party_id: str
+    market_id: str
+    asset: str
+    level: int
+    previous_level: int
+    margin: int
+    general: int
+    search_level: int
+    maintenance_margin: int
+
+    @property
+    def level_name(self) -> str:
+        return LEVEL_NAMES[self.level]
+
+
+class MarginMonitor:
+    def __init__(self, near_search_ratio: float = 1.1, capacity: int = 1024):
+        self.near_search_ratio = near_search_ratio
+        # (party id, market id, asset) -> row, and row -> key
+        self._rows: Dict[Tuple[str, str, str], int] = {}
+        self.keys: List[Tuple[str, str, str]] = []
+        # (party id, asset) -> index into general, for general accounts
+        self._generals: Dict[Tuple[str, str], int] = {}
+        self.maintenance = np.zeros(capacity, dtype=np.int64)
+        self.search = np.zeros(capacity, dtype=np.int64)
+        self.initial = np.zeros(capacity, dtype=np.int64)
+        self.release = np.zeros(capacity, dtype=np.int64)
+        self.margin = np.zeros(capacity, dtype=np.int64)
+        # Rows with margin levels received (others are not checked)
+        self.has_levels = np.zeros(capacity, dtype=bool)
+        self.level = np.zeros(capacity, dtype=np.int8)
+        # Per row, the index of its general account balance
+        self.general_index = np.zeros(capacity, dtype=np.int64)
+        self.general = np.zeros(capacity, dtype=np.int64)
+
+    def row(self, party_id: str, market_id: str, asset: str) -> int:
+        key = (party_id, market_id, asset)
+        row = self._rows.get(key)
+        if row is None:
+            row = self._rows[key] = len(self.keys)
+            self.keys.append(key)
+            if row >= len(self.maintenance):
+                self._grow_rows(2 * len(self.maintenance))
+            self.general_index[row] = self._general(party_id, asset)
+        return row
+
+    def on_margin_levels(self, levels: Any, event: Any = None) -> None:
+        row = self.row(levels.partyID, levels.marketID, levels.asset)
+        self.maintenance[row] = levels.maintenanceMargin
+        self.search[row] = levels.searchLevel
+        self.initial[row] = levels.initialMargin
+        self.release[row] = levels.collateralReleaseLevel
+        self.has_levels[row] = True
+
+    def on_account(self, account: Any, event: Any = None) -> None:
+        # The index first in each case, as adding a row may replace the arrays
+        if account.type == ACCOUNT_TYPE_MARGIN:
+            row = self.row(account.owner, account.marketID, account.asset)
+            self.margin[row] = account.balance
+        elif account.type == ACCOUNT_TYPE_GENERAL:
+            index = self._general(account.owner, account.asset)
+            self.general[index] = account.balance
+
+    def levels(self) -> np.ndarray:
+        """The alert level of every row, from the current values."""
+        n = len(self.keys)
+        margin = self.margin[:n]
+        search = self.search[:n]
+        available = margin + self.general[self.general_index[:n]]
+        level = np.where(
+            available < self.maintenance[:n],
+            LEVEL_DISTRESSED,
+            np.where(
+                margin < search,
+                LEVEL_SEARCH,
+                np.where(margin < search * self.near_search_ratio, LEVEL_NEAR_SEARCH, LEVEL_OK),
+            ),
+        ).astype(np.int8)
+        level[~self.has_levels[:n]] = LEVEL_OK
+        return level
+
+    def evaluate(self) -> List[Alert]:
+        """Alerts for the rows whose level changed since the last call."""
+        n = len(self.keys)
+        level = self.levels()
+        previous = self.level[:n]
+        changed = np.flatnonzero(level != previous)
+        alerts = []
+        for row in changed.tolist():
+            party_id, market_id, asset = self.keys[row]
+            alerts.append(Alert(
+                party_id,
+                market_id,
+                asset,
+                int(level[row]),
+                int(previous[row]),
+                int(self.margin[row]),
+                int(self.general[self.general_index[row]]),
+                int(self.search[row]),
+                int(self.maintenance[row]),
+            ))
+        self.level[:n] = level
+        return alerts
+
+    def at_level(self, minimum: int = LEVEL_NEAR_SEARCH) -> List[Tuple[str, str, str]]:
+        """Keys of the rows currently at or above an alert level."""
+        return [self.keys[row] for row in np.flatnonzero(self.levels() >= minimum).tolist()]
+
+    def _general(self, party_id: str, asset: str) -> int:
+        key = (party_id, asset)
+        index = self._generals.get(key)
+        if index is None:
+            index = self._generals[key] = len(self._generals)
+            if index >= len(self.general):
+                self.general = np.concatenate([self.general, np.zeros(len(self.general), dtype=np.int64)])
+        return index
+
+    def _grow_rows(self, capacity: int) -> None:
+        for name in ("maintenance", "search", "initial", "release", "margin", "has_levels", "level", "general_index"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
@@ -0,0 +1,159 @@
+"""
+Positions and PnL per party and market, kept up to date from event bus
+events.
+
+Each fill updates the party's open volume, average entry price and realised
+PnL in O(1). Unrealised PnL is (mark price - average entry price) * open
+volume, with the mark price taken from the latest settle-position, market
+data or trade event for the market (0 until there is one).
+
+Fills come from trade events (both sides of a trade from one event) or, with
+fills_from="settlements", from the trade settlements in settle-position
+events. Feed one or the other as fills, not both, or each fill is counted
+twice.
+
+Party ids are interned to small ints, and each market keeps its positions in
+arrays indexed by them, so thousands of parties cost a few bytes each per
+market instead of a dict per position.
+
+    engine = PositionEngine()
+    dispatcher.on("BUS_EVENT_TYPE_TRADE", engine.on_trade)
+    dispatcher.on("BUS_EVENT_TYPE_SETTLE_POSITION", engine.on_settle_position)
+    ...
+    engine.portfolio(party_id)
+"""
+
+from array import array
+from typing import Any, Dict, List, NamedTuple, Optional
+
+
+class Position(NamedTuple):
+    party_id: str
+    market_id: str
+    open_volume: int
+    average_entry_price: float
+    realised_pnl: float
+    unrealised_pnl: float
+    mark_price: Optional[int]
+
+
+class MarketPositions:
+    """Positions in one market, indexed by interned party id."""
+
+    def __init__(self, market_id: str):
+        self.market_id = market_id
+        # None until a trade, settle-position or market data event gives one
+        self.mark_price: Optional[int] = None
+        self.volume = array("q")
+        self.entry = array("d")
+        self.realised = array("d")
+
+    def _grow(self, size: int) -> None:
+        extra = size - len(self.volume)
+        if extra > 0:
+            self.volume.extend([0] * extra)
+            self.entry.extend([0.0] * extra)
+            self.realised.extend([0.0] * extra)
+
+    def fill(self, party: int, size: int, price: int) -> None:
+        """Apply a fill of size (positive to buy, negative to sell) at price."""
+        if party >= len(self.volume):
+            self._grow(party + 1)
+        if size == 0:
+            return
+        volume = self.volume[party]
+        new_volume = volume + size
+        if volume == 0 or (volume > 0) == (size > 0):
+            # Opening or adding: average the entry price
+            self.entry[party] = (self.entry[party] * abs(volume) + price * abs(size)) / abs(new_volume)
+        else:
+            # Reducing, closing or flipping: realise PnL on the closed volume
+            closed = min(abs(size), abs(volume))
+            direction = 1 if volume > 0 else -1
+            self.realised[party] += (price - self.entry[party]) * closed * direction
+            if new_volume == 0:
+                self.entry[party] = 0.0
+            elif (new_volume > 0) != (volume > 0):
+                self.entry[party] = float(price)
+        self.volume[party] = new_volume
+
+    def unrealised(self, party: int) -> float:
+        if party >= len(self.volume) or not self.volume[party] or self.mark_price is None:
+            return 0.0
+        return (self.mark_price - self.entry[party]) * self.volume[party]
+
+
+class PositionEngine:
+    def __init__(self, fills_from: str = "trades"):
+        if fills_from not in ("trades", "settlements"):
+            raise ValueError(f"Unknown fills_from: {fills_from}")
+        self.fills_from = fills_from
+        # Interned party ids: party id -> index, and index -> party id
+        self._party_index: Dict[str, int] = {}
+        self.parties: List[str] = []
+        self.markets: Dict[str, MarketPositions] = {}
+
+    def party(self, party_id: str) -> int:
+        """The interned index of a party id."""
+        index = self._party_index.get(party_id)
+        if index is None:
+            index = self._party_index[party_id] = len(self.parties)
+            self.parties.append(party_id)
+        return index
+
+    def market(self, market_id: str) -> MarketPositions:
+        positions = self.markets.get(market_id)
+        if positions is None:
+            positions = self.markets[market_id] = MarketPositions(market_id)
+        return positions
+
+    def fill(self, party_id: str, market_id: str, size: int, price: int) -> None:
+        self.market(market_id).fill(self.party(party_id), size, price)
+
+    # Handlers, with the EventDispatcher signature handler(payload, event)
+
+    def on_trade(self, trade: Any, event: Any = None) -> None:
+        positions = self.market(trade.marketID)
+        positions.mark_price = trade.price
+        if self.fills_from == "trades":
+            positions.fill(self.party(trade.buyer), trade.size, trade.price)
+            positions.fill(self.party(trade.seller), -trade.size, trade.price)
+
+    def on_settle_position(self, settle: Any, event: Any = None) -> None:
+        positions = self.market(settle.marketID)
+        if settle.price:
+            positions.mark_price = settle.price
+        if self.fills_from == "settlements":
+            party = self.party(settle.partyID)
+            for settlement in settle.tradeSettlements:
+                positions.fill(party, settlement.size, settlement.price)
+
+    def on_market_data(self, market_data: Any, event: Any = None) -> None:
+        if market_data.markPrice:
+            self.market(market_data.market).mark_price = market_data.markPrice
+
+    # Views
+
+    def position(self, party_id: str, market_id: str) -> Optional[Position]:
+        index = self._party_index.get(party_id)
+        positions = self.markets.get(market_id)
+        if index is None or positions is None or index >= len(positions.volume):
+            return None
+        return Position(
+            party_id,
+            market_id,
+            positions.volume[index],
+            positions.entry[index],
+            positions.realised[index],
+            positions.unrealised(index),
+            positions.mark_price,
+        )
+
+    def portfolio(self, party_id: str) -> List[Position]:
+        """The party's positions in all markets it has traded in."""
+        positions = (self.position(party_id, market_id) for market_id in self.markets)
+        return [p for p in positions if p is not None and (p.open_volume or p.realised_pnl)]
+
+    def total_pnl(self, party_id: str) -> float:
+        """Realised plus unrealised PnL over all markets."""
+        return sum(p.realised_pnl + p.unrealised_pnl for p in self.portfolio(party_id))
@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+
+"""
+Script language: Python3
+
+Talks to:
+- Vega node (gRPC)
+
+Apps/Libraries:
+- gRPC (node): Vega-API-client (https://pypi.org/project/Vega-API-client/)
+"""
+
+# Record the event bus stream to an append-only binary event log, which can
+# be read back with replay-events-with-Vega-API-client.py (see eventlog.py).
+
+import argparse
+import os
+import signal
+import sys
+import threading
+
+import grpc
+from google.protobuf.empty_pb2 import Empty
+import vegaapiclient as vac
+
+from eventlog import EventLogWriter
+
+parser = argparse.ArgumentParser(description="Record event bus events to a binary log")
+parser.add_argument("--dir", default="event-log", help="directory for log segments")
+parser.add_argument("--segment-mb", type=int, default=64, help="size at which a new segment is started")
+parser.add_argument("--all-markets", action="store_true", help="record events for all markets, not just the first")
+args = parser.parse_args()
+
+node_url_grpc = os.getenv("NODE_URL_GRPC")
+data_client = vac.VegaTradingDataClient(node_url_grpc)
+
+writer = EventLogWriter(args.dir, max_segment_bytes=args.segment_mb * 1024 * 1024)
+
+def signal_handler(sig, frame):
+    writer.close()
+    print('Exit requested.')
+    sys.exit(0)
+
+signal.signal(signal.SIGINT, signal_handler)
+
+market_id = ""
+if not args.all_markets:
+    market_id = data_client.Markets(Empty()).markets[0].id
+    print(f"Recording events for market {market_id} to {args.dir}")
+else:
+    print(f"Recording events for all markets to {args.dir}")
+
+# Events carry no timestamp of their own: stamp each one with the block time
+# from the latest TIME_UPDATE event, starting from the node's block time when
+# subscribing. The log's time index relies on timestamps never going
+# backwards, which the local clock could not promise.
+time_update = vac.events.BUS_EVENT_TYPE_TIME_UPDATE
+block_time = data_client.GetVegaTime(Empty()).timestamp
+block_time_lock = threading.Lock()
+
+
+def update_block_time(timestamp):
+    global block_time
+    with block_time_lock:
+        block_time = max(block_time, timestamp)
+
+
+def follow_time_updates():
+    request = vac.api.trading.ObserveEventsRequest(type=[time_update])
+    try:
+        for stream_resp in data_client.ObserveEventBus(request):
+            for event in stream_resp.events:
+                update_block_time(event.timeUpdate.timestamp)
+    except grpc.RpcError:
+        pass  # the main stream reports the disconnect
+
+
+# Time updates belong to no market, so when recording one market they are
+# followed on a subscription of their own
+if market_id:
+    threading.Thread(target=follow_time_updates, daemon=True).start()
+
+count = 0
+
+request = vac.api.trading.ObserveEventsRequest(type=[vac.events.BUS_EVENT_TYPE_ALL], marketID=market_id)
+for stream_resp in data_client.ObserveEventBus(request):
+    for event in stream_resp.events:
+        if event.type == time_update:
+            update_block_time(event.timeUpdate.timestamp)
+        writer.append(event.SerializeToString(), block_time, event.ID)
+    writer.flush()
+    count += len(stream_resp.events)
+    print(f"\r{count} events recorded", end="", flush=True)
+
+writer.close()
+print("\nStream disconnected.")
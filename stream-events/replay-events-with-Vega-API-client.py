@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+
+"""
+Script language: Python3
+
+Talks to:
+- Nothing: reads an event log written by record-events-with-Vega-API-client.py
+
+Apps/Libraries:
+- protobuf messages: Vega-API-client (https://pypi.org/project/Vega-API-client/)
+"""
+
+import argparse
+from datetime import datetime, timezone
+
+import vegaapiclient as vac
+
+from eventlog import EventLogReader
+
+
+def to_ns(value: str) -> int:
+    """Accept nanoseconds since the epoch or an ISO 8601 time."""
+    if value.isdigit():
+        return int(value)
+    t = datetime.fromisoformat(value)
+    if t.tzinfo is None:
+        t = t.replace(tzinfo=timezone.utc)
+    return int(t.timestamp() * 1e9)
+
+
+parser = argparse.ArgumentParser(description="Read events back from a binary event log")
+parser.add_argument("--dir", default="event-log", help="directory with log segments")
+parser.add_argument("--start", type=to_ns, help="first block time (ns or ISO 8601, UTC by default)")
+parser.add_argument("--end", type=to_ns, help="block time to stop at (exclusive)")
+parser.add_argument("--id", help="print only the event with this ID")
+parser.add_argument("--count", action="store_true", help="only count the events")
+args = parser.parse_args()
+
+reader = EventLogReader(args.dir, parse=vac.events.BusEvent.FromString)
+span = reader.time_span()
+if span is None:
+    print(f"No events in {args.dir}")
+    exit(1)
+print(f"Log covers block times {span[0]} to {span[1]}")
+
+if args.id:
+    event = reader.get(args.id)
+    if event is None:
+        print(f"No event with ID {args.id}")
+        exit(1)
+    print(event)
+else:
+    n = 0
+    for event in reader.range(args.start, args.end):
+        n += 1
+        if not args.count:
+            print(event)
+    print(f"{n} events")
+
+reader.close()
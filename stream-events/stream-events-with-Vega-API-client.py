@@ -23,6 +23,9 @@ import os
 import signal
 import sys
 
+import helpers
+from dispatcher import EventDispatcher
+
 node_url_grpc = os.getenv("NODE_URL_GRPC")
 
 from google.protobuf.empty_pb2 import Empty
@@ -48,18 +51,43 @@ print(market_id)
 
 print("Connecting to stream...")
 
+# __dispatch_events:
+# Register a handler per event type. Each handler receives the event's payload
+# (the field of the event which is set for its type) and the event itself.
+# Only the registered types are requested from the node.
+dispatcher = EventDispatcher(vac.events)
+
+@dispatcher.on("BUS_EVENT_TYPE_TRADE")
+def on_trade(trade, event):
+    print(f"Trade {trade.id}: {trade.size} @ {trade.price} buyer={trade.buyer} seller={trade.seller}")
+
+@dispatcher.on("BUS_EVENT_TYPE_ORDER")
+def on_order(order, event):
+    status = helpers.enum_to_str(vac.vega.Order.Status, order.status)
+    print(f"Order {order.id}: {order.remaining}/{order.size} @ {order.price} {status}")
+
+@dispatcher.on("BUS_EVENT_TYPE_SETTLE_POSITION")
+def on_settle_position(settle, event):
+    print(f"Settle position: party={settle.partyID} price={settle.price}")
+
+@dispatcher.on("BUS_EVENT_TYPE_MARGIN_LEVELS")
+def on_margin_levels(levels, event):
+    print(f"Margin levels: party={levels.partyID} asset={levels.asset} "
+          f"maintenance={levels.maintenanceMargin} search={levels.searchLevel}")
+
+# To see every event instead, register a handler for any type:
+# dispatcher.on_any(lambda payload, event: print(event))
+# :dispatch_events__
+
 # __stream_events:
 # Subscribe to the events bus stream for the marketID specified
-# Required: type field - default ALL
+# Required: type field - the types with registered handlers (or ALL)
 # Optional: Market identifier - filter by market
 #           Party identifier - filter by party
-# By default, all events on all markets for all parties will be returned on the stream.
-all_types = vac.events.BUS_EVENT_TYPE_ALL
-subscribe_events_request = vac.api.trading.ObserveEventsRequest(type=[all_types], marketID=market_id)
+subscribe_events_request = vac.api.trading.ObserveEventsRequest(type=dispatcher.types(), marketID=market_id)
 for stream_resp in data_client.ObserveEventBus(subscribe_events_request):
-    for events in stream_resp.events:
-        # All events (as per request filter) arriving over the channel/stream will be printed
-        print(events)
+    # Events arriving over the channel/stream are passed to their handlers
+    dispatcher.dispatch_all(stream_resp.events)
 # :stream_events__
 
-print("Stream disconnected.")
\ No newline at end of file
+print("Stream disconnected.")
@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+
+"""
+Script language: Python3
+
+Talks to:
+- Vega node (gRPC)
+
+Apps/Libraries:
+- gRPC (node): Vega-API-client (https://pypi.org/project/Vega-API-client/)
+- Arrays: NumPy (https://pypi.org/project/numpy/)
+"""
+
+# Watch margin levels and account balances of every party on the network
+# from the event bus, and print an alert when a party's margin account gets
+# near (or below) its search level, or when it is distressed (see
+# margins.py).
+
+import argparse
+import os
+import signal
+import sys
+
+import vegaapiclient as vac
+
+from dispatcher import EventDispatcher
+from margins import LEVEL_NAMES, MarginMonitor
+
+parser = argparse.ArgumentParser(description="Margin level alerts for all parties from the event bus")
+parser.add_argument("--near-search-ratio", type=float, default=1.1,
+                    help="alert when the margin balance is below search level times this")
+args = parser.parse_args()
+
+node_url_grpc = os.getenv("NODE_URL_GRPC")
+data_client = vac.VegaTradingDataClient(node_url_grpc)
+
+def signal_handler(sig, frame):
+    print('Exit requested.')
+    sys.exit(0)
+
+signal.signal(signal.SIGINT, signal_handler)
+
+monitor = MarginMonitor(near_search_ratio=args.near_search_ratio)
+dispatcher = EventDispatcher(vac.events)
+dispatcher.on("BUS_EVENT_TYPE_MARGIN_LEVELS", monitor.on_margin_levels)
+dispatcher.on("BUS_EVENT_TYPE_ACCOUNT", monitor.on_account)
+
+# Handlers only store the latest values; all parties are checked at once
+# after each batch of events.
+request = vac.api.trading.ObserveEventsRequest(type=dispatcher.types())
+for stream_resp in data_client.ObserveEventBus(request):
+    dispatcher.dispatch_all(stream_resp.events)
+    for alert in monitor.evaluate():
+        print(f"{alert.level_name} (was {LEVEL_NAMES[alert.previous_level]}): party={alert.party_id} "
+              f"market={alert.market_id} asset={alert.asset} margin={alert.margin} general={alert.general} "
+              f"search={alert.search_level} maintenance={alert.maintenance_margin}")
+
+print("Stream disconnected.")
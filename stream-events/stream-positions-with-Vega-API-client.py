@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+
+"""
+Script language: Python3
+
+Talks to:
+- Vega node (gRPC)
+
+Apps/Libraries:
+- gRPC (node): Vega-API-client (https://pypi.org/project/Vega-API-client/)
+"""
+
+# Keep positions and PnL for every party from the event bus (see
+# positions.py), and print them every few seconds, without querying the node
+# for positions.
+
+import argparse
+import os
+import signal
+import sys
+import time
+
+import vegaapiclient as vac
+
+from dispatcher import EventDispatcher
+from positions import PositionEngine
+
+parser = argparse.ArgumentParser(description="Positions and PnL per party from the event bus")
+parser.add_argument("--party", default="", help="only show (and stream events for) this party")
+parser.add_argument("--fills", choices=["trades", "settlements"], default="trades",
+                    help="take fills from trade events, or from settle-position events")
+parser.add_argument("--every", type=float, default=5, help="seconds between printouts")
+parser.add_argument("--top", type=int, default=10, help="number of parties to show, by absolute PnL")
+args = parser.parse_args()
+
+node_url_grpc = os.getenv("NODE_URL_GRPC")
+data_client = vac.VegaTradingDataClient(node_url_grpc)
+
+def signal_handler(sig, frame):
+    print('Exit requested.')
+    sys.exit(0)
+
+signal.signal(signal.SIGINT, signal_handler)
+
+engine = PositionEngine(fills_from=args.fills)
+dispatcher = EventDispatcher(vac.events)
+dispatcher.on("BUS_EVENT_TYPE_TRADE", engine.on_trade)
+dispatcher.on("BUS_EVENT_TYPE_SETTLE_POSITION", engine.on_settle_position)
+dispatcher.on("BUS_EVENT_TYPE_MARKET_DATA", engine.on_market_data)
+
+
+def print_positions():
+    if args.party:
+        parties = [args.party]
+    else:
+        parties = sorted(engine.parties, key=lambda p: abs(engine.total_pnl(p)), reverse=True)[:args.top]
+    print(f"--- {len(engine.parties)} parties, {len(engine.markets)} markets")
+    for party_id in parties:
+        for p in engine.portfolio(party_id):
+            print(f"{p.party_id} {p.market_id}: volume={p.open_volume} entry={p.average_entry_price:.2f} "
+                  f"mark={p.mark_price} realised={p.realised_pnl:.0f} unrealised={p.unrealised_pnl:.0f}")
+
+
+# Events for all markets, so each party's portfolio covers all of them
+request = vac.api.trading.ObserveEventsRequest(type=dispatcher.types(), partyID=args.party)
+last_print = time.monotonic()
+for stream_resp in data_client.ObserveEventBus(request):
+    dispatcher.dispatch_all(stream_resp.events)
+    if time.monotonic() - last_print >= args.every:
+        print_positions()
+        last_print = time.monotonic()
+
+print("Stream disconnected.")
+print_positions()
@@ -0,0 +1,112 @@
+"""
+Decoding of GraphQL websocket frames.
+
+Keep-alive ("ka") and connection_ack frames are recognised by comparing the
+raw text, without parsing. Only other frames are parsed, with the fastest
+JSON backend installed (orjson, then ujson, then the standard library), or
+the one named in the JSON_BACKEND environment variable. Numeric fields,
+which GraphQL sends as strings (prices, volumes, timestamps), are converted
+to int once, here, so handlers do not each have to.
+
+    decoder = FrameDecoder()
+    msg_type, op_id, data = decoder.decode(message)
+"""
+
+import importlib
+import json
+import os
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+JSON_BACKENDS = ("orjson", "ujson", "json")
+
+# Fields of the market data subscription which are numbers sent as strings
+MARKET_DATA_INT_FIELDS = (
+    "timestamp",
+    "bestBidPrice",
+    "bestBidVolume",
+    "bestOfferPrice",
+    "bestOfferVolume",
+    "markPrice",
+    "midPrice",
+    "openInterest",
+)
+
+
+def _spellings(msg_type: str) -> frozenset:
+    # A control frame as sent by the node (JSON encoders there end frames
+    # with a newline) or by other servers
+    frames = ('{"type":"%s"}' % msg_type, '{"type": "%s"}' % msg_type)
+    return frozenset(frames + tuple(f + "\n" for f in frames))
+
+
+# Control frames, recognised without parsing
+KA_FRAMES = _spellings("ka")
+ACK_FRAMES = _spellings("connection_ack")
+
+Frame = Tuple[str, Optional[str], Optional[Dict[str, Any]]]
+
+
+def json_loads(backend: Optional[str] = None) -> Callable[[Any], Any]:
+    """The loads function of a JSON backend: the one given, the one in
+    JSON_BACKEND, or else the first of JSON_BACKENDS which is installed."""
+    backend = backend or os.getenv("JSON_BACKEND")
+    if backend:
+        return importlib.import_module(backend).loads
+    for name in JSON_BACKENDS:
+        try:
+            return importlib.import_module(name).loads
+        except ImportError:
+            continue
+    return json.loads
+
+
+def convert_ints(obj: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """Convert the given fields of obj, where present, to int in place."""
+    for field in fields:
+        value = obj.get(field)
+        if value.__class__ is str:
+            obj[field] = int(value)
+    return obj
+
+
+class FrameDecoder:
+    def __init__(
+        self,
+        loads: Optional[Callable[[Any], Any]] = None,
+        int_fields: Optional[Dict[str, Iterable[str]]] = None,
+    ):
+        """int_fields maps a field of the subscription data (such as
+        "marketData") to its fields to convert to int."""
+        self.loads = loads or json_loads()
+        if int_fields is None:
+            int_fields = {"marketData": MARKET_DATA_INT_FIELDS}
+        self.int_fields = {root: tuple(fields) for root, fields in int_fields.items()}
+
+    def decode(self, message: str) -> Frame:
+        """(type, operation id, data) of a frame. data is the converted
+        subscription data for "data" frames, else the payload, if any."""
+        if message in KA_FRAMES:
+            return "ka", None, None
+        if message in ACK_FRAMES:
+            return "connection_ack", None, None
+        msg = self.loads(message)
+        msg_type = msg.get("type")
+        payload = msg.get("payload")
+        if msg_type != "data":
+            return msg_type, msg.get("id"), payload
+        data = payload.get("data") if payload else None
+        if data:
+            self.convert(data)
+        return msg_type, msg.get("id"), data
+
+    def convert(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert numeric fields of subscription data (or of a REST
+        response in the same shape) to int, in place."""
+        for root, fields in self.int_fields.items():
+            obj = data.get(root)
+            if obj.__class__ is dict:
+                convert_ints(obj, fields)
+            elif obj.__class__ is list:
+                for item in obj:
+                    convert_ints(item, fields)
+        return data
@@ -11,75 +11,64 @@ Apps/Libraries:
 - GraphQL: websocket-client (https://pypi.org/project/websocket_client/)
 """
 
-import json
+import argparse
 import os
-import requests
-import websocket
 
 import helpers
+import metadata
+from subscriptions import Subscriptions
 
+parser = argparse.ArgumentParser(description="Stream market data over one websocket")
+parser.add_argument("-n", "--count", type=int, default=1, help="number of markets to stream")
+parser.add_argument("--all", action="store_true", help="stream all markets")
+parser.add_argument("--record", metavar="FILE", help="save the raw frames received, one per line")
+args = parser.parse_args()
 
-def on_message(ws, message: str):
-    print(message.strip())
+node_url_rest = os.getenv("NODE_URL_REST")
+if not helpers.check_url(node_url_rest):
+    print("Error: Invalid NODE_URL_REST.")
+    exit(1)
 
+# Get the Market IDs (from the cached list of markets)
+markets = metadata.registry(node_url_rest).markets()
+if not args.all:
+    markets = markets[:args.count]
+print(f"Got {len(markets)} market IDs")
 
-def on_error(ws, error):
-    print(str(error).strip())
+# Optional: enable websocket trace debugging
+# websocket.enableTrace(True)
 
+# Create a websocket client, with one subscription per market. Each
+# subscription has its own operation id, and its data is passed to the
+# handler for that market only. More subscriptions can be added with
+# subs.subscribe_market_data() and removed with subs.unsubscribe() while
+# the client is running. If the connection drops, the client reconnects
+# (with backoff), restarts the subscriptions, and fetches the current market
+# data over REST, so nothing stale is left on screen.
+node_url_wss = "{}/query".format(node_url_rest.replace("https://", "wss://"))
+recorder = None
+if args.record:
+    record_file = open(args.record, "a")
 
-def on_close(ws):
-    print("### closed ###")
+    def recorder(message):
+        record_file.write(message.strip() + "\n")
 
+subs = Subscriptions(node_url_wss, node_url_rest, recorder=recorder)
 
-def generate_on_open_function(marketID: str):
-    # Generate an on_open function which knows marketID
-    def on_open(ws):
-        msg = json.dumps({"type": "connection_init", "payload": {}})
-        ws.send(msg)
-        query = """subscription marketDataSub($marketId: String!)
-        {
-            marketData(marketId: $marketId) {
-                bestBidPrice
-            }
-        }"""
-        msg = json.dumps(
-            {
-                "id": "1",
-                "type": "start",
-                "payload": {
-                    "variables": {"marketId": marketID},
-                    "extensions": {},
-                    "operationName": "marketDataSub",
-                    "query": query,
-                },
-            }
-        )
-        ws.send(msg)
 
-    return on_open
+def market_data_handler(market_id: str):
+    # Generate a handler which knows the market it handles
+    def on_market_data(data, op_id):
+        print(f"{market_id}: bestBidPrice={data['marketData']['bestBidPrice']}")
 
+    return on_market_data
 
-node_url_rest = os.getenv("NODE_URL_REST")
-if not helpers.check_url(node_url_rest):
-    print("Error: Invalid NODE_URL_REST.")
-    exit(1)
 
-# Get a Market ID
-response = requests.get(f"{node_url_rest}/markets")
-helpers.check_response(response)
-marketID = response.json()["markets"][0]["id"]
-print(f"Got a market ID: {marketID}")
+def on_gap(market_id, last_timestamp, timestamp):
+    print(f"{market_id}: no market data for {(timestamp - last_timestamp) / 1e9:.1f}s")
 
-# Optional: enable websocket trace debugging
-# websocket.enableTrace(True)
 
-# Create and run a websocket client
-node_url_wss = "{}/query".format(node_url_rest.replace("https://", "wss://"))
-ws = websocket.WebSocketApp(
-    node_url_wss,
-    on_close=on_close,
-    on_error=on_error,
-    on_open=generate_on_open_function(marketID),
-    on_message=on_message,
-)
-ws.run_forever()
+for market in markets:
+    subs.subscribe_market_data(market["id"], market_data_handler(market["id"]), on_gap=on_gap, backfill=True)
+
+subs.run_forever()
@@ -0,0 +1,246 @@
+"""
+Many GraphQL subscriptions over one websocket.
+
+Each subscription gets its own operation id. Incoming "data" messages are
+routed to the handler of their operation id, and subscriptions can be added
+and removed at any time with subscribe() and unsubscribe(), which send
+"start" and "stop" messages on the open connection.
+
+If the connection drops, run_forever() reconnects with jittered exponential
+backoff and restarts all active subscriptions. Market data subscriptions can
+report gaps in the data (by its timestamps) and, after a reconnect, fetch a
+snapshot from the REST API so that handlers see the current state at once.
+
+Frames are decoded by a FrameDecoder (see decoding.py), so handlers get
+market data with prices, volumes and timestamps as ints.
+
+    subs = Subscriptions(node_url_wss, node_url_rest)
+    subs.subscribe_market_data(market_id, lambda data, op_id: print(data), backfill=True)
+    subs.run_forever()
+"""
+
+import itertools
+import json
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import websocket
+
+import helpers
+from decoding import FrameDecoder
+
+Handler = Callable[[Dict[str, Any], str], None]
+
+MARKET_DATA_SUBSCRIPTION = """subscription marketDataSub($marketId: String!)
+{
+    marketData(marketId: $marketId) {
+        market { id }
+        timestamp
+        bestBidPrice
+        bestBidVolume
+        bestOfferPrice
+        bestOfferVolume
+        markPrice
+    }
+}"""
+
+
+class Subscriptions:
+    def __init__(
+        self,
+        url: str,
+        node_url_rest: Optional[str] = None,
+        reconnect: bool = True,
+        backoff_initial: float = 0.5,
+        backoff_max: float = 30.0,
+        gap_threshold: float = 5.0,
+        decoder: Optional[FrameDecoder] = None,
+        recorder: Optional[Callable[[str], None]] = None,
+    ):
+        """node_url_rest is only needed for backfilling market data.
+        gap_threshold is in seconds. recorder, if given, is called with
+        every raw frame received."""
+        self.url = url
+        self.node_url_rest = node_url_rest
+        self.reconnect = reconnect
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.gap_threshold = int(gap_threshold * 1e9)
+        self.decoder = decoder or FrameDecoder()
+        self.recorder = recorder
+        # operation id -> (start payload, handler, lock held while it runs).
+        # Handlers are called from the websocket thread and, with backfill,
+        # from a backfill thread, so calls are serialized per subscription.
+        self._subs: Dict[str, Tuple[Dict[str, Any], Handler, threading.Lock]] = {}
+        # operation id -> market id, for market data to fetch after a reconnect
+        self._backfill: Dict[str, str] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._ws = None
+        self._ready = False
+        self._closing = False
+        self._connections = 0
+        self.reconnects = 0
+
+    def subscribe(
+        self,
+        query: str,
+        variables: Dict[str, Any],
+        handler: Handler,
+        operation_name: Optional[str] = None,
+    ) -> str:
+        """Start a subscription; handler(data, op_id) gets each result.
+        Returns the operation id, for unsubscribe()."""
+        payload = {
+            "variables": variables,
+            "extensions": {},
+            "operationName": operation_name,
+            "query": query,
+        }
+        with self._lock:
+            op_id = str(next(self._ids))
+            self._subs[op_id] = (payload, handler, threading.Lock())
+            if self._ready:
+                self._send({"id": op_id, "type": "start", "payload": payload})
+        return op_id
+
+    def subscribe_market_data(
+        self,
+        market_id: str,
+        handler: Handler,
+        on_gap: Optional[Callable[[str, int, int], None]] = None,
+        backfill: bool = False,
+    ) -> str:
+        """Subscribe to market data for a market.
+
+        on_gap(market_id, last_timestamp, timestamp) is called when
+        consecutive updates are more than gap_threshold apart, e.g. after a
+        reconnect. With backfill, the market data is fetched from
+        /markets-data/{marketID} after a reconnect and passed to handler
+        (in the same shape as subscription data)."""
+        last = [None]
+
+        def on_market_data(data: Dict[str, Any], op_id: str) -> None:
+            timestamp = data["marketData"]["timestamp"]
+            if last[0] is not None:
+                if on_gap is not None and timestamp - last[0] > self.gap_threshold:
+                    on_gap(market_id, last[0], timestamp)
+                if timestamp < last[0]:
+                    return  # Older than a snapshot already handled
+            last[0] = timestamp
+            handler(data, op_id)
+
+        op_id = self.subscribe(MARKET_DATA_SUBSCRIPTION, {"marketId": market_id}, on_market_data, "marketDataSub")
+        if backfill:
+            with self._lock:
+                self._backfill[op_id] = market_id
+        return op_id
+
+    def unsubscribe(self, op_id: str) -> None:
+        with self._lock:
+            self._backfill.pop(op_id, None)
+            if self._subs.pop(op_id, None) is not None and self._ready:
+                self._send({"id": op_id, "type": "stop"})
+
+    def active(self) -> Dict[str, Dict[str, Any]]:
+        """Operation id -> variables, for all active subscriptions."""
+        with self._lock:
+            return {op_id: payload["variables"] for op_id, (payload, _, _) in self._subs.items()}
+
+    def run_forever(self, **kwargs: Any) -> None:
+        """Connect and handle messages until close() is called or the server
+        has completed every subscription (or, without reconnect, until the
+        connection drops)."""
+        attempt = 0
+        while not self._closing:
+            connections = self._connections
+            # Callbacks are wrapped in plain functions, because websocket-client
+            # 0.57 does not pass the websocket to bound methods
+            self._ws = websocket.WebSocketApp(
+                self.url,
+                on_open=lambda ws, *args: self._on_open(ws, *args),
+                on_message=lambda ws, *args: self._on_message(ws, *args),
+                on_error=lambda ws, *args: self._on_error(ws, *args),
+                on_close=lambda ws, *args: self._on_close(ws, *args),
+            )
+            self._ws.run_forever(**kwargs)
+            if self._closing or not self.reconnect:
+                break
+            # Back off less after a connection which was established
+            attempt = 0 if self._connections > connections else attempt + 1
+            delay = min(self.backoff_max, self.backoff_initial * 2 ** attempt)
+            delay *= random.uniform(0.5, 1.0)
+            print(f"Reconnecting in {delay:.1f}s")
+            time.sleep(delay)
+            self.reconnects += 1
+
+    def close(self) -> None:
+        self._closing = True
+        if self._ws is not None:
+            self._ws.close()
+
+    def _send(self, msg: Dict[str, Any]) -> None:
+        self._ws.send(json.dumps(msg))
+
+    def _on_open(self, ws) -> None:
+        ws.send(json.dumps({"type": "connection_init", "payload": {}}))
+
+    def _on_message(self, ws, message: str) -> None:
+        if self.recorder is not None:
+            self.recorder(message)
+        msg_type, op_id, data = self.decoder.decode(message)
+        if msg_type == "data":
+            self._deliver(op_id, data)
+        elif msg_type == "connection_ack":
+            # (Re)start every active subscription on this connection
+            with self._lock:
+                self._ready = True
+                self._connections += 1
+                for op_id, (payload, _, _) in self._subs.items():
+                    self._send({"id": op_id, "type": "start", "payload": payload})
+                backfill = dict(self._backfill) if self._connections > 1 else {}
+            if backfill:
+                threading.Thread(target=self._run_backfill, args=(backfill,), daemon=True).start()
+        elif msg_type == "complete":
+            # The server ended the subscription: stop once none are left
+            with self._lock:
+                self._backfill.pop(op_id, None)
+                self._subs.pop(op_id, None)
+                done = not self._subs
+            if done:
+                self.close()
+        elif msg_type in ("error", "connection_error"):
+            print(f"Subscription {op_id} error: {data}")
+
+    def _on_error(self, ws, error) -> None:
+        print(str(error).strip())
+
+    def _run_backfill(self, backfill: Dict[str, str]) -> None:
+        s = helpers.session()
+        for op_id, market_id in backfill.items():
+            response = s.get(f"{self.node_url_rest}/markets-data/{market_id}")
+            if response.status_code != 200:
+                print(f"Backfill for market {market_id} failed: HTTP {response.status_code}")
+                continue
+            market_data = response.json()["marketData"]
+            # REST has the market id where GraphQL has a market object
+            market_data["market"] = {"id": market_data["market"]}
+            data = self.decoder.convert({"marketData": market_data})
+            self._deliver(op_id, data)
+
+    def _deliver(self, op_id: str, data: Dict[str, Any]) -> None:
+        """Call the handler of op_id (if still subscribed) with data, never
+        at the same time as another call for the same subscription."""
+        with self._lock:
+            sub = self._subs.get(op_id)
+        if sub is not None:
+            _, handler, handler_lock = sub
+            with handler_lock:
+                handler(data, op_id)
+
+    def _on_close(self, ws, *args) -> None:
+        with self._lock:
+            self._ready = False
+        print("### closed ###")
@@ -0,0 +1,131 @@
+"""
+OHLCV candles, built incrementally from the TradesSubscribe stream.
+
+Each trade updates the open candle of every interval for its market in O(1):
+high/low/close, volume, and the notional (price * size) from which VWAP is
+derived. A candle is closed, and passed to the sink, when a trade for a later
+interval arrives, or when advance() is called with a time past its end (see
+run_clock()). No candle is emitted for an interval without trades.
+
+    builder = CandleBuilder(sink=print)
+    for stream_resp in data_client.TradesSubscribe(request):
+        builder.on_trades(stream_resp.trades)
+"""
+
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Interval name -> length in nanoseconds (trade timestamps are in ns)
+SECOND = 1000000000
+INTERVALS = {
+    "1s": SECOND,
+    "1m": 60 * SECOND,
+    "5m": 300 * SECOND,
+    "1h": 3600 * SECOND,
+}
+
+
+class Candle:
+    __slots__ = ("market_id", "interval", "start", "open", "high", "low", "close", "volume", "notional", "trades")
+
+    def __init__(self, market_id: str, interval: str, start: int, price: int):
+        self.market_id = market_id
+        self.interval = interval
+        self.start = start
+        self.open = self.high = self.low = self.close = price
+        self.volume = 0
+        self.notional = 0
+        self.trades = 0
+
+    @property
+    def vwap(self) -> Optional[float]:
+        return self.notional / self.volume if self.volume else None
+
+    def __repr__(self) -> str:
+        return (
+            f"Candle({self.market_id} {self.interval} start={self.start} "
+            f"O={self.open} H={self.high} L={self.low} C={self.close} "
+            f"V={self.volume} VWAP={self.vwap})"
+        )
+
+
+class CandleBuilder:
+    def __init__(self, sink: Callable[[Candle], None], intervals: Iterable[str] = tuple(INTERVALS)):
+        """sink is called with each closed candle."""
+        self.sink = sink
+        self.intervals: List[Tuple[str, int]] = [(name, INTERVALS[name]) for name in intervals]
+        # (market id, interval name) -> open candle
+        self._open: Dict[Tuple[str, str], Candle] = {}
+        # (market id, interval name) -> start of the last candle closed by advance()
+        self._closed: Dict[Tuple[str, str], int] = {}
+        # Trades and the clock (see run_clock) may come from different threads
+        self._lock = threading.Lock()
+
+    def add(self, market_id: str, timestamp: int, price: int, size: int) -> None:
+        """Add a trade (timestamp in ns)."""
+        with self._lock:
+            self._add(market_id, timestamp, price, size)
+
+    def _add(self, market_id: str, timestamp: int, price: int, size: int) -> None:
+        open_candles = self._open
+        for name, length in self.intervals:
+            start = timestamp - timestamp % length
+            key = (market_id, name)
+            candle = open_candles.get(key)
+            if candle is None:
+                if start <= self._closed.get(key, -1):
+                    continue  # Late trade for an interval already closed
+                candle = open_candles[key] = Candle(market_id, name, start, price)
+            elif start > candle.start:
+                self.sink(candle)
+                candle = open_candles[key] = Candle(market_id, name, start, price)
+            elif start < candle.start:
+                continue
+            if price > candle.high:
+                candle.high = price
+            elif price < candle.low:
+                candle.low = price
+            candle.close = price
+            candle.volume += size
+            candle.notional += price * size
+            candle.trades += 1
+
+    def on_trade(self, trade: Any) -> None:
+        """Add a vega.Trade, as received from TradesSubscribe."""
+        self.add(trade.marketID, trade.timestamp, trade.price, trade.size)
+
+    def on_trades(self, trades: Iterable[Any]) -> None:
+        for trade in trades:
+            self.on_trade(trade)
+
+    def advance(self, timestamp: int) -> None:
+        """Close all candles which end at or before timestamp (ns), e.g. on
+        a timer, so quiet markets still emit their last candle."""
+        with self._lock:
+            for key, candle in list(self._open.items()):
+                if candle.start + INTERVALS[candle.interval] <= timestamp:
+                    del self._open[key]
+                    self._closed[key] = candle.start
+                    self.sink(candle)
+
+    def run_clock(self, now: Callable[[], int], stop: threading.Event, delay: int = SECOND) -> None:
+        """Call advance() at every boundary of the shortest interval until
+        stop is set, e.g. on its own thread, so that candles are closed on
+        time even when no trades arrive. now() is the current time in ns, on
+        the node's clock; candles are closed delay ns after they end, so
+        that trades from the last block can still arrive."""
+        shortest = min(length for _, length in self.intervals)
+        while not stop.wait((shortest - (now() - delay) % shortest) / 1e9):
+            self.advance(now() - delay)
+
+    def open_candles(self) -> List[Candle]:
+        """The candles still open, in no particular order."""
+        with self._lock:
+            return list(self._open.values())
+
+    def flush(self) -> None:
+        """Close all open candles, e.g. at the end of the stream."""
+        with self._lock:
+            candles, self._open = self._open, {}
+            for candle in candles.values():
+                self.sink(candle)
@@ -0,0 +1,157 @@
+"""
+A level-3 (order by order) book for one market, kept up to date from the
+OrdersSubscribe stream.
+
+Each side maps price to a PriceLevel, which holds the orders at that price
+in time priority. A heap of prices per side gives the best price: inserting
+a new level is O(log n), an emptied level is dropped lazily from the heap,
+best bid/ask is a peek at the top of the heap, and the top n levels are
+read from the top of the heap in O(n log n).
+
+The book is not thread-safe; feed it and read it from the same thread.
+"""
+
+import heapq
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Values of the vega.Side and vega.Order.Status protobuf enums
+SIDE_BUY = 1
+SIDE_SELL = 2
+STATUS_ACTIVE = 1
+# vega.Order.Type.TYPE_LIMIT
+TYPE_LIMIT = 1
+
+
+class PriceLevel:
+    __slots__ = ("price", "orders", "volume")
+
+    def __init__(self, price: int):
+        self.price = price
+        # order id -> remaining size, in time priority (dicts keep insertion order)
+        self.orders: Dict[str, int] = {}
+        self.volume = 0
+
+
+class BookSide:
+    def __init__(self, is_bid: bool):
+        self.is_bid = is_bid
+        self.levels: Dict[int, PriceLevel] = {}
+        self._heap: List[int] = []
+        self._in_heap = set()
+
+    def best(self) -> Optional[PriceLevel]:
+        heap = self._heap
+        while heap:
+            key = heap[0]
+            level = self.levels.get(-key if self.is_bid else key)
+            if level is not None:
+                return level
+            heapq.heappop(heap)
+            self._in_heap.discard(key)
+        return None
+
+    def add(self, order_id: str, price: int, remaining: int) -> None:
+        level = self.levels.get(price)
+        if level is None:
+            level = self.levels[price] = PriceLevel(price)
+            key = -price if self.is_bid else price
+            if key not in self._in_heap:
+                heapq.heappush(self._heap, key)
+                self._in_heap.add(key)
+        level.orders[order_id] = remaining
+        level.volume += remaining
+
+    def remove(self, order_id: str, price: int) -> None:
+        level = self.levels[price]
+        level.volume -= level.orders.pop(order_id)
+        if not level.orders:
+            # Left in the heap, and skipped by best() when it gets to the top
+            del self.levels[price]
+
+    def depth(self, n: int) -> List[PriceLevel]:
+        """The best n levels, best first.
+
+        Walks the heap from the top, always expanding the best entry seen so
+        far, so only about n entries (plus any emptied levels) are visited
+        instead of every level of the side."""
+        heap = self._heap
+        levels = []
+        candidates = [(heap[0], 0)] if heap else []
+        while candidates and len(levels) < n:
+            key, i = heapq.heappop(candidates)
+            level = self.levels.get(-key if self.is_bid else key)
+            if level is not None:
+                levels.append(level)
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(candidates, (heap[child], child))
+        return levels
+
+
+class OrderBook:
+    def __init__(self, market_id: str):
+        self.market_id = market_id
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+        # order id -> (side, price, remaining, updatedAt)
+        self._orders: Dict[str, Tuple[int, int, int, int]] = {}
+
+    def apply(self, order_id: str, side: int, price: int, remaining: int, on_book: bool, updated_at: int = 0) -> None:
+        """Apply the latest state of an order.
+
+        An order keeps its place in the queue if only its remaining size
+        went down (a partial fill or a size reduction). A new price or a
+        bigger size sends it to the back of the queue at its price."""
+        known = self._orders.get(order_id)
+        if known is not None:
+            k_side, k_price, k_remaining, k_updated = known
+            if updated_at and updated_at < k_updated:
+                return  # Older than what the book has already seen
+            book_side = self.bids if k_side == SIDE_BUY else self.asks
+            if on_book and k_side == side and k_price == price and remaining <= k_remaining:
+                level = book_side.levels[price]
+                level.orders[order_id] = remaining
+                level.volume -= k_remaining - remaining
+                self._orders[order_id] = (side, price, remaining, updated_at)
+                return
+            book_side.remove(order_id, k_price)
+            del self._orders[order_id]
+        if on_book:
+            (self.bids if side == SIDE_BUY else self.asks).add(order_id, price, remaining)
+            self._orders[order_id] = (side, price, remaining, updated_at)
+
+    def on_order(self, order: Any) -> None:
+        """Apply a vega.Order, as received from OrdersSubscribe/OrdersByMarket."""
+        if order.marketID != self.market_id:
+            return
+        on_book = order.status == STATUS_ACTIVE and order.type == TYPE_LIMIT and order.remaining > 0
+        self.apply(order.id, order.side, order.price, order.remaining, on_book, order.updatedAt or order.createdAt)
+
+    def on_orders(self, orders: Iterable[Any]) -> None:
+        for order in orders:
+            self.on_order(order)
+
+    def best_bid(self) -> Optional[Tuple[int, int]]:
+        """(price, volume) of the best bid, or None."""
+        level = self.bids.best()
+        return (level.price, level.volume) if level is not None else None
+
+    def best_ask(self) -> Optional[Tuple[int, int]]:
+        """(price, volume) of the best ask, or None."""
+        level = self.asks.best()
+        return (level.price, level.volume) if level is not None else None
+
+    def depth(self, n: int = 10) -> Dict[str, List[Tuple[int, int, int]]]:
+        """Snapshot of the top n levels per side as (price, volume, orders)."""
+        return {
+            "bids": [(lvl.price, lvl.volume, len(lvl.orders)) for lvl in self.bids.depth(n)],
+            "asks": [(lvl.price, lvl.volume, len(lvl.orders)) for lvl in self.asks.depth(n)],
+        }
+
+    def queue(self, side: int, price: int) -> List[Tuple[str, int]]:
+        """Orders at a price as (order id, remaining), first in line first."""
+        level = (self.bids if side == SIDE_BUY else self.asks).levels.get(price)
+        return list(level.orders.items()) if level is not None else []
+
+    def __len__(self) -> int:
+        return len(self._orders)
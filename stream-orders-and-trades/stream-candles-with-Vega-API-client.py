@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+
+"""
+Script language: Python3
+
+Talks to:
+- Vega node (gRPC)
+
+Apps/Libraries:
+- gRPC (node): Vega-API-client (https://pypi.org/project/Vega-API-client/)
+"""
+
+# Note: this file uses smart-tags in comments to section parts of the code to
+# show them as snippets in our documentation. They are not necessary to be
+# included when creating your own custom code.
+#
+# Example of smart-tags:
+#  __something:
+# some code here
+# :something__
+
+import os
+import signal
+import sys
+import threading
+import time
+
+from google.protobuf.empty_pb2 import Empty
+# __import_client:
+import vegaapiclient as vac
+# :import_client__
+
+from candles import CandleBuilder
+from streampump import StreamPump
+
+node_url_grpc = os.getenv("NODE_URL_GRPC")
+
+# Candle intervals to build, from candles.INTERVALS
+INTERVALS = ["1s", "1m", "5m", "1h"]
+
+pump = None
+stop_requested = threading.Event()
+
+def signal_handler(sig, frame):
+    print('Exit requested.')
+    if pump is None:
+        sys.exit(0)
+    # The pump's worker may be inside the builder: stop the stream here, and
+    # let the main thread flush the open candles once the pump has stopped
+    stop_requested.set()
+    pump.stop()
+
+signal.signal(signal.SIGINT, signal_handler)
+
+# __create_client:
+# Create a Vega gRPC data client
+data_client = vac.VegaTradingDataClient(node_url_grpc)
+# :create_client__
+
+# __find_market:
+# Get a list of markets, and select the first market returned
+markets = data_client.Markets(Empty()).markets
+market_id = markets[0].id
+# :find_market__
+
+# __stream_candles:
+# Build candles from the Trades stream as trades arrive, instead of fetching
+# all trades of the market and recomputing. Each closed candle is passed to
+# the sink, which here prints it.
+def print_candle(candle):
+    print(candle)
+
+builder = CandleBuilder(print_candle, INTERVALS)
+
+subscribe_request = vac.api.trading.TradesSubscribeRequest(marketID=market_id)
+pump = StreamPump(
+    data_client.TradesSubscribe(subscribe_request),
+    builder.on_trade,
+    items=lambda stream_resp: stream_resp.trades,
+)
+
+# Close each candle on time, even if no trade arrives after it (e.g. on a
+# quiet market), on the node's clock
+offset = data_client.GetVegaTime(Empty()).timestamp - time.time_ns()
+stream_ended = threading.Event()
+clock = threading.Thread(
+    target=builder.run_clock, args=(lambda: time.time_ns() + offset, stream_ended), daemon=True
+)
+clock.start()
+
+pump.start()
+pump.join()
+# :stream_candles__
+
+stream_ended.set()
+clock.join()
+
+if not stop_requested.is_set():
+    print("Stream disconnected.")
+# Print the candles which are still open
+builder.flush()
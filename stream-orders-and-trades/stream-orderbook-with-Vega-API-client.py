@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+
+"""
+Script language: Python3
+
+Talks to:
+- Vega node (gRPC)
+
+Apps/Libraries:
+- gRPC (node): Vega-API-client (https://pypi.org/project/Vega-API-client/)
+"""
+
+# Note: this file uses smart-tags in comments to section parts of the code to
+# show them as snippets in our documentation. They are not necessary to be
+# included when creating your own custom code.
+#
+# Example of smart-tags:
+#  __something:
+# some code here
+# :something__
+
+import os
+import signal
+import sys
+
+from google.protobuf.empty_pb2 import Empty
+# __import_client:
+import vegaapiclient as vac
+# :import_client__
+
+from orderbook import OrderBook
+
+node_url_grpc = os.getenv("NODE_URL_GRPC")
+
+# Number of price levels per side to print
+DEPTH = 5
+
+def signal_handler(sig, frame):
+    print('Exit requested.')
+    sys.exit(0)
+
+signal.signal(signal.SIGINT, signal_handler)
+
+# __create_client:
+# Create a Vega gRPC data client
+data_client = vac.VegaTradingDataClient(node_url_grpc)
+# :create_client__
+
+# __find_market:
+# Get a list of markets, and select the first market returned
+markets = data_client.Markets(Empty()).markets
+market_id = markets[0].id
+# :find_market__
+
+# __stream_orderbook:
+# Subscribe to the Orders stream first, so that no update is missed while the
+# current orders are fetched, then load the current orders into the book.
+book = OrderBook(market_id)
+subscribe_request = vac.api.trading.OrdersSubscribeRequest(marketID=market_id)
+stream = data_client.OrdersSubscribe(subscribe_request)
+orders_by_market_request = vac.api.trading.OrdersByMarketRequest(marketID=market_id)
+book.on_orders(data_client.OrdersByMarket(orders_by_market_request).orders)
+
+# Apply each batch of order updates, then print the top of the book
+for stream_resp in stream:
+    book.on_orders(stream_resp.orders)
+    depth = book.depth(DEPTH)
+    print(f"Market {market_id}: {len(book)} orders on the book")
+    for price, volume, count in reversed(depth["asks"]):
+        print(f"  ask {price:>12} {volume:>12} ({count})")
+    for price, volume, count in depth["bids"]:
+        print(f"  bid {price:>12} {volume:>12} ({count})")
+# :stream_orderbook__
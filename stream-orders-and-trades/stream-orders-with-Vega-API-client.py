@@ -28,10 +28,24 @@ from google.protobuf.empty_pb2 import Empty
 import vegaapiclient as vac
 # :import_client__
 
+from streampump import StreamPump
+
 node_url_grpc = os.getenv("NODE_URL_GRPC")
 
+# Orders are read from the stream on their own thread into a bounded buffer,
+# so a slow handler does not stall the stream. When the buffer is full:
+# "block" waits for the handler, "drop-oldest" discards the oldest update,
+# "conflate" keeps only the latest update of each order that is waiting.
+BUFFER_SIZE = 10000
+OVERFLOW_POLICY = "conflate"
+
+pump = None
+
 def signal_handler(sig, frame):
     print('Exit requested.')
+    if pump is not None:
+        pump.stop()
+        print(f"Stream buffer: {pump.stats()}")
     sys.exit(0)
 
 signal.signal(signal.SIGINT, signal_handler)
@@ -52,9 +66,22 @@ market_id = markets[0].id
 # Optional: Market identifier - filter by market
 #            Party identifier - filter by party
 # By default, all orders on all markets for all parties will be returned on the stream.
+def handle_order(order):
+    # All orders arriving over the channel/stream will be printed
+    print(order)
+
 subscribe_request = vac.api.trading.OrdersSubscribeRequest(marketID=market_id)
-for stream_resp in data_client.OrdersSubscribe(subscribe_request):
-    for order in stream_resp.orders:
-        # All orders arriving over the channel/stream will be printed
-        print(order)
+pump = StreamPump(
+    data_client.OrdersSubscribe(subscribe_request),
+    handle_order,
+    items=lambda stream_resp: stream_resp.orders,
+    maxsize=BUFFER_SIZE,
+    policy=OVERFLOW_POLICY,
+    key=lambda order: order.id,
+)
+pump.start()
+pump.join()
 # :stream_orders__
+
+print("Stream disconnected.")
+print(f"Stream buffer: {pump.stats()}")
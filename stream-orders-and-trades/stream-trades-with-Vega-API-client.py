@@ -28,10 +28,23 @@ from google.protobuf.empty_pb2 import Empty
 import vegaapiclient as vac
 # :import_client__
 
+from streampump import StreamPump
+
 node_url_grpc = os.getenv("NODE_URL_GRPC")
 
+# Trades are read from the stream on their own thread into a bounded buffer,
+# so a slow handler does not stall the stream. When the buffer is full:
+# "block" waits for the handler, "drop-oldest" discards the oldest trade.
+BUFFER_SIZE = 10000
+OVERFLOW_POLICY = "block"
+
+pump = None
+
 def signal_handler(sig, frame):
     print('Exit requested.')
+    if pump is not None:
+        pump.stop()
+        print(f"Stream buffer: {pump.stats()}")
     sys.exit(0)
 
 signal.signal(signal.SIGINT, signal_handler)
@@ -52,11 +65,23 @@ market_id = markets[0].id
 # Optional: Market identifier - filter by market
 #            Party identifier - filter by party
 # By default, all trades on all markets for all parties will be returned on the stream.
+def handle_trade(trade):
+    # All trades arriving over the channel/stream will be printed
+    print(trade)
+
 subscribe_request = vac.api.trading.TradesSubscribeRequest(marketID=market_id)
-for stream_resp in data_client.TradesSubscribe(subscribe_request):
-    for trade in stream_resp.trades:
-        # All trades arriving over the channel/stream will be printed
-        print(trade)
+pump = StreamPump(
+    data_client.TradesSubscribe(subscribe_request),
+    handle_trade,
+    items=lambda stream_resp: stream_resp.trades,
+    maxsize=BUFFER_SIZE,
+    policy=OVERFLOW_POLICY,
+)
+pump.start()
+pump.join()
 # :stream_trades__
 
+print("Stream disconnected.")
+print(f"Stream buffer: {pump.stats()}")
+
 
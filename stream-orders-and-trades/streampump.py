@@ -0,0 +1,188 @@
+"""
+Buffering between a gRPC stream and its handlers.
+
+Reading a stream on its own thread into a bounded buffer means that a slow
+handler does not stop the stream being read, and the overflow policy
+decides what happens when handlers fall behind.
+"""
+
+import collections
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+class StreamBuffer:
+    """A bounded queue between a stream reader and its consumers.
+
+    What happens when the buffer is full depends on the policy:
+    - "block": the reader waits for consumers (the node may eventually drop
+      a stream which is not read).
+    - "drop-oldest": the oldest item is discarded to make room.
+    - "conflate": items are keyed by key(item), and a new item replaces a
+      queued item with the same key, keeping its place in the queue (e.g.
+      only the latest state of each order). If the buffer is full of
+      distinct keys the reader waits.
+    """
+
+    POLICIES = ("block", "drop-oldest", "conflate")
+
+    def __init__(self, maxsize: int = 10000, policy: str = "block", key: Callable[[Any], Any] = None):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown overflow policy {policy!r}, use one of {self.POLICIES}")
+        if policy == "conflate" and key is None:
+            raise ValueError("The conflate policy needs a key function")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.key = key
+        self._items = collections.OrderedDict() if policy == "conflate" else collections.deque()
+        self._seq = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.received = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.max_depth = 0
+
+    def put(self, item: Any) -> None:
+        """Queue item. Once the buffer is closed, items are dropped (and
+        counted as such), as consumers may already have stopped."""
+        with self._cond:
+            self.received += 1
+            if self._closed:
+                self.dropped += 1
+                return
+            if self.policy == "conflate":
+                k = self.key(item)
+                if k in self._items:
+                    self._items[k] = item
+                    self.conflated += 1
+                    return
+                while len(self._items) >= self.maxsize and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    self.dropped += 1
+                    return
+                self._items[k] = item
+            elif self.policy == "drop-oldest":
+                if len(self._items) >= self.maxsize:
+                    self._items.popleft()
+                    self.dropped += 1
+                self._items.append(item)
+            else:
+                while len(self._items) >= self.maxsize and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    self.dropped += 1
+                    return
+                self._items.append(item)
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._cond.notify_all()
+
+    def get(self) -> Any:
+        """Next item, or StopIteration once closed and drained."""
+        with self._cond:
+            while not self._items:
+                if self._closed:
+                    raise StopIteration
+                self._cond.wait()
+            if self.policy == "conflate":
+                _, item = self._items.popitem(last=False)
+            else:
+                item = self._items.popleft()
+            self._cond.notify_all()
+            return item
+
+    def close(self) -> None:
+        """No more items will be put; consumers stop once it is drained."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "depth": len(self._items),
+                "max_depth": self.max_depth,
+                "received": self.received,
+                "dropped": self.dropped,
+                "conflated": self.conflated,
+            }
+
+
+class StreamPump:
+    """Drain a (gRPC) stream on a reader thread into a StreamBuffer, and
+    call handler(item) for each item on consumer thread(s).
+
+    items(response) picks the items out of each stream response, e.g.
+    lambda resp: resp.trades. With more than one worker, items may be
+    handled out of order.
+    """
+
+    def __init__(
+        self,
+        stream: Iterable,
+        handler: Callable[[Any], None],
+        items: Callable[[Any], Iterable] = lambda resp: (resp,),
+        maxsize: int = 10000,
+        policy: str = "block",
+        key: Callable[[Any], Any] = None,
+        workers: int = 1,
+    ):
+        self.stream = stream
+        self.handler = handler
+        self.items = items
+        self.buffer = StreamBuffer(maxsize, policy, key)
+        self.error = None
+        self.handler_errors = 0
+        self._threads = [threading.Thread(target=self._read, daemon=True)]
+        self._threads += [threading.Thread(target=self._consume, daemon=True) for _ in range(workers)]
+
+    def start(self) -> "StreamPump":
+        for t in self._threads:
+            t.start()
+        return self
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Wait until the stream has ended and all items have been handled."""
+        for t in self._threads:
+            t.join(timeout)
+
+    def stop(self) -> None:
+        if hasattr(self.stream, "cancel"):
+            self.stream.cancel()
+        self.buffer.close()
+
+    def stats(self) -> Dict[str, int]:
+        with self.buffer._cond:
+            return dict(self.buffer.stats(), handler_errors=self.handler_errors)
+
+    def _read(self) -> None:
+        put = self.buffer.put
+        try:
+            for resp in self.stream:
+                for item in self.items(resp):
+                    put(item)
+        except Exception as e:
+            # Cancelled or disconnected
+            self.error = e
+        finally:
+            self.buffer.close()
+
+    def _consume(self) -> None:
+        get = self.buffer.get
+        handler = self.handler
+        while True:
+            try:
+                item = get()
+            except StopIteration:
+                return
+            try:
+                handler(item)
+            except Exception as e:
+                # Workers fail concurrently: count under the buffer's lock
+                with self.buffer._cond:
+                    self.handler_errors += 1
+                print(f"Stream handler failed: {e!r}")
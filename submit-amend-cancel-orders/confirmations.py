@@ -0,0 +1,251 @@
+"""
+Wait for orders to be processed by Vega, driven by the party's order stream.
+
+A waiter subscribes once to the orders stream for a party. Call expect() with
+an order reference *before* signing/propagating the transaction, then wait()
+for the order to come back. The stream update resolves the wait as soon as
+the order appears in a block; asking the node directly is only a fallback
+for when the stream is unavailable or silent.
+
+- OrderWaiter: GraphQL subscription, REST polling fallback
+- StreamOrderWaiter: gRPC OrdersSubscribe stream (Vega-API-client)
+"""
+
+import json
+import re
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+from typing import Any, Dict, Iterable, Optional
+
+import requests
+import websocket
+
+ORDERS_SUBSCRIPTION = """subscription ordersSub($partyId: ID)
+{
+    orders(partyId: $partyId) {
+        id
+        reference
+        status
+        price
+        size
+        remaining
+        timeInForce
+        updatedAt
+    }
+}"""
+
+# Fields which change when an order is filled, amended or cancelled
+_ORDER_FIELDS = ("status", "price", "size", "remaining", "timeInForce")
+
+
+def _rest_order(order: Dict[str, Any]) -> Dict[str, Any]:
+    """An order from the GraphQL stream, with the enum values the REST API
+    uses (e.g. "PartiallyFilled" -> "STATUS_PARTIALLY_FILLED", "GTC" ->
+    "TIF_GTC")."""
+    order = dict(order)
+    if order.get("status"):
+        order["status"] = "STATUS_" + re.sub(r"(?<!^)(?=[A-Z])", "_", order["status"]).upper()
+    if order.get("timeInForce"):
+        order["timeInForce"] = "TIF_" + order["timeInForce"]
+    return order
+
+
+def _changed(order: Dict[str, Any], previous: Optional[Dict[str, Any]]) -> bool:
+    return previous is None or any(order.get(f) != previous.get(f) for f in _ORDER_FIELDS)
+
+
+class _Waiters:
+    """Futures keyed by order reference, resolved by a stream thread."""
+
+    def __init__(self):
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def expect(self, reference: str) -> Future:
+        """Register interest in the next update for an order reference."""
+        fut = Future()
+        with self._lock:
+            self._futures[reference] = fut
+        return fut
+
+    def _get(self, reference: str) -> Future:
+        with self._lock:
+            fut = self._futures.get(reference)
+        return fut if fut is not None else self.expect(reference)
+
+    def _next(self, reference: str, seen: Future) -> Future:
+        # The future for the update after the one seen resolved with
+        with self._lock:
+            fut = self._futures.get(reference)
+            if fut is None or fut is seen:
+                fut = self._futures[reference] = Future()
+            return fut
+
+    def _forget(self, reference: str) -> None:
+        with self._lock:
+            self._futures.pop(reference, None)
+
+    def _resolve(self, reference: str, order: Any) -> None:
+        with self._lock:
+            fut = self._futures.get(reference)
+            if fut is None:
+                return
+            if fut.done():
+                # Not waited for yet: keep the latest update
+                fut = self._futures[reference] = Future()
+            fut.set_result(order)
+
+
+class OrderWaiter(_Waiters):
+    def __init__(
+        self,
+        node_url_rest: str,
+        party_id: str,
+        session: requests.Session,
+        poll_interval: float = 0.5,
+        stream_timeout: float = 10.0,
+    ):
+        super().__init__()
+        self.node_url_rest = node_url_rest
+        self.party_id = party_id
+        self.session = session
+        self.poll_interval = poll_interval
+        self.stream_timeout = stream_timeout
+        self._connected = threading.Event()
+        self._failed = threading.Event()
+        self._state = threading.Condition()
+        self._ws = None
+
+    def start(self, connect_timeout: float = 5.0) -> bool:
+        """Open the order stream. Returns False, as soon as the connection
+        fails or after connect_timeout seconds, if it could not connect, in
+        which case wait() falls back to polling."""
+        url = "{}/query".format(self.node_url_rest.replace("https://", "wss://"))
+        # Callbacks are wrapped in plain functions, because websocket-client
+        # 0.57 does not pass the websocket to bound methods
+        self._ws = websocket.WebSocketApp(
+            url,
+            on_open=lambda ws, *args: self._on_open(ws, *args),
+            on_message=lambda ws, *args: self._on_message(ws, *args),
+            on_close=lambda ws, *args: self._on_close(ws, *args),
+            on_error=lambda ws, *args: self._on_close(ws, *args),
+        )
+        threading.Thread(target=self._ws.run_forever, daemon=True).start()
+        with self._state:
+            self._state.wait_for(
+                lambda: self._connected.is_set() or self._failed.is_set(), connect_timeout)
+        return self._connected.is_set()
+
+    def stop(self) -> None:
+        if self._ws is not None:
+            self._ws.close()
+
+    def wait(self, reference: str, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Wait until an order is first seen, or until its status, price,
+        size, remaining or time in force differ from previous (the order as
+        last returned), and return it.
+
+        The order comes from the stream, with REST enum values and only the
+        fields of ORDERS_SUBSCRIPTION. The node is only asked (GET
+        /orders/{reference}, every poll_interval seconds) if the stream
+        disconnects or stays silent for stream_timeout seconds."""
+        try:
+            fut = self._get(reference)
+            deadline = time.monotonic() + self.stream_timeout
+            while self._connected.is_set():
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    break
+                try:
+                    # Wake up now and then to notice a disconnect
+                    order = fut.result(timeout=min(left, self.poll_interval))
+                except TimeoutError:
+                    continue
+                if _changed(order, previous):
+                    return order
+                fut = self._next(reference, fut)
+
+            url = f"{self.node_url_rest}/orders/{reference}"
+            while True:
+                response = self.session.get(url)
+                if response.status_code == 200:
+                    order = response.json()["order"]
+                    if _changed(order, previous):
+                        return order
+                print(".", end="", flush=True)
+                time.sleep(self.poll_interval)
+        finally:
+            self._forget(reference)
+
+    def _on_open(self, ws) -> None:
+        ws.send(json.dumps({"type": "connection_init", "payload": {}}))
+        ws.send(json.dumps({
+            "id": "orders",
+            "type": "start",
+            "payload": {
+                "variables": {"partyId": self.party_id},
+                "extensions": {},
+                "operationName": "ordersSub",
+                "query": ORDERS_SUBSCRIPTION,
+            },
+        }))
+
+    def _on_message(self, ws, message: str) -> None:
+        msg = json.loads(message)
+        if msg.get("type") == "connection_ack":
+            with self._state:
+                self._connected.set()
+                self._state.notify_all()
+            return
+        if msg.get("type") != "data":
+            return
+        orders = (msg["payload"].get("data") or {}).get("orders") or []
+        for order in orders:
+            self._resolve(order["reference"], _rest_order(order))
+
+    def _on_close(self, ws, *args) -> None:
+        # Any waiters still pending will fall back to polling
+        with self._state:
+            self._connected.clear()
+            self._failed.set()
+            self._state.notify_all()
+
+
+class StreamOrderWaiter(_Waiters):
+    """Consumes an OrdersSubscribe stream, e.g.
+
+        request = vac.api.trading.OrdersSubscribeRequest(partyID=pubkey)
+        waiter = StreamOrderWaiter(data_client.OrdersSubscribe(request))
+    """
+
+    def __init__(self, stream: Iterable, stream_timeout: float = 10.0):
+        super().__init__()
+        self.stream = stream
+        self.stream_timeout = stream_timeout
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def stop(self) -> None:
+        if hasattr(self.stream, "cancel"):
+            self.stream.cancel()
+
+    def wait(self, reference: str) -> Optional[Any]:
+        """Wait for the next update of an order and return the vega.Order,
+        or None if the stream stayed silent for stream_timeout seconds."""
+        fut = self._get(reference)
+        try:
+            return fut.result(timeout=self.stream_timeout)
+        except TimeoutError:
+            return None
+        finally:
+            self._forget(reference)
+
+    def _run(self) -> None:
+        try:
+            for stream_resp in self.stream:
+                for order in stream_resp.orders:
+                    self._resolve(order.reference, order)
+        except Exception:
+            # Cancelled or disconnected: pending waits time out and the
+            # caller asks the node directly
+            pass
@@ -23,11 +23,13 @@ Apps/Libraries:
 
 import base64
 import helpers
-import time
+import stagetimings
 import os
 
 from google.protobuf.empty_pb2 import Empty
 
+from confirmations import StreamOrderWaiter
+
 node_url_grpc = os.getenv("NODE_URL_GRPC")
 if not helpers.check_var(node_url_grpc):
     print("Error: Invalid or missing NODE_URL_GRPC environment variable.")
@@ -51,12 +53,20 @@ if not helpers.check_var(wallet_passphrase):
 # Help guide users against including api version suffix on url
 wallet_server_url = helpers.check_wallet_url(wallet_server_url)
 
+# Time each stage of the order lifecycle (wallet, node, block inclusion); the
+# timings are printed at exit, and written as JSON to TIMINGS_FILE if set
+timings = stagetimings.StageTimings()
+timings.report_at_exit()
+
+# One shared gRPC channel (connection) for the clients
+channel = helpers.grpc_channel(node_url_grpc)
+
 # __import_client:
 import vegaapiclient as vac
 
-# Vega gRPC clients for reading/writing data
-data_client = vac.VegaTradingDataClient(node_url_grpc)
-trading_client = vac.VegaTradingClient(node_url_grpc)
+# Vega gRPC clients for reading/writing data, sharing one channel
+data_client = vac.VegaTradingDataClient(node_url_grpc, channel=channel)
+trading_client = vac.VegaTradingClient(node_url_grpc, channel=channel)
 wallet_client = vac.WalletClient(wallet_server_url)
 # :import_client__
 
@@ -66,15 +76,18 @@ wallet_client = vac.WalletClient(wallet_server_url)
 
 print(f"Logging into wallet: {wallet_name}")
 
+timer = timings.stage("wallet_login").start()
 # __login_wallet:
 # Log in to an existing wallet
 response = wallet_client.login(wallet_name, wallet_passphrase)
 helpers.check_response(response)
 # Note: secret wallet token is stored internally for duration of session
 # :login_wallet__
+timer.stop()
 
 print("Logged in to wallet successfully")
 
+timer = timings.stage("wallet_keys").start()
 # __get_pubkey:
 # List key pairs and select public key to use
 response = wallet_client.listkeys()
@@ -82,19 +95,27 @@ helpers.check_response(response)
 keys = response.json()["keys"]
 pubkey = keys[0]["pub"]
 # :get_pubkey__
+timer.stop()
 
 assert pubkey != ""
 print("Selected pubkey for signing")
 
+# Subscribe to this party's orders, so we hear about each order as soon as it
+# is included in a block instead of sleeping for a fixed time
+orders_request = vac.api.trading.OrdersSubscribeRequest(partyID=pubkey)
+waiter = StreamOrderWaiter(data_client.OrdersSubscribe(orders_request))
+
 #####################################################################################
 #                               F I N D   M A R K E T                               #
 #####################################################################################
 
+timer = timings.stage("node_market").start()
 # __get_market:
 # Request the identifier for the market to place on
 markets = data_client.Markets(Empty()).markets
 marketID = markets[0].id
 # :get_market__
+timer.stop()
 
 assert marketID != ""
 print(f"Market found: {marketID}")
@@ -103,11 +124,13 @@ print(f"Market found: {marketID}")
 #                          B L O C K C H A I N   T I M E                            #
 #####################################################################################
 
+timer = timings.stage("node_time").start()
 # __get_expiry_time:
 # Request the current blockchain time, calculate an expiry time
 blockchain_time = data_client.GetVegaTime(Empty()).timestamp
 expiresAt = int(blockchain_time + 120 * 1e9)  # expire in 2 minutes
 # :get_expiry_time__
+timer.stop()
 
 assert blockchain_time > 0
 print(f"Blockchain time: {blockchain_time}")
@@ -116,6 +139,7 @@ print(f"Blockchain time: {blockchain_time}")
 #                              S U B M I T   O R D E R                              #
 #####################################################################################
 
+timer = timings.stage("node_prepare").start()
 # __prepare_submit_order:
 # Prepare a submit order message
 order = vac.api.trading.SubmitOrderRequest(
@@ -134,10 +158,14 @@ order = vac.api.trading.SubmitOrderRequest(
 )
 prepared_order = trading_client.PrepareSubmitOrder(order)
 # :prepare_submit_order__
+timer.stop()
 
 order_ref = prepared_order.submitID
 print(f"Prepared order, ref: {order_ref}")
 
+waiter.expect(order_ref)
+
+timer = timings.stage("wallet_sign_propagate").start()
 # __sign_tx_order:
 # Sign the prepared transaction
 # Note: Setting propagate to true will submit to a Vega node
@@ -146,22 +174,27 @@ response = wallet_client.signtx(blob_base64, pubkey, True)
 helpers.check_response(response)
 signedTx = response.json()["signedTx"]
 # :sign_tx_order__
+timer.stop()
 
 print("Signed order and sent to Vega")
 
 # Wait for order submission to be included in a block
 print("Waiting for blockchain...")
-time.sleep(4)
-order_ref_request = vac.api.trading.OrderByReferenceRequest(reference=order_ref)
-response = data_client.OrderByReference(order_ref_request)
-orderID = response.order.id
-orderStatus = helpers.enum_to_str(vac.vega.Order.Status, response.order.status)
+with timings.stage("block_confirm"):
+    response = waiter.wait(order_ref)
+    if response is None:
+        # Stream was silent, ask the node directly
+        order_ref_request = vac.api.trading.OrderByReferenceRequest(reference=order_ref)
+        response = data_client.OrderByReference(order_ref_request).order
+orderID = response.id
+orderStatus = helpers.enum_to_str(vac.vega.Order.Status, response.status)
 print(f"Order processed, ID: {orderID}, Status: {orderStatus}")
 
 #####################################################################################
 #                               A M E N D   O R D E R                               #
 #####################################################################################
 
+timer = timings.stage("node_prepare").start()
 # __prepare_amend_order:
 # Prepare the amend order message
 amend = vac.vega.OrderAmendment(
@@ -175,23 +208,29 @@ order = vac.api.trading.AmendOrderRequest(amendment=amend)
 prepared_order = trading_client.PrepareAmendOrder(order)
 blob_base64 = base64.b64encode(prepared_order.blob).decode("ascii")
 # :prepare_amend_order__
+timer.stop()
 
 print(f"Amendment prepared for order ID: {orderID}")
+waiter.expect(order_ref)
 
+timer = timings.stage("wallet_sign_propagate").start()
 # __sign_tx_amend:
 # Sign the prepared order transaction for amendment
 # Note: Setting propagate to true will also submit to a Vega node
 response = wallet_client.signtx(blob_base64, pubkey, True)
 helpers.check_response(response)
 # :sign_tx_amend__
+timer.stop()
 
 print("Signed amendment and sent to Vega")
 
 # Wait for amendment to be included in a block
 print("Waiting for blockchain...")
-time.sleep(4)
-order_id_request = vac.api.trading.OrderByIDRequest(orderID=orderID)
-response = data_client.OrderByID(order_id_request)
+with timings.stage("block_confirm"):
+    response = waiter.wait(order_ref)
+    if response is None:
+        order_id_request = vac.api.trading.OrderByIDRequest(orderID=orderID)
+        response = data_client.OrderByID(order_id_request)
 orderID = response.id
 orderPrice = response.status
 orderSize = response.size
@@ -236,32 +275,41 @@ cancel = vac.vega.OrderCancellation(
 )
 # :prepare_cancel_order_req3__
 
+timer = timings.stage("node_prepare").start()
 # __prepare_cancel_order:
 # Prepare the cancel order message
 order = vac.api.trading.CancelOrderRequest(cancellation=cancel)
 prepared_order = trading_client.PrepareCancelOrder(order)
 blob_base64 = base64.b64encode(prepared_order.blob).decode("ascii")
 # :prepare_cancel_order__
+timer.stop()
 
 print(f"Cancellation prepared for order ID: {orderID}")
+waiter.expect(order_ref)
 
+timer = timings.stage("wallet_sign_propagate").start()
 # __sign_tx_cancel:
 # Sign the prepared order transaction for cancellation
 # Note: Setting propagate to true will submit to a Vega node
 response = wallet_client.signtx(blob_base64, pubkey, True)
 helpers.check_response(response)
 # :sign_tx_cancel__
+timer.stop()
 
 print("Signed cancellation and sent to Vega")
 
 # Wait for cancellation to be included in a block
 print("Waiting for blockchain...")
-time.sleep(4)
-order_ref_request = vac.api.trading.OrderByReferenceRequest(reference=order_ref)
-response = data_client.OrderByReference(order_ref_request)
-orderStatus = helpers.enum_to_str(vac.vega.Order.Status, response.order.status)
+with timings.stage("block_confirm"):
+    response = waiter.wait(order_ref)
+    if response is None:
+        order_ref_request = vac.api.trading.OrderByReferenceRequest(reference=order_ref)
+        response = data_client.OrderByReference(order_ref_request).order
+orderStatus = helpers.enum_to_str(vac.vega.Order.Status, response.status)
 
 print("Cancelled Order:")
 print(f"ID: {orderID}, Status: {orderStatus}")
 
+waiter.stop()
+
 # Completed.
@@ -5,10 +5,11 @@ Script language: Python3
 
 Talks to:
 - Vega wallet (REST)
-- Vega node (REST)
+- Vega node (REST, GraphQL)
 
 Apps/Libraries:
 - REST: requests (https://pypi.org/project/requests/)
+- GraphQL: websocket-client (https://pypi.org/project/websocket_client/)
 """
 
 # Note: this file uses smart-tags in comments to section parts of the code to
@@ -23,9 +24,12 @@ Apps/Libraries:
 
 import json
 import os
-import requests
-import time
 import helpers
+import metadata
+import stagetimings
+import walletauth
+
+from confirmations import OrderWaiter
 
 node_url_rest = os.getenv("NODE_URL_REST")
 if not helpers.check_url(node_url_rest):
@@ -50,46 +54,61 @@ if not helpers.check_var(wallet_passphrase):
 # Help guide users against including api version suffix on url
 wallet_server_url = helpers.check_wallet_url(wallet_server_url)
 
+session = helpers.session()
+
+# Time each stage of the order lifecycle (wallet, node, block inclusion); the
+# timings are printed at exit, and written as JSON to TIMINGS_FILE if set
+timings = stagetimings.StageTimings()
+timings.report_at_exit()
+
 #####################################################################################
 #                           W A L L E T   S E R V I C E                             #
 #####################################################################################
 
 print(f"Logging into wallet: {wallet_name}")
 
+timer = timings.stage("wallet_login").start()
 # __login_wallet:
 # Log in to an existing wallet
-req = {"wallet": wallet_name, "passphrase": wallet_passphrase}
-response = requests.post(f"{wallet_server_url}/api/v1/auth/token", json=req)
-helpers.check_response(response)
-token = response.json()["token"]
+# Note: the token is cached on disk and reused until it expires
+wallet_auth = walletauth.WalletAuth(wallet_server_url, wallet_name, wallet_passphrase, session)
+token = wallet_auth.token()
 # :login_wallet__
+timer.stop()
 
 assert token != ""
 print("Logged in to wallet successfully")
 
+timer = timings.stage("wallet_keys").start()
 # __get_pubkey:
 # List key pairs and select public key to use
-headers = {"Authorization": f"Bearer {token}"}
-response = requests.get(f"{wallet_server_url}/api/v1/keys", headers=headers)
+response = session.get(f"{wallet_server_url}/api/v1/keys", auth=wallet_auth)
 helpers.check_response(response)
 keys = response.json()["keys"]
 pubkey = keys[0]["pub"]
 # :get_pubkey__
+timer.stop()
 
 assert pubkey != ""
 print("Selected pubkey for signing")
 
+# Subscribe to this party's orders, so we hear about each order as soon as it
+# is included in a block instead of polling the node
+waiter = OrderWaiter(node_url_rest, pubkey, session)
+if not waiter.start():
+    print("Order stream unavailable, falling back to polling")
+
 #####################################################################################
 #                               F I N D   M A R K E T                               #
 #####################################################################################
 
+timer = timings.stage("node_market").start()
 # __get_market:
 # Request the identifier for the market to place on
-url = f"{node_url_rest}/markets"
-response = requests.get(url)
-helpers.check_response(response)
-marketID = response.json()["markets"][0]["id"]
+# Note: the list of markets is cached, see metadata.MetadataRegistry
+marketID = metadata.registry(node_url_rest).first_market_id()
 # :get_market__
+timer.stop()
 
 assert marketID != ""
 print(f"Market found: {marketID}")
@@ -98,13 +117,15 @@ print(f"Market found: {marketID}")
 #                          B L O C K C H A I N   T I M E                            #
 #####################################################################################
 
+timer = timings.stage("node_time").start()
 # __get_expiry_time:
 # Request the current blockchain time, calculate an expiry time
-response = requests.get(f"{node_url_rest}/time")
+response = session.get(f"{node_url_rest}/time")
 helpers.check_response(response)
 blockchain_time = int(response.json()["timestamp"])
 expiresAt = str(int(blockchain_time + 120 * 1e9))  # expire in 2 minutes
 # :get_expiry_time__
+timer.stop()
 
 assert blockchain_time > 0
 print(f"Blockchain time: {blockchain_time}")
@@ -113,6 +134,7 @@ print(f"Blockchain time: {blockchain_time}")
 #                              S U B M I T   O R D E R                              #
 #####################################################################################
 
+timer = timings.stage("node_prepare").start()
 # __prepare_submit_order:
 # Prepare a submit order message
 req = {
@@ -128,44 +150,44 @@ req = {
     }
 }
 url = f"{node_url_rest}/orders/prepare/submit"
-response = requests.post(url, json=req)
+response = session.post(url, json=req)
 helpers.check_response(response)
 prepared_order = response.json()
 # :prepare_submit_order__
+timer.stop()
 
 order_ref = prepared_order["submitID"]
 print(f"Prepared order, ref: {order_ref}")
 
+waiter.expect(order_ref)
+
+timer = timings.stage("wallet_sign_propagate").start()
 # __sign_tx_order:
 # Sign the prepared order transaction
 # Note: Setting propagate to true will also submit to a Vega node
 blob = prepared_order["blob"]
 req = {"tx": blob, "pubKey": pubkey, "propagate": True}
 url = f"{wallet_server_url}/api/v1/messages"
-response = requests.post(url, headers=headers, json=req)
+response = session.post(url, auth=wallet_auth, json=req)
 helpers.check_response(response)
 # :sign_tx_order__
+timer.stop()
 
 print("Signed order and sent to Vega")
 
 # Wait for order submission to be included in a block
 print("Waiting for blockchain...", end="", flush=True)
-url = f"{node_url_rest}/orders/{order_ref}"
-response = requests.get(url)
-while response.status_code != 200:
-  time.sleep(0.5)
-  print(".", end="", flush=True)
-  response = requests.get(url)
-
-response_json = response.json()
-orderID = response_json["order"]["id"]
-orderStatus = response_json["order"]["status"]
+with timings.stage("block_confirm"):
+    order = waiter.wait(order_ref)
+orderID = order["id"]
+orderStatus = order["status"]
 print(f"\nOrder processed, ID: {orderID}, Status: {orderStatus}")
 
 #####################################################################################
 #                               A M E N D   O R D E R                               #
 #####################################################################################
 
+timer = timings.stage("node_prepare").start()
 # __prepare_amend_order:
 # Prepare the amend order message
 req = {
@@ -181,38 +203,40 @@ req = {
     }
 }
 url = f"{node_url_rest}/orders/prepare/amend"
-response = requests.post(url, json=req)
+response = session.post(url, json=req)
 helpers.check_response(response)
 prepared_amend = response.json()
 blob = prepared_amend["blob"]
 # :prepare_amend_order__
+timer.stop()
 
 print(f"Amendment prepared for order ID: {orderID}")
+waiter.expect(order_ref)
 
+timer = timings.stage("wallet_sign_propagate").start()
 # __sign_tx_amend:
 # Sign the prepared order transaction for amendment
 # Note: Setting propagate to true will also submit to a Vega node
 req = {"tx": blob, "pubKey": pubkey, "propagate": True}
 url = f"{wallet_server_url}/api/v1/messages"
-response = requests.post(url, headers=headers, json=req)
+response = session.post(url, auth=wallet_auth, json=req)
 helpers.check_response(response)
 # :sign_tx_amend__
+timer.stop()
 
 print("Signed amendment and sent to Vega")
 
 # Wait for amendment to be included in a block
-print("Waiting for blockchain...")
-time.sleep(3)
-url = f"{node_url_rest}/orders/{order_ref}"
-response = requests.get(url)
-response_json = response.json()
-orderID = response_json["order"]["id"]
-orderPrice = response_json["order"]["price"]
-orderSize = response_json["order"]["size"]
-orderTif = response_json["order"]["timeInForce"]
-orderStatus = response_json["order"]["status"]
-
-print("Amended Order:")
+print("Waiting for blockchain...", end="", flush=True)
+with timings.stage("block_confirm"):
+    order = waiter.wait(order_ref, previous=order)
+orderID = order["id"]
+orderPrice = order["price"]
+orderSize = order["size"]
+orderTif = order["timeInForce"]
+orderStatus = order["status"]
+
+print("\nAmended Order:")
 print(f"ID: {orderID}, Status: {orderStatus}, Price(Old): 1, "
       f"Price(New): {orderPrice}, Size(Old): 100, Size(New): {orderSize}, "
       f"TimeInForce(Old): TIF_GTT, TimeInForce(New): {orderTif}")
@@ -256,38 +280,43 @@ req = {
 }
 # :prepare_cancel_order_req3__
 
+timer = timings.stage("node_prepare").start()
 # __prepare_cancel_order:
 # Prepare the cancel order message
 url = f"{node_url_rest}/orders/prepare/cancel"
-response = requests.post(url, json=req)
+response = session.post(url, json=req)
 helpers.check_response(response)
 prepared_cancel = response.json()
 blob = prepared_cancel["blob"]
 # :prepare_cancel_order__
+timer.stop()
 
 print(f"Cancellation prepared for order ID: {orderID}")
+waiter.expect(order_ref)
 
+timer = timings.stage("wallet_sign_propagate").start()
 # __sign_tx_cancel:
 # Sign the prepared order transaction for cancellation
 # Note: Setting propagate to true will also submit to a Vega node
 req = {"tx": blob, "pubKey": pubkey, "propagate": True}
 url = f"{wallet_server_url}/api/v1/messages"
-response = requests.post(url, headers=headers, json=req)
+response = session.post(url, auth=wallet_auth, json=req)
 helpers.check_response(response)
 # :sign_tx_cancel__
+timer.stop()
 
 print("Signed cancellation and sent to Vega")
 
 # Wait for cancellation to be included in a block
-print("Waiting for blockchain...")
-time.sleep(3)
-url = f"{node_url_rest}/orders/{order_ref}"
-response = requests.get(url)
-response_json = response.json()
-orderID = response_json["order"]["id"]
-orderStatus = response_json["order"]["status"]
-
-print("Cancelled Order:")
+print("Waiting for blockchain...", end="", flush=True)
+with timings.stage("block_confirm"):
+    order = waiter.wait(order_ref, previous=order)
+orderID = order["id"]
+orderStatus = order["status"]
+
+print("\nCancelled Order:")
 print(f"ID: {orderID}, Status: {orderStatus}")
 
+waiter.stop()
+
 # Completed.
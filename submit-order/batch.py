@@ -0,0 +1,148 @@
+"""
+Pipelined batch order submission.
+
+Orders go through three stages: prepare (Vega node), sign (wallet server)
+and submit (Vega node). Each stage has its own bounded pool of worker
+threads, connected by bounded queues, so while order N is being signed,
+order N+1 can be prepared and order N-1 submitted. Per-stage latencies
+(see stagetimings.StageTimings) and throughput are recorded so that pool
+sizes can be tuned against a node.
+"""
+
+import json
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+import stagetimings
+
+_DONE = object()
+
+
+def read_order_specs(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield order specs from a file with one JSON object per line."""
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield json.loads(line)
+
+
+def generate_order_specs(count: int, price: int = 100000, size: int = 1) -> Iterator[Dict[str, Any]]:
+    """Yield count small limit orders, alternating side around price."""
+    for i in range(count):
+        yield {
+            "price": str(price + (i % 10) * (1 if i % 2 else -1)),
+            "size": str(size),
+            "side": "SIDE_BUY" if i % 2 == 0 else "SIDE_SELL",
+            "timeInForce": "TIF_GTC",
+            "type": "TYPE_LIMIT",
+        }
+
+
+class Pipeline:
+    """Run items through a sequence of (name, function, workers) stages.
+
+    Each function takes the output of the previous stage. An exception in
+    any stage drops that item and is reported in the results.
+    """
+
+    def __init__(self, stages: List[Tuple[str, Callable[[Any], Any], int]], queue_size: int = 16):
+        self.stages = stages
+        self.timings = stagetimings.StageTimings()
+        self.queues = [queue.Queue(maxsize=queue_size) for _ in stages]
+        self.results: List[Tuple[int, Any, Exception]] = []
+        # First start and last end of each stage, for its throughput
+        self.spans: Dict[str, List[float]] = {}
+        # Guards results, spans and the count of workers still running per stage
+        self._lock = threading.Lock()
+
+    def run(self, items: Iterable[Any]) -> List[Tuple[int, Any, Exception]]:
+        """Feed items through all stages and block until they are done.
+
+        Returns (index, result, error) tuples in completion order."""
+        threads = []
+        for i, (_, fn, workers) in enumerate(self.stages):
+            remaining = [workers]
+            for _ in range(workers):
+                t = threading.Thread(target=self._worker, args=(i, fn, remaining), daemon=True)
+                t.start()
+                threads.append(t)
+
+        for index, item in enumerate(items):
+            self.queues[0].put((index, item))
+        for _ in range(self.stages[0][2]):
+            self.queues[0].put(_DONE)
+
+        for t in threads:
+            t.join()
+        return self.results
+
+    def _record(self, name: str, start: float, end: float, ok: bool) -> None:
+        self.timings.record(name, end - start, ok)
+        with self._lock:
+            span = self.spans.get(name)
+            if span is None:
+                self.spans[name] = [start, end]
+            else:
+                span[0] = min(span[0], start)
+                span[1] = max(span[1], end)
+
+    def _worker(self, i: int, fn: Callable[[Any], Any], remaining: List[int]) -> None:
+        name = self.stages[i][0]
+        last = i == len(self.stages) - 1
+        while True:
+            entry = self.queues[i].get()
+            if entry is _DONE:
+                break
+            index, item = entry
+            start = time.perf_counter()
+            try:
+                out = fn(item)
+            except Exception as e:
+                self._record(name, start, time.perf_counter(), False)
+                with self._lock:
+                    self.results.append((index, None, e))
+                continue
+            self._record(name, start, time.perf_counter(), True)
+            if last:
+                with self._lock:
+                    self.results.append((index, out, None))
+            else:
+                self.queues[i + 1].put((index, out))
+
+        # The last worker of a stage to finish tells the next stage to stop
+        with self._lock:
+            remaining[0] -= 1
+            finished = remaining[0] == 0
+        if finished and not last:
+            for _ in range(self.stages[i + 1][2]):
+                self.queues[i + 1].put(_DONE)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Workers, count, errors, throughput and latencies of each stage."""
+        timings = self.timings.to_json()
+        summaries = []
+        for name, _, workers in self.stages:
+            t = timings.get(name, {})
+            start, end = self.spans.get(name, (0.0, 0.0))
+            count = t.get("count", 0)
+            summaries.append({
+                "stage": name,
+                "workers": workers,
+                "count": count,
+                "errors": t.get("errors", 0),
+                "throughput_per_s": count / (end - start) if end > start else 0.0,
+                "p50_ms": t.get("p50_ms", 0.0),
+                "p99_ms": t.get("p99_ms", 0.0),
+            })
+        return summaries
+
+    def report(self) -> str:
+        lines = ["{:10} {:>7} {:>7} {:>7} {:>10} {:>10} {:>10}".format(
+            "stage", "workers", "count", "errors", "per_sec", "p50_ms", "p99_ms")]
+        for d in self.summary():
+            lines.append("{stage:10} {workers:>7} {count:>7} {errors:>7} "
+                         "{throughput_per_s:>10.1f} {p50_ms:>10.2f} {p99_ms:>10.2f}".format(**d))
+        return "\n".join(lines)
@@ -32,6 +32,7 @@ import vegaapiclient as vac
 # :import_client__
 
 import helpers
+import stagetimings
 
 node_url_grpc = os.getenv("NODE_URL_GRPC")
 if not helpers.check_var(node_url_grpc):
@@ -56,25 +57,38 @@ if not helpers.check_var(wallet_passphrase):
 # Help guide users against including api version suffix on url
 walletserver_url = helpers.check_wallet_url(walletserver_url)
 
+# Time each stage of the order submission (wallet, node); the timings are
+# printed at exit, and written as JSON to TIMINGS_FILE if set
+timings = stagetimings.StageTimings()
+timings.report_at_exit()
+
+timer = timings.stage("connect_and_login").start()
+# Vega node: One shared, connected gRPC channel for both clients
+channel = helpers.grpc_channel(node_url_grpc)
+
 # __create_wallet:
 # Vega node: Create client for accessing public data
-datacli = vac.VegaTradingDataClient(node_url_grpc)
+datacli = vac.VegaTradingDataClient(node_url_grpc, channel=channel)
 
 # Vega node: Create client for trading (e.g. submitting orders)
-tradingcli = vac.VegaTradingClient(node_url_grpc)
+tradingcli = vac.VegaTradingClient(node_url_grpc, channel=channel)
 
 # Wallet server: Create a walletclient (see above for details)
 walletclient = vac.WalletClient(walletserver_url)
 response = walletclient.login(wallet_name, wallet_passphrase)
 # :create_wallet__
+timer.stop()
 helpers.check_response(response)
 
+timer = timings.stage("node_market").start()
 # __get_market:
 # Get a list of markets
 markets = datacli.Markets(Empty()).markets
 marketID = markets[0].id
 # :get_market__
+timer.stop()
 
+timer = timings.stage("wallet_keys").start()
 # __generate_keypair:
 GENERATE_NEW_KEYPAIR = False
 if GENERATE_NEW_KEYPAIR:
@@ -90,7 +104,9 @@ else:
     assert len(keys) > 0
     pubKey = keys[0]["pub"]
 # :generate_keypair__
+timer.stop()
 
+timer = timings.stage("node_prepare").start()
 # __prepare_order:
 # Vega node: Prepare the SubmitOrder
 order = vac.api.trading.SubmitOrderRequest(
@@ -110,7 +126,9 @@ print(f"Request for PrepareSubmitOrder: {order}")
 response = tradingcli.PrepareSubmitOrder(order)
 print(f"Response from PrepareSubmitOrder: {response}")
 # :prepare_order__
+timer.stop()
 
+timer = timings.stage("wallet_sign").start()
 # __sign_tx:
 # Wallet server: Sign the prepared transaction
 blob_base64 = base64.b64encode(response.blob).decode("ascii")
@@ -122,7 +140,9 @@ print("Response from SignTx:")
 print(json.dumps(responsejson, indent=2, sort_keys=True))
 signedTx = responsejson["signedTx"]
 # :sign_tx__
+timer.stop()
 
+timer = timings.stage("node_submit").start()
 # __submit_tx:
 # Vega node: Submit the signed transaction
 request = vac.api.trading.SubmitTransactionRequest(
@@ -138,5 +158,6 @@ request = vac.api.trading.SubmitTransactionRequest(
 print(f"Request for SubmitTransaction: {request}")
 response = tradingcli.SubmitTransaction(request)
 # :submit_tx__
+timer.stop()
 assert response.success
 print("All is well.")
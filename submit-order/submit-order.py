@@ -23,9 +23,11 @@ Apps/Libraries:
 
 import json
 import os
-import requests
 
 import helpers
+import metadata
+import stagetimings
+import walletauth
 
 node_url_rest = os.getenv("NODE_URL_REST")
 if not helpers.check_url(node_url_rest):
@@ -50,25 +52,32 @@ if not helpers.check_var(wallet_passphrase):
 # Help guide users against including api version suffix on url
 walletserver_url = helpers.check_wallet_url(walletserver_url)
 
+session = helpers.session()
+
+# Time each stage of the order submission (wallet, node); the timings are
+# printed at exit, and written as JSON to TIMINGS_FILE if set
+timings = stagetimings.StageTimings()
+timings.report_at_exit()
+
+timer = timings.stage("wallet_login").start()
 # __create_wallet:
+# Wallet token cache: the token is kept on disk and reused until it expires
+wallet_auth = walletauth.WalletAuth(walletserver_url, wallet_name, wallet_passphrase, session)
+
 CREATE_NEW_WALLET = False
 if CREATE_NEW_WALLET:
-    # EITHER: Create new wallet
-    url = f"{walletserver_url}/api/v1/wallets"
+    # EITHER: Create new wallet, and cache the token it returns
+    req = {"wallet": wallet_name, "passphrase": wallet_passphrase}
+    response = session.post(f"{walletserver_url}/api/v1/wallets", json=req)
+    helpers.check_response(response)
+    wallet_auth.set_token(response.json()["token"])
 else:
-    # OR: Log in to existing wallet
-    url = f"{walletserver_url}/api/v1/auth/token"
-
-# Make request to create new wallet or log in to existing wallet
-req = {"wallet": wallet_name, "passphrase": wallet_passphrase}
-response = requests.post(url, json=req)
-helpers.check_response(response)
-
-# Pull out the token and make a headers dict
-token = response.json()["token"]
-headers = {"Authorization": f"Bearer {token}"}
+    # OR: Log in to existing wallet (only if there is no cached token)
+    wallet_auth.token()
 # :create_wallet__
+timer.stop()
 
+timer = timings.stage("wallet_keys").start()
 # __generate_keypair:
 GENERATE_NEW_KEYPAIR = False
 pubKey = ""
@@ -79,32 +88,34 @@ if GENERATE_NEW_KEYPAIR:
         "meta": [{"key": "alias", "value": "my_key_alias"}],
     }
     url = f"{walletserver_url}/api/v1/keys"
-    response = requests.post(url, headers=headers, json=req)
+    response = session.post(url, auth=wallet_auth, json=req)
     helpers.check_response(response)
     pubKey = response.json()["key"]["pub"]
 else:
     # OR: List existing keypairs
     url = f"{walletserver_url}/api/v1/keys"
-    response = requests.get(url, headers=headers)
+    response = session.get(url, auth=wallet_auth)
     helpers.check_response(response)
     keys = response.json()["keys"]
     assert len(keys) > 0
     pubKey = keys[0]["pub"]
 # :generate_keypair__
+timer.stop()
 
 assert pubKey != ""
 
+timer = timings.stage("node_market").start()
 # __get_market:
 # Next, get a Market ID
-url = f"{node_url_rest}/markets"
-response = requests.get(url)
-helpers.check_response(response)
-marketID = response.json()["markets"][0]["id"]
+# Note: the list of markets is cached, see metadata.MetadataRegistry
+marketID = metadata.registry(node_url_rest).first_market_id()
 # :get_market__
+timer.stop()
 
+timer = timings.stage("node_prepare").start()
 # __prepare_order:
 # Next, prepare a SubmitOrder
-response = requests.get(f"{node_url_rest}/time")
+response = session.get(f"{node_url_rest}/time")
 helpers.check_response(response)
 blockchaintime = int(response.json()["timestamp"])
 expiresAt = str(int(blockchaintime + 120 * 1e9))  # expire in 2 minutes
@@ -124,13 +135,15 @@ req = {
 print("Request for PrepareSubmitOrder:")
 print(json.dumps(req, indent=2, sort_keys=True))
 url = f"{node_url_rest}/orders/prepare/submit"
-response = requests.post(url, json=req)
+response = session.post(url, json=req)
 helpers.check_response(response)
 preparedOrder = response.json()
 # :prepare_order__
+timer.stop()
 print("Response from PrepareSubmitOrder:")
 print(json.dumps(preparedOrder, indent=2, sort_keys=True))
 
+timer = timings.stage("wallet_sign").start()
 # __sign_tx:
 # Wallet server: Sign the prepared transaction
 blob = preparedOrder["blob"]
@@ -138,22 +151,25 @@ req = {"tx": blob, "pubKey": pubKey, "propagate": False}
 print("Request for SignTx:")
 print(json.dumps(req, indent=2, sort_keys=True))
 url = f"{walletserver_url}/api/v1/messages"
-response = requests.post(url, headers=headers, json=req)
+response = session.post(url, auth=wallet_auth, json=req)
 helpers.check_response(response)
 signedTx = response.json()["signedTx"]
 # :sign_tx__
+timer.stop()
 print("Response from SignTx:")
 print(json.dumps(signedTx, indent=2, sort_keys=True))
 
+timer = timings.stage("node_submit").start()
 # __submit_tx:
 # Vega node: Submit the signed transaction
 req = {"tx": signedTx}
 print("Request for SubmitTransaction:")
 print(json.dumps(req, indent=2, sort_keys=True))
 url = f"{node_url_rest}/transaction"
-response = requests.post(url, json=req)
+response = session.post(url, json=req)
 helpers.check_response(response)
 # :submit_tx__
+timer.stop()
 
 assert response.json()["success"]
 print("All is well.")
@@ -0,0 +1,135 @@
+#!/usr/bin/python3
+
+"""
+Script language: Python3
+
+Talks to:
+- Vega wallet (REST)
+- Vega node (gRPC)
+
+Apps/Libraries:
+- REST (wallet): Vega-API-client (https://pypi.org/project/Vega-API-client/)
+- gRPC (node): Vega-API-client (https://pypi.org/project/Vega-API-client/)
+"""
+
+# Submit a batch of orders, pipelining PrepareSubmitOrder, SignTx and
+# SubmitTransaction with a bounded pool of workers per stage.
+# See submit-orders-batch.py for the order spec format.
+
+import argparse
+import base64
+import json
+import os
+
+from google.protobuf.empty_pb2 import Empty
+import vegaapiclient as vac
+
+import helpers
+from batch import Pipeline, generate_order_specs, read_order_specs
+
+parser = argparse.ArgumentParser(description="Submit a batch of orders")
+parser.add_argument("--orders", help="file with one JSON order spec per line")
+parser.add_argument("-n", "--count", type=int, default=10, help="number of orders to generate if --orders is not given")
+parser.add_argument("--prepare-workers", type=int, default=2)
+parser.add_argument("--sign-workers", type=int, default=2)
+parser.add_argument("--submit-workers", type=int, default=2)
+parser.add_argument("--queue-size", type=int, default=16)
+parser.add_argument("--json", action="store_true", help="print stage statistics as JSON")
+args = parser.parse_args()
+
+node_url_grpc = os.getenv("NODE_URL_GRPC")
+if not helpers.check_var(node_url_grpc):
+    print("Error: Invalid or missing NODE_URL_GRPC environment variable.")
+    exit(1)
+
+walletserver_url = os.getenv("WALLETSERVER_URL")
+if not helpers.check_url(walletserver_url):
+    print("Error: Invalid or missing WALLETSERVER_URL environment variable.")
+    exit(1)
+
+wallet_name = os.getenv("WALLET_NAME")
+if not helpers.check_var(wallet_name):
+    print("Error: Invalid or missing WALLET_NAME environment variable.")
+    exit(1)
+
+wallet_passphrase = os.getenv("WALLET_PASSPHRASE")
+if not helpers.check_var(wallet_passphrase):
+    print("Error: Invalid or missing WALLET_PASSPHRASE environment variable.")
+    exit(1)
+
+# Help guide users against including api version suffix on url
+walletserver_url = helpers.check_wallet_url(walletserver_url)
+
+# One shared gRPC channel (connection) for both clients
+channel = helpers.grpc_channel(node_url_grpc)
+datacli = vac.VegaTradingDataClient(node_url_grpc, channel=channel)
+tradingcli = vac.VegaTradingClient(node_url_grpc, channel=channel)
+walletclient = vac.WalletClient(walletserver_url)
+response = walletclient.login(wallet_name, wallet_passphrase)
+helpers.check_response(response)
+
+response = walletclient.listkeys()
+helpers.check_response(response)
+keys = response.json()["keys"]
+assert len(keys) > 0
+pubKey = keys[0]["pub"]
+
+marketID = datacli.Markets(Empty()).markets[0].id
+
+
+def prepare(spec: dict) -> bytes:
+    submission = vac.vega.OrderSubmission(
+        marketID=spec.get("marketID", marketID),
+        partyID=spec.get("partyID", pubKey),
+        price=int(spec["price"]),
+        size=int(spec["size"]),
+        side=vac.vega.Side.Value(spec["side"]),
+        timeInForce=vac.vega.Order.TimeInForce.Value(spec["timeInForce"]),
+        type=vac.vega.Order.Type.Value(spec["type"]),
+        expiresAt=int(spec.get("expiresAt", 0)),
+    )
+    request = vac.api.trading.SubmitOrderRequest(submission=submission)
+    return tradingcli.PrepareSubmitOrder(request).blob
+
+
+def sign(blob: bytes) -> dict:
+    blob_base64 = base64.b64encode(blob).decode("ascii")
+    response = walletclient.signtx(blob_base64, pubKey, False)
+    helpers.check_response(response)
+    return response.json()["signedTx"]
+
+
+def submit(signedTx: dict) -> None:
+    request = vac.api.trading.SubmitTransactionRequest(
+        tx=vac.vega.SignedBundle(
+            tx=base64.b64decode(signedTx["tx"]),
+            sig=vac.vega.Signature(
+                sig=base64.b64decode(signedTx["sig"]["sig"]),
+                algo="vega/ed25519",
+                version=1,
+            ),
+        ),
+    )
+    assert tradingcli.SubmitTransaction(request).success, "SubmitTransaction was not successful"
+
+
+specs = read_order_specs(args.orders) if args.orders else generate_order_specs(args.count)
+pipeline = Pipeline(
+    [
+        ("prepare", prepare, args.prepare_workers),
+        ("sign", sign, args.sign_workers),
+        ("submit", submit, args.submit_workers),
+    ],
+    queue_size=args.queue_size,
+)
+results = pipeline.run(specs)
+
+failed = [(index, error) for index, _, error in results if error is not None]
+for index, error in sorted(failed, key=lambda f: f[0]):
+    print(f"Order {index} failed: {error}")
+print(f"Submitted {len(results) - len(failed)} of {len(results)} orders")
+
+if args.json:
+    print(json.dumps(pipeline.summary(), indent=2))
+else:
+    print(pipeline.report())
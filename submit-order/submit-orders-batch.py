@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+
+"""
+Script language: Python3
+
+Talks to:
+- Vega wallet (REST)
+- Vega node (REST)
+
+Apps/Libraries:
+- REST (wallet): requests (https://pypi.org/project/requests/)
+- REST (node): requests (https://pypi.org/project/requests/)
+"""
+
+# Submit a batch of orders, pipelining PrepareSubmitOrder, SignTx and
+# SubmitTransaction with a bounded pool of workers per stage.
+#
+# Order specs are read from a file with one JSON object per line, using the
+# same fields as the "submission" in submit-order.py, e.g.
+#   {"price": "100000", "size": "1", "side": "SIDE_BUY", "timeInForce": "TIF_GTC", "type": "TYPE_LIMIT"}
+# marketID and partyID default to the first market and the first key.
+# Without --orders, a number of small limit orders are generated.
+
+import argparse
+import json
+import os
+
+import helpers
+import metadata
+import walletauth
+from batch import Pipeline, generate_order_specs, read_order_specs
+
+parser = argparse.ArgumentParser(description="Submit a batch of orders")
+parser.add_argument("--orders", help="file with one JSON order spec per line")
+parser.add_argument("-n", "--count", type=int, default=10, help="number of orders to generate if --orders is not given")
+parser.add_argument("--prepare-workers", type=int, default=2)
+parser.add_argument("--sign-workers", type=int, default=2)
+parser.add_argument("--submit-workers", type=int, default=2)
+parser.add_argument("--queue-size", type=int, default=16)
+parser.add_argument("--json", action="store_true", help="print stage statistics as JSON")
+args = parser.parse_args()
+
+node_url_rest = os.getenv("NODE_URL_REST")
+if not helpers.check_url(node_url_rest):
+    print("Error: Invalid or missing NODE_URL_REST environment variable.")
+    exit(1)
+
+walletserver_url = os.getenv("WALLETSERVER_URL")
+if not helpers.check_url(walletserver_url):
+    print("Error: Invalid or missing WALLETSERVER_URL environment variable.")
+    exit(1)
+
+wallet_name = os.getenv("WALLET_NAME")
+if not helpers.check_var(wallet_name):
+    print("Error: Invalid or missing WALLET_NAME environment variable.")
+    exit(1)
+
+wallet_passphrase = os.getenv("WALLET_PASSPHRASE")
+if not helpers.check_var(wallet_passphrase):
+    print("Error: Invalid or missing WALLET_PASSPHRASE environment variable.")
+    exit(1)
+
+# Help guide users against including api version suffix on url
+walletserver_url = helpers.check_wallet_url(walletserver_url)
+
+# One keep-alive connection per worker to each of the node and wallet server
+session = helpers.new_session(
+    pool_maxsize=args.prepare_workers + args.sign_workers + args.submit_workers
+)
+
+# Log in to existing wallet (reusing a cached token) and select the first key pair
+wallet_auth = walletauth.WalletAuth(walletserver_url, wallet_name, wallet_passphrase, session)
+
+response = session.get(f"{walletserver_url}/api/v1/keys", auth=wallet_auth)
+helpers.check_response(response)
+keys = response.json()["keys"]
+assert len(keys) > 0
+pubKey = keys[0]["pub"]
+
+marketID = metadata.registry(node_url_rest).first_market_id()
+
+
+def prepare(spec: dict) -> str:
+    submission = {"marketID": marketID, "partyID": pubKey}
+    submission.update(spec)
+    response = session.post(f"{node_url_rest}/orders/prepare/submit", json={"submission": submission})
+    helpers.check_response(response)
+    return response.json()["blob"]
+
+
+def sign(blob: str) -> dict:
+    req = {"tx": blob, "pubKey": pubKey, "propagate": False}
+    response = session.post(f"{walletserver_url}/api/v1/messages", auth=wallet_auth, json=req)
+    helpers.check_response(response)
+    return response.json()["signedTx"]
+
+
+def submit(signedTx: dict) -> None:
+    response = session.post(f"{node_url_rest}/transaction", json={"tx": signedTx})
+    helpers.check_response(response)
+    assert response.json()["success"], "SubmitTransaction was not successful"
+
+
+specs = read_order_specs(args.orders) if args.orders else generate_order_specs(args.count)
+pipeline = Pipeline(
+    [
+        ("prepare", prepare, args.prepare_workers),
+        ("sign", sign, args.sign_workers),
+        ("submit", submit, args.submit_workers),
+    ],
+    queue_size=args.queue_size,
+)
+results = pipeline.run(specs)
+
+failed = [(index, error) for index, _, error in results if error is not None]
+for index, error in sorted(failed, key=lambda f: f[0]):
+    print(f"Order {index} failed: {error}")
+print(f"Submitted {len(results) - len(failed)} of {len(results)} orders")
+
+if args.json:
+    print(json.dumps(pipeline.summary(), indent=2))
+else:
+    print(pipeline.report())
@@ -19,7 +19,6 @@ Apps/Libraries:
 # some code here
 # :something__
 
-import requests
 import os
 import helpers
 
@@ -28,10 +27,12 @@ if not helpers.check_url(node_url_rest):
     print("Error: Invalid or missing NODE_URL_REST environment variable.")
     exit(1)
 
+session = helpers.session()
+
 # __get_time:
 # Request the latest timestamp in nanoseconds since epoch from the Vega network
 url = "{base}/time".format(base=node_url_rest)
-response = requests.get(url)
+response = session.get(url)
 helpers.check_response(response)
 
 # The "timestamp" field contains the resulting data we need.
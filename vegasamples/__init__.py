@@ -0,0 +1,9 @@
+"""
+Tools for running the sample scripts, from the repository root (with
+PYTHONPATH=. as set by the credentials file):
+
+- python3 -m vegasamples [--grpc] COMMAND [ARGS...]: run the sample script
+  for a command, loading only what it imports (see vegasamples/__main__.py)
+- python3 -m vegasamples.run SCRIPT [ARGS...]: run a script with optional
+  profiling (see vegasamples/run.py)
+"""
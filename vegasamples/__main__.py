@@ -0,0 +1,205 @@
+"""
+One entry point for the sample scripts:
+
+    python3 -m vegasamples [--grpc] COMMAND [ARGS...]
+
+Each command runs one sample script, as if started directly (ARGS are passed
+on). Only that script's imports are loaded, so REST commands never import
+grpc, protobuf or the Vega-API-client. With --grpc, the Vega-API-client
+version of the script is run instead, where there is one; commands with only
+one version run it either way.
+
+Required environment variables are checked before the script is loaded, so
+a missing setting fails in milliseconds. Setting VEGA_PROFILE profiles the
+script (see vegasamples/run.py).
+"""
+
+import os
+import runpy
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+REST = ("NODE_URL_REST",)
+GRPC = ("NODE_URL_GRPC",)
+WALLET = ("WALLETSERVER_URL", "WALLET_NAME", "WALLET_PASSPHRASE")
+
+# name: (description, (default script, its variables), (gRPC script, its variables))
+COMMANDS = {
+    "time": (
+        "Vega/blockchain time",
+        ("vega-time/get-time.py", REST),
+        ("vega-time/get-time-with-Vega-API-client.py", GRPC),
+    ),
+    "stats": (
+        "Vega node statistics",
+        ("get-statistics/get-statistics.py", REST),
+        ("get-statistics/get-statistics-with-Vega-API-client.py", GRPC),
+    ),
+    "markets": (
+        "Markets and market data",
+        ("get-markets-and-market-data/get-markets-and-marketdata.py", REST),
+        ("get-markets-and-market-data/get-markets-and-marketdata-with-Vega-API-client.py", GRPC),
+    ),
+    "orders": (
+        "Orders and trades for a market",
+        ("get-orders-and-trades/get-orders-and-trades-for-market.py", REST),
+        ("get-orders-and-trades/get-orders-and-trades-for-market-with-Vega-API-client.py", GRPC),
+    ),
+    "party-orders": (
+        "Orders and trades for a party",
+        ("get-orders-and-trades/get-orders-and-trades-for-party.py", REST + WALLET),
+        ("get-orders-and-trades/get-orders-and-trades-for-party-with-Vega-API-client.py", GRPC + WALLET),
+    ),
+    "trades": (
+        "Trades for an order",
+        ("get-orders-and-trades/get-trades-for-order.py", REST),
+        ("get-orders-and-trades/get-trades-for-order-with-Vega-API-client.py", GRPC),
+    ),
+    "order": (
+        "Order by reference",
+        ("get-by-reference/get-order-by-reference.py", REST),
+        ("get-by-reference/get-order-by-reference-with-Vega-API-client.py", GRPC),
+    ),
+    "parties": (
+        "Parties",
+        ("parties-and-accounts/get-parties.py", REST),
+        ("parties-and-accounts/get-parties-with-Vega-API-client.py", GRPC),
+    ),
+    "assets": (
+        "Assets",
+        ("propose-markets/get-assets.py", REST),
+        None,
+    ),
+    "fees": (
+        "Fee and margin estimates for an order",
+        ("fees-estimation/get-fees-estimate.py", REST + WALLET),
+        None,
+    ),
+    "wallet": (
+        "Vega wallet API",
+        ("wallet/wallet.py", ("WALLETSERVER_URL",)),
+        ("wallet/wallet-with-Vega-API-client.py", ("WALLETSERVER_URL",)),
+    ),
+    "submit": (
+        "Submit an order",
+        ("submit-order/submit-order.py", REST + WALLET),
+        ("submit-order/submit-order-with-Vega-API-client.py", GRPC + WALLET),
+    ),
+    "submit-batch": (
+        "Submit a batch of orders",
+        ("submit-order/submit-orders-batch.py", REST + WALLET),
+        ("submit-order/submit-orders-batch-with-Vega-API-client.py", GRPC + WALLET),
+    ),
+    "submit-amend-cancel": (
+        "Submit, amend and cancel an order",
+        ("submit-amend-cancel-orders/submit-amend-cancel-orders.py", REST + WALLET),
+        ("submit-amend-cancel-orders/submit-amend-cancel-orders-with-Vega-API-client.py", GRPC + WALLET),
+    ),
+    "propose": (
+        "Propose, vote on and enact a market",
+        ("propose-markets/propose-vote-enact-market.py", REST + WALLET),
+        None,
+    ),
+    "stream": (
+        "Stream events from the event bus",
+        ("stream-events/stream-events-with-Vega-API-client.py", GRPC),
+        None,
+    ),
+    "stream-positions": (
+        "Positions and PnL per party, from the event bus",
+        ("stream-events/stream-positions-with-Vega-API-client.py", GRPC),
+        None,
+    ),
+    "stream-margins": (
+        "Margin levels and accounts, from the event bus",
+        ("stream-events/stream-margins-with-Vega-API-client.py", GRPC),
+        None,
+    ),
+    "record": (
+        "Record the event bus to a file",
+        ("stream-events/record-events-with-Vega-API-client.py", GRPC),
+        None,
+    ),
+    "replay": (
+        "Replay recorded events",
+        ("stream-events/replay-events-with-Vega-API-client.py", ()),
+        None,
+    ),
+    "stream-orders": (
+        "Stream orders",
+        ("stream-orders-and-trades/stream-orders-with-Vega-API-client.py", GRPC),
+        None,
+    ),
+    "stream-trades": (
+        "Stream trades",
+        ("stream-orders-and-trades/stream-trades-with-Vega-API-client.py", GRPC),
+        None,
+    ),
+    "stream-orderbook": (
+        "Stream the order book for a market",
+        ("stream-orders-and-trades/stream-orderbook-with-Vega-API-client.py", GRPC),
+        None,
+    ),
+    "stream-candles": (
+        "Stream candles for a market",
+        ("stream-orders-and-trades/stream-candles-with-Vega-API-client.py", GRPC),
+        None,
+    ),
+    "stream-marketdata": (
+        "Stream market data",
+        ("stream-marketdata/stream-marketdata.py", REST),
+        None,
+    ),
+}
+
+
+def usage() -> str:
+    lines = [__doc__.strip(), "", "Commands (* has a --grpc version):"]
+    for name, (description, _, grpc) in COMMANDS.items():
+        lines.append(f"  {name:<20} {'*' if grpc else ' '} {description}")
+    return "\n".join(lines)
+
+
+def main(argv) -> None:
+    use_grpc = False
+    while argv and argv[0].startswith("-"):
+        option = argv.pop(0)
+        if option == "--grpc":
+            use_grpc = True
+        elif option in ("-h", "--help"):
+            print(usage())
+            exit(0)
+        else:
+            print(f"Error: Unknown option {option}\n\n{usage()}")
+            exit(1)
+    if not argv:
+        print(usage())
+        exit(1)
+    name = argv[0]
+    if name not in COMMANDS:
+        print(f"Error: Unknown command {name!r}, see python3 -m vegasamples --help")
+        exit(1)
+    _, default, grpc = COMMANDS[name]
+    script, variables = grpc if use_grpc and grpc else default
+
+    for var in variables:
+        if not os.getenv(var):
+            print(f"Error: Invalid or missing {var} environment variable.")
+            exit(1)
+
+    script = os.path.join(ROOT, script)
+    args = [script] + argv[1:]
+    if os.getenv("VEGA_PROFILE"):
+        from vegasamples import run
+        run.main(args)
+        return
+    sys.argv = args
+    sys.path[0] = os.path.dirname(script)
+    if ROOT not in sys.path:
+        sys.path.insert(1, ROOT)
+    runpy.run_path(script, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
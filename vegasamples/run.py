@@ -0,0 +1,230 @@
+"""
+Run any sample script, optionally under a profiler, without editing it.
+
+    python3 -m vegasamples.run stream-events/stream-positions-with-Vega-API-client.py --every 10
+
+The script runs as if started directly (same sys.argv, sys.path[0] and
+__main__). Profiling is chosen with environment variables:
+
+- VEGA_PROFILE: comma separated, any of
+  - cprofile: deterministic profile of the main thread, saved as pstats
+    (snakeviz, gprof2dot, python -m pstats)
+  - sample: statistical profile of all threads, saved as collapsed stacks
+    (flamegraph.pl, speedscope, inferno)
+  - tracemalloc: allocation sites, saved as a snapshot
+    (tracemalloc.Snapshot.load)
+- VEGA_PROFILE_DIR: where output files go (default "profiles")
+- VEGA_PROFILE_TOP: entries in the printed reports (default 20)
+- VEGA_PROFILE_INTERVAL: seconds between samples (default 0.005)
+- VEGA_PROFILE_FRAMES: stack depth tracemalloc records (default 10)
+- VEGA_PROFILE_SNAPSHOT_EVERY: with tracemalloc, seconds between snapshots;
+  each one reports the allocation sites which grew most since the first,
+  which is how a leak in a long-running stream script shows up
+
+Output is written and the reports printed (to stderr) when the script ends,
+including by Ctrl-C or SIGTERM, so stream scripts can be profiled for as
+long as needed and then stopped.
+"""
+
+import cProfile
+import collections
+import os
+import pstats
+import runpy
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+
+PROFILERS = ("cprofile", "sample", "tracemalloc")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Sampler:
+    """Samples the stacks of all threads every interval seconds, counting
+    each distinct stack, for a flame graph."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks: Dict[str, int] = collections.Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="vegasamples-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def write(self, path: str) -> None:
+        """Collapsed stacks: one "frame;frame;frame count" line per stack."""
+        with open(path, "w") as f:
+            for stack, count in self.stacks.items():
+                f.write(f"{stack} {count}\n")
+
+    def report(self, top: int) -> str:
+        # Self time: the innermost frame of each sampled stack
+        leaves: Dict[str, int] = collections.Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        total = sum(leaves.values()) or 1
+        lines = [f"{self.samples} samples, top functions by self time:"]
+        for name, count in leaves.most_common(top):
+            lines.append(f"{count / total:>7.1%}  {name}")
+        return "\n".join(lines)
+
+
+class MemoryTracker:
+    """tracemalloc snapshots: allocation sites at the end, and growth since
+    the first snapshot every snapshot_every seconds."""
+
+    def __init__(self, frames: int, snapshot_every: float, top: int):
+        self.frames = frames
+        self.snapshot_every = snapshot_every
+        self.top = top
+        self.first: Optional[tracemalloc.Snapshot] = None
+        self.traced: Optional[Tuple[int, int]] = None  # (current, peak) when stopped
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="vegasamples-tracemalloc", daemon=True)
+
+    def start(self) -> None:
+        tracemalloc.start(self.frames)
+        if self.snapshot_every:
+            self._thread.start()
+
+    def stop(self) -> tracemalloc.Snapshot:
+        """Stop tracing, and return the final snapshot."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        snapshot = tracemalloc.take_snapshot()
+        self.traced = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return snapshot
+
+    def _run(self) -> None:
+        self.first = tracemalloc.take_snapshot()
+        while not self._stop.wait(self.snapshot_every):
+            print(self.growth(tracemalloc.take_snapshot()), file=sys.stderr, flush=True)
+
+    def growth(self, snapshot: tracemalloc.Snapshot) -> str:
+        current, peak = self.traced or tracemalloc.get_traced_memory()
+        lines = [f"[tracemalloc] {current / 1e6:.1f} MB traced (peak {peak / 1e6:.1f} MB), "
+                 f"top growth since the first snapshot:"]
+        for stat in snapshot.compare_to(self.first, "lineno")[:self.top]:
+            if stat.size_diff <= 0:
+                break
+            lines.append(f"  {stat.size_diff / 1e3:>+10.1f} kB {stat.count_diff:>+8} blocks  {stat.traceback[0]}")
+        return "\n".join(lines)
+
+    def report(self, snapshot: tracemalloc.Snapshot) -> str:
+        lines = ["Top allocation sites (memory still allocated at exit):"]
+        for stat in snapshot.statistics("lineno")[:self.top]:
+            lines.append(f"  {stat.size / 1e3:>10.1f} kB {stat.count:>8} blocks  {stat.traceback[0]}")
+        if self.first is not None:
+            lines.append(self.growth(snapshot))
+        return "\n".join(lines)
+
+
+def find_script(path: str) -> str:
+    """path, relative to the current directory or to the repository root."""
+    if os.path.exists(path):
+        return os.path.abspath(path)
+    repo_path = os.path.join(ROOT, path)
+    if os.path.exists(repo_path):
+        return repo_path
+    print(f"Error: No such script: {path}")
+    exit(1)
+
+
+def main(argv: List[str]) -> None:
+    if not argv:
+        print(__doc__.strip())
+        exit(1)
+    script = find_script(argv[0])
+    profilers = [p.strip() for p in os.getenv("VEGA_PROFILE", "").split(",") if p.strip()]
+    for p in profilers:
+        if p not in PROFILERS:
+            print(f"Error: Unknown profiler {p!r} in VEGA_PROFILE, use any of {', '.join(PROFILERS)}")
+            exit(1)
+    out_dir = os.getenv("VEGA_PROFILE_DIR", "profiles")
+    top = int(os.getenv("VEGA_PROFILE_TOP", "20"))
+    base = os.path.join(out_dir, f"{os.path.splitext(os.path.basename(script))[0]}-{os.getpid()}")
+
+    # Exit cleanly on SIGTERM too, so the profiles are written
+    if signal.getsignal(signal.SIGTERM) == signal.SIG_DFL:
+        signal.signal(signal.SIGTERM, lambda sig, frame: sys.exit(128 + sig))
+
+    sampler = Sampler(float(os.getenv("VEGA_PROFILE_INTERVAL", "0.005"))) if "sample" in profilers else None
+    memory = None
+    if "tracemalloc" in profilers:
+        memory = MemoryTracker(
+            int(os.getenv("VEGA_PROFILE_FRAMES", "10")), float(os.getenv("VEGA_PROFILE_SNAPSHOT_EVERY", "0")), top
+        )
+    profile = cProfile.Profile() if "cprofile" in profilers else None
+
+    sys.argv = argv
+    sys.path[0] = os.path.dirname(script)
+    # The scripts import helpers from the repository root
+    if ROOT not in sys.path:
+        sys.path.insert(1, ROOT)
+    if memory:
+        memory.start()
+    if sampler:
+        sampler.start()
+    if profile:
+        profile.enable()
+    started = time.perf_counter()
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Stop profiling before writing anything, so the reports do not
+        # profile themselves
+        if profile:
+            profile.disable()
+        elapsed = time.perf_counter() - started
+        if sampler:
+            sampler.stop()
+        snapshot = memory.stop() if memory else None
+        if profilers:
+            os.makedirs(out_dir, exist_ok=True)
+            print(f"\n[vegasamples.run] {os.path.basename(script)} ran for {elapsed:.2f}s", file=sys.stderr)
+        if profile:
+            profile.dump_stats(base + ".pstats")
+            print(f"\ncProfile (main thread), top by cumulative time, saved to {base}.pstats:", file=sys.stderr)
+            pstats.Stats(profile, stream=sys.stderr).sort_stats("cumulative").print_stats(top)
+        if sampler:
+            sampler.write(base + ".folded")
+            print(f"\nSampling profile, collapsed stacks saved to {base}.folded", file=sys.stderr)
+            print(sampler.report(top), file=sys.stderr)
+        if snapshot:
+            snapshot.dump(base + ".tracemalloc")
+            print(f"\ntracemalloc snapshot saved to {base}.tracemalloc", file=sys.stderr)
+            print(memory.report(snapshot), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -21,7 +21,6 @@ Apps/Libraries:
 
 import base64
 import json
-import requests
 import os
 
 import helpers
@@ -37,6 +36,8 @@ if not helpers.check_url(wallet_server_url):
 # Help guide users against including api version suffix on url
 wallet_server_url = helpers.check_wallet_url(wallet_server_url)
 
+session = helpers.session()
+
 print(f"Creating a new wallet on {wallet_server_url}:")
 print(f"- name:       {wallet_name}")
 print(f"- passphrase: {wallet_passphrase}")
@@ -45,7 +46,7 @@ print(f"- passphrase: {wallet_passphrase}")
 # __create_wallet:
 # Create a new wallet:
 req = {"wallet": wallet_name, "passphrase": wallet_passphrase}
-response = requests.post(f"{wallet_server_url}/api/v1/wallets", json=req)
+response = session.post(f"{wallet_server_url}/api/v1/wallets", json=req)
 helpers.check_response(response)
 token = response.json()["token"]
 # :create_wallet__
@@ -55,12 +56,14 @@ token = response.json()["token"]
 # and in practice you don't need to log in immediately after
 # creating a new wallet, as the response already contains the
 # token that you need to authenticate with future requests.
+# (Scripts using existing wallets can use walletauth.WalletAuth, which caches
+# the token across runs so that they do not log in every time.)
 
 
 # __login_wallet:
 # Log in to an existing wallet
 req = {"wallet": wallet_name, "passphrase": wallet_passphrase}
-response = requests.post(f"{wallet_server_url}/api/v1/auth/token", json=req)
+response = session.post(f"{wallet_server_url}/api/v1/auth/token", json=req)
 helpers.check_response(response)
 token = response.json()["token"]
 # :login_wallet__
@@ -73,7 +76,7 @@ req = {
     "passphrase": wallet_passphrase,
     "meta": [{"key": "alias", "value": "my_key_alias"}],
 }
-response = requests.post(f"{wallet_server_url}/api/v1/keys", headers=headers, json=req)
+response = session.post(f"{wallet_server_url}/api/v1/keys", headers=headers, json=req)
 helpers.check_response(response)
 pubkey = response.json()["key"]["pub"]
 # Print key information. Note that the private key is *not* returned.
@@ -86,7 +89,7 @@ print(json.dumps(keypair, indent=2, sort_keys=True))
 # __get_keys:
 # Request all key pairs
 headers = {"Authorization": f"Bearer {token}"}
-response = requests.get(f"{wallet_server_url}/api/v1/keys", headers=headers)
+response = session.get(f"{wallet_server_url}/api/v1/keys", headers=headers)
 helpers.check_response(response)
 keys = response.json()["keys"]
 for key in keys:
@@ -99,7 +102,7 @@ pubkey = keys[0]["pub"]
 # __get_key:
 # Request a single key pair
 headers = {"Authorization": f"Bearer {token}"}
-response = requests.get(f"{wallet_server_url}/api/v1/keys/{pubkey}", headers=headers)
+response = session.get(f"{wallet_server_url}/api/v1/keys/{pubkey}", headers=headers)
 helpers.check_response(response)
 key = response.json()["key"]
 print("Get a single keypair:")
@@ -113,7 +116,7 @@ headers = {"Authorization": f"Bearer {token}"}
 blob = b"data returned from a Vega node 'Prepare<operation>' call"
 tx = base64.b64encode(blob).decode("ascii")
 req = {"tx": tx, "pubKey": pubkey, "propagate": False}
-response = requests.post(f"{wallet_server_url}/api/v1/messages", headers=headers, json=req)
+response = session.post(f"{wallet_server_url}/api/v1/messages", headers=headers, json=req)
 helpers.check_response(response)
 signedTx = response.json()["signedTx"]
 print("Signed transaction:")
@@ -124,6 +127,6 @@ print(json.dumps(signedTx, indent=2, sort_keys=True))
 # __logout_wallet:
 # Log out of a wallet
 headers = {"Authorization": f"Bearer {token}"}
-response = requests.delete(f"{wallet_server_url}/api/v1/auth/token", headers=headers)
+response = session.delete(f"{wallet_server_url}/api/v1/auth/token", headers=headers)
 helpers.check_response(response)
 # :logout_wallet__
@@ -0,0 +1,155 @@
+"""
+Authentication for the Vega wallet server, with tokens cached between runs.
+
+    auth = walletauth.WalletAuth(wallet_server_url, wallet_name, wallet_passphrase)
+    session.get(f"{wallet_server_url}/api/v1/keys", auth=auth)
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+from typing import Any, Optional
+
+import requests
+from requests.auth import AuthBase
+
+import helpers
+
+# Where wallet auth tokens are cached between runs
+WALLET_TOKEN_CACHE = os.getenv(
+    "WALLET_TOKEN_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "vega-sample-api-scripts", "wallet-tokens.json"),
+)
+
+
+def token_expiry(token: str) -> Optional[float]:
+    """Return the "exp" claim of a JWT, or None if it has none.
+
+    The signature is not checked; the wallet server does that."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class WalletAuth(AuthBase):
+    """Bearer token authentication for a Vega wallet server.
+
+    Tokens are cached on disk (readable by the current user only), keyed by
+    wallet server URL and wallet name, so that repeated runs do not have to
+    log in again. A cached token is only checked when it is used: if the
+    wallet server answers 401, the token is refreshed and the request is
+    sent again. Tokens with an expiry are refreshed in the background
+    refresh_margin seconds before they expire.
+
+    Use it as the auth of any wallet server request.
+    """
+
+    def __init__(
+        self,
+        wallet_server_url: str,
+        wallet_name: str,
+        wallet_passphrase: str,
+        session: Optional[requests.Session] = None,
+        path: str = WALLET_TOKEN_CACHE,
+        refresh_margin: float = 60,
+    ):
+        self.wallet_server_url = wallet_server_url
+        self.wallet_name = wallet_name
+        self.wallet_passphrase = wallet_passphrase
+        self.session = session
+        self.path = path
+        self.refresh_margin = refresh_margin
+        self.key = f"{wallet_server_url}|{wallet_name}"
+        self._token = None
+        self._expires = None
+        self._timer = None
+        self._lock = threading.RLock()
+
+    def token(self) -> str:
+        """Return a token, from memory, from disk or by logging in."""
+        with self._lock:
+            if self._token is None:
+                entry = helpers.read_json_cache(self.path).get(self.key)
+                if entry is not None:
+                    self._set(entry["token"], save=False)
+            if self._token is None or self._expiring():
+                self.login()
+            return self._token
+
+    def login(self) -> str:
+        """Log in to the wallet server and cache the new token."""
+        req = {"wallet": self.wallet_name, "passphrase": self.wallet_passphrase}
+        s = self.session or helpers.session()
+        response = s.post(f"{self.wallet_server_url}/api/v1/auth/token", json=req)
+        helpers.check_response(response)
+        with self._lock:
+            self._set(response.json()["token"])
+            return self._token
+
+    def set_token(self, token: str) -> None:
+        """Cache a token obtained elsewhere, e.g. when creating a wallet."""
+        with self._lock:
+            self._set(token)
+
+    def invalidate(self) -> None:
+        """Forget the token, e.g. after logging out."""
+        with self._lock:
+            self._token = self._expires = None
+            if self._timer is not None:
+                self._timer.cancel()
+            cache = helpers.read_json_cache(self.path)
+            if cache.pop(self.key, None) is not None:
+                helpers.write_json_cache(self.path, cache)
+
+    def __call__(self, r: requests.PreparedRequest) -> requests.PreparedRequest:
+        r.headers["Authorization"] = f"Bearer {self.token()}"
+        r.register_hook("response", self._retry_unauthorized)
+        return r
+
+    def _retry_unauthorized(self, r: requests.Response, **kwargs: Any) -> requests.Response:
+        if r.status_code != 401 or getattr(r.request, "_wallet_auth_retry", False):
+            return r
+        # The cached token was revoked or has expired: log in and retry once
+        with self._lock:
+            self._token = None
+            token = self.login()
+        r.content
+        r.close()
+        prep = r.request.copy()
+        prep.headers["Authorization"] = f"Bearer {token}"
+        prep._wallet_auth_retry = True
+        retry = r.connection.send(prep, **kwargs)
+        retry.history.append(r)
+        retry.request = prep
+        return retry
+
+    def _expiring(self) -> bool:
+        return self._expires is not None and self._expires - time.time() < self.refresh_margin
+
+    def _set(self, token: str, save: bool = True) -> None:
+        self._token = token
+        self._expires = token_expiry(token)
+        if save:
+            cache = helpers.read_json_cache(self.path)
+            cache[self.key] = {"token": token, "expires": self._expires}
+            helpers.write_json_cache(self.path, cache)
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._expires is not None and not self._expiring():
+            delay = self._expires - time.time() - self.refresh_margin
+            self._timer = threading.Timer(delay, self._refresh)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _refresh(self) -> None:
+        try:
+            self.login()
+        except Exception:
+            # Leave it to the next request, which logs in if it has to
+            pass